@@ -1,17 +1,30 @@
 import streamlit as st
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import time
 import qrcode
 from io import BytesIO
 import base64
 import matplotlib.pyplot as plt
 from collections import Counter
-import re
 import os
 import urllib.request
+import urllib.parse
 import matplotlib.font_manager as fm
-import math
+from answer_clusters import AnswerClusterer
+from arrival_rate import PLATEAU_SECONDS, STATUS_PLATEAU
+from chart_render import CHART_WORKERS, ChartRenderer
+from quiz_scoring import LEADERBOARD_SIZE
+from question_import import decode_table, parse_question_table
+from question_model import QUESTION_HEADERS
+from perf_metrics import timer, render_perf_panel
+from text_analysis import STREAMING_CAPACITY, STREAMING_THRESHOLD, count_words, heavy_hitters
+from run_of_show import STATUS_DONE, STATUS_RUNNING, ShowItem, resolve_active_question
+from sheet_store import (
+    get_rooms, resolve_room, invalidate_room,
+    load_questions, load_responses, update_question_status, initialize_sheets,
+    load_run_of_show, save_show_queue, set_show_state, load_summary, rebuild_summary,
+    load_arrivals, prefetch_dashboard, load_leaderboard, get_submission_tracer, import_questions,
+    get_reset_epoch, RESPONSES,
+)
 
 # 페이지 설정
 st.set_page_config(
@@ -28,6 +41,13 @@ def get_vote_app_url():
         st.session_state.vote_app_url = "https://mentiinfo01-vote.streamlit.app"
     return st.session_state.vote_app_url
 
+# 방 파라미터를 붙인 투표 앱 URL (QR 코드용)
+def get_room_vote_url(base_url, room):
+    if not room:
+        return base_url
+    separator = "&" if "?" in base_url else "?"
+    return f"{base_url}{separator}{urllib.parse.urlencode({'room': room})}"
+
 
 # 한글 폰트 설정 함수
 def set_korean_font():
@@ -80,9 +100,6 @@ def set_korean_font():
         plt.rcParams['font.family'] = 'DejaVu Sans'
         plt.rcParams['axes.unicode_minus'] = False
 
-# 한글 폰트 설정 적용
-set_korean_font()
-
 # 커스텀 CSS
 st.markdown(
     """
@@ -132,117 +149,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# 구글 시트 연결 설정
-@st.cache_resource
-def get_gsheet_connection():
-    try:
-        scope = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-            st.secrets["gcp_service_account"], scope
-        )
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        st.error(f"인증 오류: {str(e)}")
-        return None
-
-# 구글 시트에서 질문 데이터 가져오기
-@st.cache_data(ttl=5)  # 5초마다 데이터 새로고침
-def load_questions(sheet_id):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            return []
-            
-        sheet = client.open_by_key(sheet_id)
-        worksheets = sheet.worksheets()
-        
-        for ws in worksheets:
-            if ws.title == "질문":
-                data = ws.get_all_records()
-                return data
-        
-        # 질문 워크시트가 없는 경우
-        return []
-    except Exception as e:
-        st.error(f"질문 데이터 로드 오류: {str(e)}")
-        return []
-
-# 구글 시트에서 응답 데이터 가져오기
-@st.cache_data(ttl=3)  # 3초마다 데이터 새로고침
-def load_responses(sheet_id):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            return []
-            
-        sheet = client.open_by_key(sheet_id)
-        worksheets = sheet.worksheets()
-        
-        for ws in worksheets:
-            if ws.title == "응답":
-                data = ws.get_all_records()
-                return data
-        
-        # 응답 워크시트가 없는 경우
-        return []
-    except Exception as e:
-        st.error(f"응답 데이터 로드 오류: {str(e)}")
-        return []
-
-# 질문 활성화/비활성화 함수
-def update_question_status(sheet_id, question_id, active_status):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            return False
-            
-        sheet = client.open_by_key(sheet_id)
-        worksheet = None
-        
-        for ws in sheet.worksheets():
-            if ws.title == "질문":
-                worksheet = ws
-                break
-        
-        if not worksheet:
-            st.error("질문 워크시트를 찾을 수 없습니다.")
-            return False
-        
-        # 모든 질문 비활성화
-        if active_status:
-            all_data = worksheet.get_all_records()
-            for idx, row in enumerate(all_data):
-                if row.get("활성화", "").lower() in ["y", "yes"]:
-                    worksheet.update_cell(idx + 2, worksheet.find("활성화").col, "N")
-        
-        # 선택한 질문 활성화
-        try:
-            # 질문ID 열 찾기
-            id_col = worksheet.find("질문ID").col
-            # 활성화 열 찾기
-            active_col = worksheet.find("활성화").col
-            
-            # 해당 질문ID를 가진 행 찾기
-            cell_list = worksheet.findall(question_id)
-            for cell in cell_list:
-                if cell.col == id_col:  # 질문ID 열에서 찾은 경우만
-                    worksheet.update_cell(cell.row, active_col, "Y" if active_status else "N")
-                    return True
-            
-            st.warning(f"질문 ID '{question_id}'를 찾을 수 없습니다.")
-            return False
-        except Exception as e:
-            st.error(f"질문 상태 업데이트 중 오류: {str(e)}")
-            return False
-    except Exception as e:
-        st.error(f"질문 상태 업데이트 중 오류: {str(e)}")
-        return False
-
 # QR 코드 생성 함수
 def generate_qr_code(url):
     try:
@@ -264,233 +170,227 @@ def generate_qr_code(url):
         st.error(f"QR 코드 생성 중 오류 발생: {str(e)}")
         return None
 
+# general 시크릿의 정수 설정 (시크릿이 없는 환경에서는 기본값)
+def get_general_setting(name, default):
+    try:
+        return int(st.secrets.get("general", {}).get(name, default))
+    except FileNotFoundError:
+        return default
+
 # 텍스트 분석 함수 (단답형 응답용)
-def analyze_text_responses(responses, max_items=10):
+# responses 는 응답 문자열 목록, 또는 요약 시트에서 읽은 단어 -> 빈도 dict
+# 응답이 stream_threshold 개보다 많으면 Space-Saving 으로 상위 단어를 근사 (with_error 이면 최대 오차도 반환)
+def analyze_text_responses(responses, max_items=10, stream_threshold=None, with_error=False):
     if not responses:
-        return None, None
+        return (None, None, 0) if with_error else (None, None)
     
-    # 단어 분리 및 빈도 계산
-    words = []
-    for response in responses:
-        # 문장을 단어로 분리 (한글, 영문, 숫자 포함)
-        text_words = re.findall(r'\b[\w가-힣]+\b', str(response).lower())
-        words.extend(text_words)
+    if stream_threshold is None:
+        stream_threshold = get_general_setting("text_stream_threshold", STREAMING_THRESHOLD)
     
-    # 불용어 제거 (필요시 확장)
-    stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 
-                 '이', '그', '저', '이것', '그것', '저것', '이런', '그런', '저런'}
-    
-    filtered_words = [word for word in words if word not in stopwords and len(word) > 1]
-    
-    # 단어 빈도 계산
-    word_counts = Counter(filtered_words)
-    
-    # 가장 빈도가 높은 단어 선택
-    top_words = word_counts.most_common(max_items)
+    # 단어 빈도 계산 후 가장 빈도가 높은 단어 선택
+    error = 0
+    if isinstance(responses, dict):
+        top_words = Counter(responses).most_common(max_items)
+    elif len(responses) > stream_threshold:
+        sketch = heavy_hitters(responses, get_general_setting("text_stream_capacity", STREAMING_CAPACITY))
+        top_words = [(word, count) for word, count, _ in sketch.top(max_items)]
+        error = sketch.max_error()
+    else:
+        top_words = count_words(responses).most_common(max_items)
     
     if not top_words:
-        return None, None
+        return (None, None, 0) if with_error else (None, None)
     
     # 시각화용 데이터 준비
     labels = [word for word, _ in top_words]
     values = [count for _, count in top_words]
     
-    return labels, values
+    return (labels, values, error) if with_error else (labels, values)
+
+# 질문별 비슷한 응답 묶음 (관리자 세션이 함께 쓰고, 새로 들어온 응답만 이어서 처리)
+# 응답 시트가 초기화되면 update 에 넘기는 초기화 세대가 바뀌어 처음부터 다시 묶음
+@st.cache_resource(show_spinner=False)
+def get_answer_clusterer(sheet_id, question_id):
+    return AnswerClusterer()
+
+# 특정 질문에 대한 응답 행만 골라내기
+def filter_question_responses(responses, question_id):
+    # 시트에서 숫자로 읽힌 질문ID(예: 1)도 같은 질문으로 취급
+    keys = {question_id, str(question_id)}
+    try:
+        keys.add(int(question_id))
+    except (TypeError, ValueError):
+        pass
+    return [r for r in responses if r.get("질문ID") in keys]
 
-# 차트 생성 함수
-def create_fancy_chart(data, question_type):
+# 차트 데이터 준비 (빈도 높은 순 labels, values 와 근사 오차)
+# data 는 응답 문자열 목록, 또는 요약 시트에서 읽은 항목 -> 개수 dict (Counter)
+# error 는 요약 시트의 개수가 근사값일 때의 최대 오차
+def chart_data(data, question_type, error=0):
+    if question_type.lower() == "객관식":
+        counter = Counter(data)
+        return list(counter.keys()), list(counter.values()), error
+    labels, values, sketch_error = analyze_text_responses(data, with_error=True)
+    return labels or [], values or [], max(error, sketch_error)
+
+# 차트 렌더링 워커 풀 (프로세스 하나에 하나, 모든 세션이 공유)
+@st.cache_resource(show_spinner=False)
+def get_chart_renderer():
+    return ChartRenderer(workers=get_general_setting("chart_workers", CHART_WORKERS))
+
+# 차트 생성 함수 (PNG 바이트, 워커가 제시간에 못 그리면 None)
+def create_fancy_chart(data, question_type, error=0):
     if not data:
         return None
     
     try:
-        # 컬러 팔레트 설정
-        colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#9999FF', '#99FFFF', '#FFFF99']
-        
-        # 한글 폰트 명시적 설정
-        font_path = os.path.join(os.path.expanduser('~'), '.fonts', 'NanumGothic.ttf')
-        if os.path.exists(font_path):
-            font_prop = fm.FontProperties(fname=font_path)
-        else:
-            font_prop = fm.FontProperties(family='DejaVu Sans')
-        
-        if question_type.lower() == "객관식":
-            # 객관식 응답 차트 (원형 차트)
-            counter = Counter(data)
-            labels = list(counter.keys())
-            values = list(counter.values())
-            
-            # 그래프 생성
-            fig, ax = plt.subplots(figsize=(12, 8))
-            
-            # 원형 차트와 막대 차트 둘 다 표시
-            # 1. 원형 차트 (좌측)
-            plt.subplot(1, 2, 1)
-            wedges, texts, autotexts = plt.pie(
-                values, 
-                labels=labels,
-                autopct='%1.1f%%',
-                startangle=90,
-                shadow=True,
-                colors=colors[:len(values)],
-                wedgeprops={'edgecolor': 'w', 'linewidth': 1, 'antialiased': True},
-                textprops={'fontsize': 14, 'fontweight': 'bold', 'fontproperties': font_prop}
-            )
-            
-            # 원형 차트 제목
-            plt.title('응답 분포', fontsize=18, pad=20, fontproperties=font_prop)
-            
-            # 2. 막대 차트 (우측)
-            plt.subplot(1, 2, 2)
-            bars = plt.bar(
-                range(len(labels)), 
-                values, 
-                color=colors[:len(values)],
-                width=0.6,
-                edgecolor='white',
-                linewidth=2
-            )
-            
-            # 막대 위에 값 표시
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(
-                    bar.get_x() + bar.get_width()/2., 
-                    height + 0.1,
-                    f'{int(height)}',
-                    ha='center', 
-                    va='bottom',
-                    fontsize=12,
-                    fontweight='bold',
-                    fontproperties=font_prop
-                )
-            
-            plt.title('응답 수', fontsize=18, pad=20, fontproperties=font_prop)
-            plt.xticks(range(len(labels)), labels, rotation=45, ha='right', fontproperties=font_prop)
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-            
-            # 전체 타이틀
-            fig.suptitle('객관식 응답 결과', fontsize=22, y=0.98, fontproperties=font_prop)
-            plt.tight_layout(rect=[0, 0, 1, 0.95])
-            
-        elif question_type.lower() == "단답형":
-            # 단답형 응답 분석 및 시각화
-            labels, values = analyze_text_responses(data)
-            if labels and values:
-                fig, ax = plt.subplots(figsize=(12, 8))
-                
-                # 수평 막대 그래프로 표시 (빈도 높은 순)
-                # 역순으로 정렬하여 가장 빈도가 높은 항목이 위에 오도록
-                labels = labels[::-1]  # numpy 없이도 리스트 역순 가능
-                values = values[::-1]
-                
-                # 화려한 그라데이션 색상 생성 (numpy 대신 math 사용)
-                color_gradient = []
-                for i in range(len(labels)):
-                    r = 0.1 + 0.6 * (i / len(labels))
-                    g = 0.3 + 0.4 * math.sin(i / len(labels) * math.pi)  # math.sin 사용
-                    b = 0.8 - 0.6 * (i / len(labels))
-                    color_gradient.append((r, g, b))
-                
-                bars = plt.barh(
-                    labels,
-                    values, 
-                    color=color_gradient,
-                    height=0.6,
-                    edgecolor='white',
-                    linewidth=1.5,
-                    alpha=0.8
-                )
-                
-                # 각 막대 옆에 값 표시
-                for i, bar in enumerate(bars):
-                    width = bar.get_width()
-                    plt.text(
-                        width + 0.3, 
-                        bar.get_y() + bar.get_height()/2.,
-                        f'{int(width)}',
-                        ha='left', 
-                        va='center',
-                        fontsize=12,
-                        fontweight='bold',
-                        fontproperties=font_prop
-                    )
-                
-                plt.title('단답형 응답 분석 결과', fontsize=22, pad=20, fontproperties=font_prop)
-                plt.xlabel('빈도', fontsize=14, labelpad=10, fontproperties=font_prop)
-                plt.yticks(fontproperties=font_prop)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                plt.tight_layout()
-            else:
-                fig, ax = plt.subplots(figsize=(10, 6))
-                plt.text(0.5, 0.5, '분석할 데이터가 충분하지 않습니다', 
-                       ha='center', va='center', fontsize=16, fontproperties=font_prop)
-                plt.axis('off')
-        
-        return fig
+        labels, values, error = chart_data(data, question_type, error)
+        return get_chart_renderer().render(question_type.lower(), labels, values, error)
     except Exception as e:
         st.error(f"차트 생성 중 오류: {str(e)}")
         return None
 
-# 시트 초기화 함수
-def initialize_sheets(sheet_id):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            st.error("구글 시트 연결에 실패했습니다.")
-            return False
-            
-        sheet = client.open_by_key(sheet_id)
-        
-        # 시트1 초기화 (질문)
-        worksheet = None
-        for ws in sheet.worksheets():
-            if ws.title == "질문":
-                worksheet = ws
-                break
-        
-        if not worksheet:
-            worksheet = sheet.add_worksheet(title="질문", rows=1, cols=10)
-        
-        worksheet.clear()
-        
-        # 헤더 설정
-        headers = ["질문ID", "질문", "유형", "선택지1", "선택지2", "선택지3", "선택지4", "선택지5", "정답", "활성화"]
-        worksheet.append_row(headers)
-        
-        # 샘플 질문 추가
-        sample_questions = [
-            ["Q1", "가장 좋아하는 프로그래밍 언어는?", "객관식", "Python", "JavaScript", "Java", "C++", "기타", "", "N"],
-            ["Q2", "이 수업에서 가장 흥미로웠던 부분은?", "단답형", "", "", "", "", "", "", "N"]
-        ]
-        
-        for q in sample_questions:
-            worksheet.append_row(q)
-        
-        # 시트2 초기화 (응답)
-        response_ws = None
-        for ws in sheet.worksheets():
-            if ws.title == "응답":
-                response_ws = ws
-                break
-        
-        if not response_ws:
-            response_ws = sheet.add_worksheet(title="응답", rows=1, cols=6)
-        
-        response_ws.clear()
-        response_headers = ["시간", "학번", "이름", "질문ID", "응답", "세션ID"]
-        response_ws.append_row(response_headers)
+# 퀴즈 순위 (정답이 있는 질문이 하나라도 있을 때만 표시)
+def render_leaderboard(sheet_id, questions):
+    if not any(q.answer for q in questions):
+        return
+    st.markdown("---")
+    st.markdown("### 🏆 퀴즈 순위")
+    board = load_leaderboard(sheet_id, questions)
+    leaders = board.top(LEADERBOARD_SIZE)
+    if not leaders:
+        st.info("아직 채점된 응답이 없습니다.")
+        return
+    st.caption(f"참여자 {len(board)}명, 상위 {len(leaders)}명")
+    st.table([
+        {"순위": rank, "닉네임": nickname, "점수": score, "응답한 문제": answered}
+        for rank, nickname, score, answered in leaders
+    ])
+
+# 질문 일괄 가져오기 (사이드바)
+# CSV 파일이나 붙여 넣은 표를 먼저 검사해서 미리 보여주고, 문제가 없을 때만 시트에 한 번에 씀
+def render_question_import(sheet_id):
+    with st.expander("질문 일괄 가져오기", expanded=False):
+        st.caption(f"첫 행은 머리글: {', '.join(QUESTION_HEADERS)} (질문, 유형은 필수)")
+        uploaded = st.file_uploader("CSV 파일", type=["csv", "tsv", "txt"], key="question_import_file")
+        pasted = st.text_area("또는 표 붙여 넣기 (스프레드시트에서 복사)", height=120, key="question_import_text")
         
-        return True
-    except Exception as e:
-        st.error(f"시트 초기화 중 오류 발생: {str(e)}")
-        return False
+        try:
+            text = decode_table(uploaded.getvalue()) if uploaded else pasted
+        except ValueError as e:
+            st.error(str(e))
+            return
+        if not text.strip():
+            return
+        
+        rows, errors = parse_question_table(text)
+        for error in errors[:10]:
+            st.error(error)
+        if len(errors) > 10:
+            st.error(f"그 밖의 오류 {len(errors) - 10}개")
+        if errors:
+            return
+        
+        st.caption(f"질문 {len(rows)}개")
+        st.table([dict(zip(QUESTION_HEADERS[:3], row[:3])) for row in rows[:10]])
+        reset_responses = st.checkbox("응답과 요약도 초기화", key="question_import_reset")
+        st.warning("질문 시트의 기존 질문은 모두 바뀝니다.")
+        if st.button(f"질문 {len(rows)}개 가져오기", use_container_width=True):
+            if import_questions(sheet_id, rows, reset_responses):
+                st.success("질문을 가져왔습니다.")
+                time.sleep(1)
+                st.rerun()
+
+# 진행 순서 관리 (사이드바)
+def render_show_controls(sheet_id, question_options, show):
+    st.markdown("### 진행 순서")
+    now = time.time()
+    
+    queue_ids = st.multiselect(
+        "진행할 질문 (선택한 순서대로 진행)",
+        options=list(question_options.keys()),
+        default=[item.qid for item in show.items if item.qid in question_options],
+        format_func=lambda x: question_options[x]
+    )
+    saved_seconds = {item.qid: item.seconds for item in show.items}
+    items = []
+    for qid in queue_ids:
+        seconds = st.number_input(
+            f"{question_options[qid]} - 제한 시간(초, 0이면 직접 넘김)",
+            min_value=0,
+            step=10,
+            value=saved_seconds.get(qid, 0),
+            key=f"show_seconds_{qid}"
+        )
+        items.append(ShowItem(qid, int(seconds)))
+    
+    if st.button("진행 순서 저장", use_container_width=True, disabled=not items):
+        if save_show_queue(sheet_id, items, previous_length=len(show.items)):
+            st.success("진행 순서가 저장되었습니다.")
+            time.sleep(1)
+            st.rerun()
+    
+    if not show.items:
+        return
+    
+    if not show.running:
+        if st.button("진행 시작", use_container_width=True, type="primary"):
+            if set_show_state(sheet_id, 0, now, STATUS_RUNNING):
+                st.rerun()
+        return
+    
+    index, started_at = show.position(now)
+    current = show.current(now)
+    if current:
+        status = f"진행 중 {index + 1}/{len(show.items)}: {question_options.get(current.qid, current.qid)}"
+        if current.seconds:
+            status += f" (남은 시간 {max(0, int(started_at + current.seconds - now))}초)"
+        st.info(status)
+    else:
+        st.info("마지막 질문까지 진행했습니다.")
+    upcoming = show.upcoming(now)
+    if upcoming:
+        st.caption(f"다음 질문: {question_options.get(upcoming.qid, upcoming.qid)}")
+    st.caption("진행 중에는 활성화 설정보다 진행 순서의 질문이 우선 표시됩니다.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("다음 질문", use_container_width=True, disabled=current is None):
+            next_index = index + 1
+            status = STATUS_RUNNING if next_index < len(show.items) else STATUS_DONE
+            if set_show_state(sheet_id, next_index, now, status):
+                st.rerun()
+    with col2:
+        if st.button("진행 종료", use_container_width=True):
+            if set_show_state(sheet_id, index, now, STATUS_DONE):
+                st.rerun()
 
 # 메인 앱
 def main():
     st.markdown('<div class="title">실시간 투표 관리자 대시보드</div>', unsafe_allow_html=True)
     
-    # 구글 시트 ID (secrets에서 가져오기)
-    sheet_id = st.secrets.get("general", {}).get("sheet_id", "1DeLOnDJ4KdtZfKwEMAnYWqINTKx7vv22c3SQCu6lxQY")
+    # 방(교실) 선택: URL의 ?room= 값으로 사용할 구글 시트 결정
+    room, sheet_id = resolve_room()
+    rooms = get_rooms()
+    if rooms:
+        with st.sidebar:
+            room_options = [""] + list(rooms.keys())
+            selected_room = st.selectbox(
+                "방 선택",
+                options=room_options,
+                index=room_options.index(room) if room in room_options else 0,
+                format_func=lambda r: r or "기본 방"
+            )
+            if selected_room != room:
+                if selected_room:
+                    st.query_params["room"] = selected_room
+                else:
+                    del st.query_params["room"]
+                st.rerun()
+    
+    if not sheet_id:
+        st.error(f"등록되지 않은 방입니다: {room}")
+        return
     
     # 투표 앱 URL 가져오기
     vote_app_url = get_vote_app_url()
@@ -517,7 +417,9 @@ def main():
         # 투표 앱 URL 표시
         vote_app_url = get_vote_app_url()
         st.markdown("### 투표 참여 QR 코드")
-        qr_img = generate_qr_code(vote_app_url)
+        if room:
+            st.caption(f"방: {room}")
+        qr_img = generate_qr_code(get_room_vote_url(vote_app_url, room))
         if qr_img:
             # QR 코드 크기에 따라 클래스 설정
             qr_class = "qr-large" if st.session_state.qr_large else "qr-small"
@@ -540,18 +442,29 @@ def main():
         
         # 수동 새로고침 버튼
         if st.button("데이터 새로고침", use_container_width=True):
-            st.cache_data.clear()  # 캐시 지우기
+            invalidate_room(sheet_id)  # 이 방의 캐시만 지우기
             st.success("데이터가 새로고침되었습니다.")
             time.sleep(1)
             st.rerun()
         
+        # 요약 시트를 응답 시트 전체로 다시 계산 (기존 응답이 있거나 개수가 어긋난 경우)
+        if st.button("응답 요약 다시 만들기", use_container_width=True):
+            if rebuild_summary(sheet_id):
+                st.success("응답 요약을 다시 만들었습니다.")
+                time.sleep(1)
+                st.rerun()
+        
         st.markdown("---")
         
         # 질문 관리
         st.markdown("### 질문 관리")
         
-        # 질문 데이터 로드
+        # 질문 데이터와 진행 순서 로드
+        # (만료된 질문/진행/요약 데이터를 한 번의 요청으로 미리 읽어 둠)
+        prefetch_dashboard(sheet_id)
         questions = load_questions(sheet_id)
+        show = load_run_of_show(sheet_id)
+        render_question_import(sheet_id)
         
         if not questions:
             st.warning("질문 데이터가 없습니다. 시트 초기화를 진행해주세요.")
@@ -560,13 +473,11 @@ def main():
             if st.button("시트 초기화 (샘플 질문 추가)", use_container_width=True):
                 if initialize_sheets(sheet_id):
                     st.success("시트가 초기화되었습니다. 샘플 질문이 추가되었습니다.")
-                    st.cache_data.clear()  # 캐시 지우기
                     time.sleep(1)
                     st.rerun()  # 페이지 새로고침
         else:
             # 질문 선택 및 활성화
-            question_options = {q.get("질문ID", f"질문_{i}"): q.get("질문", f"질문_{i}") 
-                              for i, q in enumerate(questions)}
+            question_options = {q.qid: q.text for q in questions}
             
             selected_question = st.selectbox(
                 "질문 선택",
@@ -575,69 +486,131 @@ def main():
             )
             
             # 현재 활성화된 질문 확인
-            active_questions = [q for q in questions if q.get("활성화", "").lower() in ["y", "yes"]]
-            current_active = active_questions[0].get("질문ID") if active_questions else "없음"
+            current_active = questions.active.qid if questions.active else "없음"
             
             st.info(f"현재 활성화된 질문: {question_options.get(current_active, current_active)}")
             
             if st.button("이 질문 활성화", use_container_width=True):
                 if update_question_status(sheet_id, selected_question, True):
                     st.success(f"질문 '{question_options[selected_question]}'이(가) 활성화되었습니다.")
-                    st.cache_data.clear()  # 캐시 지우기
                     time.sleep(1)
                     st.rerun()  # 페이지 새로고침
             
             if st.button("모든 질문 비활성화", use_container_width=True):
                 success = True
                 for q in questions:
-                    if q.get("활성화", "").lower() in ["y", "yes"]:
-                        if not update_question_status(sheet_id, q.get("질문ID"), False):
+                    if q.active:
+                        if not update_question_status(sheet_id, q.qid, False):
                             success = False
                 if success:
                     st.success("모든 질문이 비활성화되었습니다.")
-                    st.cache_data.clear()  # 캐시 지우기
                     time.sleep(1)
                     st.rerun()  # 페이지 새로고침
+            
+            st.markdown("---")
+            render_show_controls(sheet_id, question_options, show)
     
     # 메인 컨텐츠: 결과 대시보드
-    responses = load_responses(sheet_id)
+    # 지금 보여줄 질문 확인 (진행 순서가 진행 중이면 진행 순서 우선)
+    active_q = resolve_active_question(questions, show, time.time())
     
-    if not responses:
+    # 요약 시트가 있으면 지금 보여줄 질문의 항목별 개수만 읽고, 없으면 응답 시트 전체에서 계산
+    summary_sheet = load_summary(sheet_id, active_q.qid if active_q else None)
+    responses = load_responses(sheet_id) if summary_sheet is None else None
+    
+    if (summary_sheet is not None and not summary_sheet.order) or (responses is not None and not responses):
         st.info("아직 응답 데이터가 없습니다.")
     else:
-        # 활성화된 질문이 있는지 확인
-        active_questions = [q for q in questions if q.get("활성화", "").lower() in ["y", "yes"]]
-        if active_questions:
-            active_q = active_questions[0]
-            active_q_id = active_q.get("질문ID")
-            question_type = active_q.get("유형", "")
+        if active_q:
+            active_q_id = active_q.qid
+            question_type = active_q.qtype
             
-            # 현재 질문에 대한 응답만 필터링
-            current_responses = [r.get("응답", "") for r in responses if r.get("질문ID") == active_q_id]
+            # 현재 질문의 응답 (요약 시트의 항목별 개수 또는 응답 목록)
+            summary_error = 0  # 요약 시트의 항목 수를 넘어 근사한 개수의 최대 오차
+            if summary_sheet is not None:
+                question_summary = summary_sheet.get(active_q_id)
+                current_responses = question_summary.counts if question_summary else None
+                response_count = question_summary.total if question_summary else 0
+                summary_error = question_summary.error if question_summary else 0
+            else:
+                filtered_responses = filter_question_responses(responses, active_q_id)
+                current_responses = [r.get("응답", "") for r in filtered_responses]
+                response_count = len(current_responses)
             
             # 대시보드 헤더
-            st.markdown(f"## 현재 질문: {active_q.get('질문', '')}")
+            st.markdown(f"## 현재 질문: {active_q.text}")
             
             # 결과 차트
             st.markdown("### 응답 결과")
             
-            if current_responses:
-                chart = create_fancy_chart(current_responses, question_type)
+            if response_count:
+                # 새로 추가된 응답 행 확인 (참여 추이, 제출 지연 추적)
+                with timer("arrival_rate"):
+                    arrivals, trend, _ = load_arrivals(sheet_id).snapshot(active_q_id, time.time(), 120)
+                
+                st.caption(f"응답 {response_count}개")
+                with timer("render_chart"):
+                    chart = create_fancy_chart(current_responses, question_type, summary_error)
                 if chart:
-                    st.pyplot(chart)
+                    st.image(chart, use_column_width=True)
+                else:
+                    # 워커가 늦거나 실패하면 Streamlit 기본 차트로 대신 표시
+                    labels, values, _ = chart_data(current_responses, question_type, summary_error)
+                    if labels:
+                        st.bar_chart({"응답 수": dict(zip(labels, values))})
+                get_submission_tracer(sheet_id).drawn(active_q_id, time.time())
+                
+                # 참여 추이 (최근 2분, 초당 응답 수)
+                st.markdown("### 참여 추이")
+                col1, col2 = st.columns(2)
+                col1.metric("참여 상태", trend)
+                col2.metric(f"최근 {PLATEAU_SECONDS}초 응답", sum(arrivals[-PLATEAU_SECONDS:]))
+                st.line_chart({"초당 응답": arrivals}, height=160)
+                st.caption("최근 2분, 초 단위")
+                if trend == STATUS_PLATEAU:
+                    st.info("새 응답이 들어오지 않고 있습니다. 다음 질문으로 넘어가도 좋습니다.")
+                
+                # 요약을 쓰는 경우 응답 시트 전체는 요청할 때만 읽음
+                if responses is None and st.checkbox("응답 시트 전체 불러오기 (원시 데이터, 비슷한 응답 묶음)", key="load_raw_responses"):
+                    responses = load_responses(sheet_id)
+                
+                # 비슷한 단답형 응답 묶음
+                if question_type == "단답형" and responses is not None:
+                    with st.expander("비슷한 응답 묶음", expanded=True):
+                        answers = [r.get("응답", "") for r in filter_question_responses(responses, active_q_id)]
+                        clusterer = get_answer_clusterer(sheet_id, active_q_id)
+                        with timer("cluster_answers"):
+                            clusterer.update(answers, get_reset_epoch(sheet_id, RESPONSES))
+                        st.table([
+                            {
+                                "대표 응답": cluster.representative,
+                                "응답 수": cluster.count,
+                                "비슷한 응답": ", ".join(a for a, _ in cluster.answers.most_common(4)[1:]),
+                            }
+                            for cluster in clusterer.top(10)
+                        ])
                 
                 # 원시 데이터 표시
-                with st.expander("원시 응답 데이터"):
-                    # 응답 데이터를 테이블로 표시
-                    filtered_responses = [r for r in responses if r.get("질문ID") == active_q_id]
-                    
-                    # pandas 대신 직접 테이블 생성
-                    st.table(filtered_responses)
+                if responses is not None:
+                    with st.expander("원시 응답 데이터"):
+                        # 응답 데이터를 테이블로 표시
+                        # pandas 대신 직접 테이블 생성
+                        st.table(filter_question_responses(responses, active_q_id))
             else:
                 st.info("아직 이 질문에 대한 응답이 없습니다.")
         
         else:
             st.warning("현재 활성화된 질문이 없습니다. 사이드바에서 질문을 활성화해주세요.")
+        
+        render_leaderboard(sheet_id, questions)
+    
+    # 성능 계측 패널 (사이드바 하단)
+    with st.sidebar:
+        st.markdown("---")
+        render_perf_panel()
 
 if __name__ == "__main__":
-    main()
+    # 한글 폰트 설정 적용 (다른 모듈이 import 할 때는 폰트를 받지 않음)
+    set_korean_font()
+    with timer("rerun"):
+        main()
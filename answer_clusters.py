@@ -0,0 +1,138 @@
+"""비슷한 단답형 응답 묶기 (MinHash + LSH)
+
+글자 n-gram 집합의 자카드 유사도가 높은 응답을 한 묶음으로 모읍니다.
+한글은 자모로 풀어서 비교하므로 "재밌어요"와 "재미있어요"처럼 받침이나
+띄어쓰기만 다른 응답도 가깝게 봅니다.
+
+모든 응답 쌍을 비교하지 않고 MinHash 서명을 띠(band)로 나눈 LSH 버킷에서
+후보 묶음만 찾으므로 응답 수에 거의 비례하는 시간이 걸립니다.
+새 응답이 오면 그 응답만 추가로 처리합니다.
+"""
+import hashlib
+import re
+import struct
+import threading
+from collections import Counter
+
+NUM_PERM = 32        # MinHash 서명 길이
+BANDS = 16           # LSH 띠 수 (BANDS * ROWS == NUM_PERM)
+ROWS = 2             # 띠 하나의 행 수, 후보가 되는 유사도 기준 약 (1/BANDS)^(1/ROWS) = 0.25
+SHINGLE_SIZE = 3     # 자모 n-gram 길이
+SIMILARITY = 0.5     # 이 이상이면 같은 묶음 (후보는 서명으로 다시 확인)
+
+# n-gram 하나의 64바이트 해시를 16비트 값 32개로 나눠 32개의 해시 함수처럼 사용
+_UNPACK = struct.Struct(f"<{NUM_PERM}H").unpack
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+# 한글 음절을 초성/중성/종성 자모로 풀기
+def decompose_hangul(text):
+    chars = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            chars.append(chr(0x1100 + code // 588))
+            chars.append(chr(0x1161 + code % 588 // 28))
+            if code % 28:
+                chars.append(chr(0x11A7 + code % 28))
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+# 비교용 정규화 (소문자, 공백/문장부호 제거)
+def normalize(answer):
+    return _NON_WORD.sub("", str(answer).lower())
+
+
+def shingles(normalized):
+    text = decompose_hangul(normalized)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    rows = [_UNPACK(hashlib.blake2b(s.encode("utf-8"), digest_size=64).digest()) for s in shingle_set]
+    return tuple(map(min, zip(*rows)))
+
+
+# 두 서명의 추정 자카드 유사도
+def similarity(signature, other):
+    return sum(x == y for x, y in zip(signature, other)) / NUM_PERM
+
+
+class AnswerCluster:
+    __slots__ = ("signature", "count", "answers")
+
+    def __init__(self, signature):
+        self.signature = signature  # 묶음을 처음 만든 응답의 서명
+        self.count = 0
+        self.answers = Counter()    # 원래 응답 -> 개수
+
+    @property
+    def representative(self):
+        return self.answers.most_common(1)[0][0]
+
+
+class AnswerClusterer:
+    """응답을 순서대로 받아 비슷한 응답끼리 묶는다 (여러 세션이 함께 써도 안전)"""
+
+    def __init__(self, threshold=SIMILARITY):
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, epoch=None):
+        self.epoch = epoch  # 응답 시트 초기화 세대 (바뀌면 처음부터 다시 묶음)
+        self.clusters = []
+        self.buckets = {}  # (띠 번호, 띠 값) -> 묶음 번호
+        self.exact = {}    # 정규화한 응답 -> 묶음 번호
+        self.count = 0     # 지금까지 받은 응답 수
+
+    def _add(self, answer):
+        self.count += 1
+        key = normalize(answer)
+        if not key:
+            return
+        index = self.exact.get(key)
+        if index is None:
+            index = self._assign(minhash(shingles(key)))
+            self.exact[key] = index
+        cluster = self.clusters[index]
+        cluster.count += 1
+        cluster.answers[str(answer).strip()] += 1
+
+    def _assign(self, signature):
+        bands = [(b, signature[b * ROWS:(b + 1) * ROWS]) for b in range(BANDS)]
+        best, best_similarity = None, self.threshold
+        for index in {self.buckets[band] for band in bands if band in self.buckets}:
+            score = similarity(signature, self.clusters[index].signature)
+            if score >= best_similarity:
+                best, best_similarity = index, score
+        if best is None:
+            best = len(self.clusters)
+            self.clusters.append(AnswerCluster(signature))
+        for band in bands:
+            self.buckets.setdefault(band, best)
+        return best
+
+    def update(self, answers, epoch=None):
+        """answers 는 지금까지의 전체 응답 목록 (새로 추가된 뒷부분만 처리)"""
+        with self.lock:
+            if epoch != self.epoch or len(answers) < self.count:
+                self._reset(epoch)  # 응답 시트가 초기화된 경우
+            for answer in answers[self.count:]:
+                self._add(answer)
+
+    def top(self, k=10):
+        with self.lock:
+            return sorted(self.clusters, key=lambda c: c.count, reverse=True)[:k]
+
+
+# 응답 목록을 한 번에 묶기
+def cluster_answers(answers, threshold=SIMILARITY):
+    clusterer = AnswerClusterer(threshold)
+    clusterer.update(list(answers))
+    return clusterer
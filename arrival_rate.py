@@ -0,0 +1,131 @@
+"""질문별 응답 도착 추이 (관리자 앱에서 사용)
+
+응답 시트의 접수시각 열(예전 행은 시간 열)로 질문마다 초당 도착 수를 고정 크기 링 버퍼에 모읍니다.
+새 행이 들어올 때마다 해당 칸만 더하므로 갱신은 O(1)이고, 메모리는 질문마다
+WINDOW_SECONDS 칸으로 제한됩니다. 최근 도착 수로 참여가 정체되었는지 판단합니다.
+"""
+import datetime
+import threading
+import time
+
+from latency_trace import TRACE_HEADERS, from_millis
+
+WINDOW_SECONDS = 300     # 링 버퍼 길이 (최근 5분)
+PLATEAU_SECONDS = 15     # 최근 도착 수를 비교하는 구간 길이
+SLOWING_RATIO = 0.2      # 최근 구간 도착 수가 최고 구간의 이 비율 미만이면 둔화
+
+STATUS_WAITING = "응답 대기"
+STATUS_RISING = "응답 증가 중"
+STATUS_SLOWING = "응답 둔화"
+STATUS_PLATEAU = "참여 정체"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # save_response 가 기록하는 시간 형식 (서버 지역 시각)
+RECEIVED_COLUMN = 7 + TRACE_HEADERS.index("접수시각")  # 시간 ~ 제출ID 다음의 추적 열 (유닉스 밀리초)
+
+
+class ArrivalSeries:
+    """초 단위 도착 수 링 버퍼"""
+    __slots__ = ("window", "counts", "latest", "total", "last_arrival")
+
+    def __init__(self, window=WINDOW_SECONDS):
+        self.window = window
+        self.counts = [0] * window
+        self.latest = None        # 버퍼의 마지막 칸이 나타내는 초
+        self.total = 0
+        self.last_arrival = None  # 마지막 응답이 도착한 초
+
+    def _advance(self, second):
+        if self.latest is None:
+            self.latest = second
+            return
+        if second <= self.latest:
+            return
+        # 건너뛴 칸을 비움 (최대 window 칸)
+        for s in range(max(self.latest + 1, second - self.window + 1), second + 1):
+            self.counts[s % self.window] = 0
+        self.latest = second
+
+    def add(self, second):
+        self.total += 1
+        self.last_arrival = second if self.last_arrival is None else max(self.last_arrival, second)
+        self._advance(second)
+        if second > self.latest - self.window:
+            self.counts[second % self.window] += 1
+
+    def series(self, now, seconds=None):
+        """now 까지 최근 seconds 초의 초당 도착 수 (오래된 것부터)"""
+        seconds = min(seconds or self.window, self.window)
+        self._advance(int(now))
+        if self.latest is None:
+            return [0] * seconds
+        return [self.counts[s % self.window] for s in range(self.latest - seconds + 1, self.latest + 1)]
+
+    def status(self, now):
+        """참여 추이 (응답 대기 / 증가 중 / 둔화 / 정체)"""
+        if not self.total:
+            return STATUS_WAITING
+        values = self.series(now)
+        recent = sum(values[-PLATEAU_SECONDS:])
+        if recent == 0 and int(now) - self.last_arrival >= PLATEAU_SECONDS:
+            return STATUS_PLATEAU
+        # 버퍼 안에서 PLATEAU_SECONDS 구간 도착 수의 최댓값 (이동 합)
+        peak = running = sum(values[:PLATEAU_SECONDS])
+        for i in range(PLATEAU_SECONDS, len(values)):
+            running += values[i] - values[i - PLATEAU_SECONDS]
+            peak = max(peak, running)
+        if recent < peak * SLOWING_RATIO:
+            return STATUS_SLOWING
+        return STATUS_RISING
+
+
+def parse_time(value):
+    try:
+        return int(time.mktime(datetime.datetime.strptime(str(value).strip(), TIME_FORMAT).timetuple()))
+    except ValueError:
+        return None
+
+
+# 응답 행이 도착한 초 (접수시각이 없는 예전 행만 서버 지역 시각인 시간 열로 계산)
+def arrival_second(row):
+    if len(row) > RECEIVED_COLUMN:
+        received_at = from_millis(row[RECEIVED_COLUMN])
+        if received_at is not None:
+            return int(received_at)
+    return parse_time(row[0])
+
+
+class ArrivalTracker:
+    """응답 시트의 행을 순서대로 받아 질문별 ArrivalSeries 를 갱신한다"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, epoch=None):
+        self.epoch = epoch
+        self.next_row = 2          # 다음에 읽을 시트 행 번호 (헤더가 1행)
+        self.refreshed_at = 0.0
+        self.series = {}           # 질문ID -> ArrivalSeries
+
+    # rows 는 응답 시트 next_row 행부터의 값 (시간, 학번, 이름, 질문ID, ..., 접수시각, ...)
+    def add_rows(self, rows):
+        for row in rows:
+            self.next_row += 1
+            if len(row) < 4:
+                continue
+            second = arrival_second(row)
+            question_id = str(row[3]).strip()
+            if second is None or not question_id:
+                continue
+            series = self.series.get(question_id)
+            if series is None:
+                series = self.series[question_id] = ArrivalSeries()
+            series.add(second)
+
+    def snapshot(self, question_id, now, seconds):
+        """(최근 seconds 초의 초당 도착 수, 참여 추이, 전체 응답 수)"""
+        with self.lock:
+            series = self.series.get(str(question_id))
+            if series is None:
+                return [0] * seconds, STATUS_WAITING, 0
+            return series.series(now, seconds), series.status(now), series.total
@@ -0,0 +1,228 @@
+"""관리자 대시보드 주요 함수 마이크로 벤치마크
+
+admin_app.py / question_model.py 의 순수 함수들을 100, 1만, 10만 건의 합성 응답
+데이터(한국어 / 한영 혼합)로 측정합니다.
+
+측정 대상:
+- analyze_text_responses      (단답형 단어 빈도 분석, [근사] 는 Space-Saving 으로 계산)
+- render_chart                (chart_data + render_chart_png, 워커 프로세스 하나가 차트 하나에 쓰는 비용)
+                              [요약] 은 요약 시트의 단어 개수(dict, 질문마다 상위 항목만)로 그리는 경우
+- generate_qr_code            (QR 코드 생성, 데이터 크기와 무관)
+- parse_questions             (질문 행 파싱, 질문 수 = 데이터 크기)
+- cluster_answers             (단답형 응답 전체를 MinHash/LSH 로 처음부터 묶기)
+- get_active_question         (활성 질문 찾기)
+- filter_question_responses   (main() 의 현재 질문 응답 필터링)
+
+사용 예:
+    python benchmark.py --save-baseline            # 기준값 저장
+    python benchmark.py --compare                  # bench_baseline.json 과 비교 (느려지면 종료 코드 1)
+    python benchmark.py --sizes 100 10000 --filter analyze
+"""
+import os
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import warnings
+
+# 벤치마크는 Streamlit 서버 없이 실행되므로 bare mode 경고를 숨김
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+# 한글 폰트가 없는 환경에서 글리프 누락 경고가 측정 결과를 가리지 않도록 함
+warnings.filterwarnings("ignore", message="Glyph .* missing from")
+
+import admin_app  # noqa: E402
+from answer_clusters import cluster_answers  # noqa: E402
+from chart_render import render_chart_png  # noqa: E402
+from question_model import get_active_question, parse_questions  # noqa: E402
+from response_summary import QuestionSummary, cap_summaries  # noqa: E402
+from text_analysis import count_words  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+DEFAULT_SIZES = [100, 10_000, 100_000]
+LANGUAGES = ["ko", "mixed"]
+
+KO_WORDS = ["파이썬", "반복문", "그래프", "데이터", "분석", "재밌어요", "어려웠어요", "함수", "변수", "리스트",
+            "조건문", "시각화", "프로젝트", "수업", "흥미로웠던", "부분", "알고리즘", "정렬", "탐색", "친구들과"]
+EN_WORDS = ["python", "loop", "chart", "data", "streamlit", "function", "list", "AI", "game", "web",
+            "the", "and", "is", "fun", "API", "class", "pandas", "numpy", "matplotlib", "sort"]
+OPTIONS = ["Python", "JavaScript", "Java", "C++", "기타"]
+
+
+# 합성 응답 데이터 생성 (응답 시트의 행 형식과 동일)
+def make_responses(size, language, seed=0, question_count=10):
+    rng = random.Random(seed)
+    words = KO_WORDS if language == "ko" else KO_WORDS + EN_WORDS
+    rows = []
+    for i in range(size):
+        question_id = f"Q{i % question_count + 1}"
+        if question_id == "Q1":
+            answer = rng.choice(OPTIONS)
+        else:
+            answer = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        rows.append({
+            "시간": f"2024-01-01 10:{(i // 60) % 60:02d}:{i % 60:02d}",
+            "학번": "",
+            "이름": f"닉네임{i}",
+            "질문ID": question_id,
+            "응답": answer,
+            "세션ID": f"session-{i}",
+        })
+    return rows
+
+
+def make_questions(size):
+    questions = [
+        {"질문ID": f"Q{i}", "질문": f"질문 {i}", "유형": "단답형", "활성화": "N"}
+        for i in range(size)
+    ]
+    # 최악의 경우: 마지막 질문이 활성화됨
+    questions[-1]["활성화"] = "Y"
+    return questions
+
+
+# 워커 풀을 거치지 않고 같은 프로세스에서 그림 (프로세스 간 전달 비용 제외)
+def render_chart(data, question_type):
+    render_chart_png(question_type, *admin_app.chart_data(data, question_type))
+
+
+# 크기/언어별 측정 대상 (이름 -> 인자 없는 실행 함수)
+def build_cases(size, language):
+    responses = make_responses(size, language)
+    texts = [r["응답"] for r in responses]
+    choices = [r["응답"] for r in responses if r["질문ID"] == "Q1"]
+    word_counts = cap_summaries({"Q": QuestionSummary(len(texts), count_words(texts))})["Q"].counts
+    question_records = make_questions(size)
+    questions = parse_questions(question_records)
+
+    return {
+        "analyze_text_responses": lambda: admin_app.analyze_text_responses(texts, stream_threshold=size),
+        "analyze_text_responses[근사]": lambda: admin_app.analyze_text_responses(texts, stream_threshold=0),
+        "render_chart[객관식]": lambda: render_chart(choices, "객관식"),
+        "render_chart[단답형]": lambda: render_chart(texts, "단답형"),
+        "render_chart[단답형-요약]": lambda: render_chart(word_counts, "단답형"),
+        "cluster_answers": lambda: cluster_answers(texts),
+        "parse_questions": lambda: parse_questions(question_records),
+        "get_active_question": lambda: get_active_question(questions),
+        "filter_question_responses": lambda: admin_app.filter_question_responses(responses, "Q3"),
+    }
+
+
+# timeit.autorange 와 같은 방식으로 반복 횟수를 정한 뒤 여러 번 측정
+def measure(func, repeat, min_time):
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {"min": min(timings), "median": statistics.median(timings), "loops": number, "repeat": repeat}
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f}ms"
+    return f"{seconds:8.3f}s "
+
+
+def run_benchmarks(args):
+    results = {}
+    for size in args.sizes:
+        for language in args.languages:
+            cases = build_cases(size, language)
+            for name, func in cases.items():
+                if args.filter and not any(f in name for f in args.filter):
+                    continue
+                key = f"{name}|n={size}|{language}"
+                results[key] = measure(func, args.repeat, args.min_time)
+                print(f"{key:<48} min={format_seconds(results[key]['min'])} "
+                      f"median={format_seconds(results[key]['median'])}", flush=True)
+
+    # QR 코드는 응답 데이터 크기와 무관하므로 한 번만 측정
+    if not args.filter or any(f in "generate_qr_code" for f in args.filter):
+        key = "generate_qr_code"
+        url = "https://mentiinfo01-vote.streamlit.app"
+        results[key] = measure(lambda: admin_app.generate_qr_code(url), args.repeat, args.min_time)
+        print(f"{key:<48} min={format_seconds(results[key]['min'])} "
+              f"median={format_seconds(results[key]['median'])}", flush=True)
+    return results
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+# 기준값 대비 비교 (min 값 기준, 잡음이 가장 적음)
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n=== 기준값 비교 (기준 생성: {baseline['environment'].get('created', '?')}) ===")
+    for key, current in results.items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            print(f"{key:<48} (기준값 없음)")
+            continue
+        ratio = current["min"] / previous["min"] if previous["min"] else float("inf")
+        mark = ""
+        if ratio > threshold:
+            mark = "  <-- 느려짐"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            mark = "  (빨라짐)"
+        print(f"{key:<48} {format_seconds(previous['min'])} -> {format_seconds(current['min'])}  x{ratio:.2f}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관리자 대시보드 주요 함수 마이크로 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="합성 응답 수")
+    parser.add_argument("--languages", nargs="+", choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument("--filter", nargs="+", help="이름에 이 문자열이 들어간 측정만 실행")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--min-time", type=float, default=0.2, help="측정 1회의 최소 시간(초)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="결과를 기준값 파일로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="기준값 파일과 비교")
+    parser.add_argument("--threshold", type=float, default=1.25, help="이 배율 이상 느려지면 회귀로 판단")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값을 저장했습니다: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 {args.threshold}배 이상 느려졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
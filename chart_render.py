@@ -0,0 +1,214 @@
+"""응답 차트 렌더링 (관리자 앱에서 사용)
+
+pyplot 의 전역 상태는 스레드에 안전하지 않아서, 여러 관리자/프로젝터 화면이
+동시에 차트를 그리면 Streamlit 스크립트 스레드끼리 pyplot 상태와 GIL 을 두고
+경쟁합니다. 그래서 차트는 작은 워커 프로세스 풀에서 객체지향 Figure API 로 그리고
+PNG 바이트만 돌려받습니다. 스크립트 스레드는 결과를 기다리는 동안 GIL 을 놓으므로
+다른 세션을 막지 않고, 여러 화면의 차트가 워커 수만큼 병렬로 그려집니다.
+
+정해진 시간 안에 끝나지 않거나 워커가 죽으면 None 을 돌려주고, 호출하는 쪽에서
+Streamlit 기본 차트로 대신 표시합니다.
+"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+CHART_WORKERS = 2            # 워커 프로세스 수 (시크릿 general.chart_workers 로 변경)
+CHART_TIMEOUT_SECONDS = 10   # 이 시간 안에 못 그리면 대체 차트 사용
+
+COLORS = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#9999FF', '#99FFFF', '#FFFF99']
+
+_font_prop = None
+
+
+# 한글 폰트 (관리자 앱이 ~/.fonts 에 받아 둔 나눔고딕, 없으면 기본 폰트)
+def _get_font():
+    global _font_prop
+    if _font_prop is None:
+        from matplotlib import font_manager as fm
+        font_path = os.path.join(os.path.expanduser('~'), '.fonts', 'NanumGothic.ttf')
+        if os.path.exists(font_path):
+            fm.fontManager.addfont(font_path)
+            _font_prop = fm.FontProperties(fname=font_path)
+        else:
+            _font_prop = fm.FontProperties(family='DejaVu Sans')
+    return _font_prop
+
+
+# 워커 시작 시 matplotlib 과 폰트를 미리 불러 첫 차트가 느려지지 않게 함
+def _init_worker():
+    import matplotlib
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    font_prop = _get_font()
+    matplotlib.rcParams['font.family'] = font_prop.get_name()
+
+
+def _draw_choice_chart(fig, labels, values, font_prop):
+    # 1. 원형 차트 (좌측)
+    ax_pie, ax_bar = fig.subplots(1, 2)
+    ax_pie.pie(
+        values,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        shadow=True,
+        colors=COLORS[:len(values)],
+        wedgeprops={'edgecolor': 'w', 'linewidth': 1, 'antialiased': True},
+        textprops={'fontsize': 14, 'fontweight': 'bold', 'fontproperties': font_prop}
+    )
+    ax_pie.set_title('응답 분포', fontsize=18, pad=20, fontproperties=font_prop)
+
+    # 2. 막대 차트 (우측)
+    bars = ax_bar.bar(
+        range(len(labels)),
+        values,
+        color=COLORS[:len(values)],
+        width=0.6,
+        edgecolor='white',
+        linewidth=2
+    )
+    # 막대 위에 값 표시
+    for bar in bars:
+        height = bar.get_height()
+        ax_bar.text(
+            bar.get_x() + bar.get_width() / 2.,
+            height + 0.1,
+            f'{int(height)}',
+            ha='center',
+            va='bottom',
+            fontsize=12,
+            fontweight='bold',
+            fontproperties=font_prop
+        )
+    ax_bar.set_title('응답 수', fontsize=18, pad=20, fontproperties=font_prop)
+    ax_bar.set_xticks(range(len(labels)))
+    ax_bar.set_xticklabels(labels, rotation=45, ha='right', fontproperties=font_prop)
+    ax_bar.grid(axis='y', linestyle='--', alpha=0.7)
+
+    # 전체 타이틀
+    fig.suptitle('객관식 응답 결과', fontsize=22, y=0.98, fontproperties=font_prop)
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
+
+
+def _draw_text_chart(fig, labels, values, error, font_prop):
+    ax = fig.subplots()
+    # 수평 막대 그래프로 표시 (빈도 높은 순이 위에 오도록 역순)
+    labels = labels[::-1]
+    values = values[::-1]
+
+    # 그라데이션 색상 (numpy 대신 math 사용)
+    color_gradient = []
+    for i in range(len(labels)):
+        r = 0.1 + 0.6 * (i / len(labels))
+        g = 0.3 + 0.4 * math.sin(i / len(labels) * math.pi)
+        b = 0.8 - 0.6 * (i / len(labels))
+        color_gradient.append((r, g, b))
+
+    bars = ax.barh(
+        labels,
+        values,
+        color=color_gradient,
+        height=0.6,
+        edgecolor='white',
+        linewidth=1.5,
+        alpha=0.8
+    )
+    # 각 막대 옆에 값 표시
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(
+            width + 0.3,
+            bar.get_y() + bar.get_height() / 2.,
+            f'{int(width)}',
+            ha='left',
+            va='center',
+            fontsize=12,
+            fontweight='bold',
+            fontproperties=font_prop
+        )
+    ax.set_title('단답형 응답 분석 결과', fontsize=22, pad=20, fontproperties=font_prop)
+    xlabel = f'빈도 (근사값, 최대 오차 {error})' if error else '빈도'
+    ax.set_xlabel(xlabel, fontsize=14, labelpad=10, fontproperties=font_prop)
+    for tick in ax.get_yticklabels():
+        tick.set_fontproperties(font_prop)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+
+
+# 차트 하나를 PNG 바이트로 그리기 (워커 프로세스에서 실행, 대체 경로나 벤치마크에서도 사용)
+# labels/values 는 빈도 높은 순, 단답형에서 labels 가 비어 있으면 안내 문구만 그림
+def render_chart_png(question_type, labels, values, error=0):
+    from matplotlib.figure import Figure
+
+    font_prop = _get_font()
+    if question_type == "객관식":
+        fig = Figure(figsize=(12, 8))
+        _draw_choice_chart(fig, labels, values, font_prop)
+    elif labels:
+        fig = Figure(figsize=(12, 8))
+        _draw_text_chart(fig, labels, values, error, font_prop)
+    else:
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
+        ax.text(0.5, 0.5, '분석할 데이터가 충분하지 않습니다',
+                ha='center', va='center', fontsize=16, fontproperties=font_prop)
+        ax.axis('off')
+
+    buffered = BytesIO()
+    fig.savefig(buffered, format="png")
+    return buffered.getvalue()
+
+
+class ChartRenderer:
+    """차트 렌더링 워커 풀 (여러 세션이 함께 써도 안전)"""
+
+    def __init__(self, workers=CHART_WORKERS, timeout=CHART_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._pool = None
+
+    def _get_pool(self):
+        with self.lock:
+            if self._pool is None:
+                # Streamlit 서버는 스레드가 많으므로 fork 대신 spawn 으로 워커 시작
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool):
+        with self.lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, question_type, labels, values, error=0):
+        """PNG 바이트, 시간 초과나 워커 오류면 None"""
+        pool = self._get_pool()
+        try:
+            future = pool.submit(render_chart_png, question_type, list(labels), list(values), error)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            return None
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            return None
+        except BrokenProcessPool:
+            # 워커가 비정상 종료됨, 다음 요청에서 새 풀을 만듦
+            self._discard_pool(pool)
+            return None
+
+    def shutdown(self):
+        with self.lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,314 @@
+"""부하 테스트용 인메모리 gspread 대체 클라이언트
+
+실제 구글 시트 대신 프로세스 메모리에 워크시트를 두고, 앱이 사용하는
+gspread API(open_by_key, worksheets, get_all_records, append_row,
+update_cell, get, batch_get, update, batch_update, values_batch_get, find, findall, clear,
+add_worksheet, 스프레드시트 batch_update 일부)를 흉내 냅니다.
+호출마다 지연 시간과 할당량 오류를 주입할 수 있고, API 호출 수를 셉니다.
+"""
+import random
+import threading
+import time
+from collections import Counter, deque
+
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, numericise_all
+
+
+# APIError 생성에 필요한 최소한의 응답 객체
+class _FakeResponse:
+    def __init__(self, code, message, status):
+        self.status_code = code
+        self.text = message
+        self._payload = {"error": {"code": code, "message": message, "status": status}}
+
+    def json(self):
+        return self._payload
+
+
+class _FakeCell:
+    def __init__(self, row, col, value):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+# 지연 시간, 오류, 할당량, 호출 수 집계를 담당
+class FakeBackend:
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 quota_per_minute=None, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.calls = Counter()
+        self.errors = Counter()
+        self._window = deque()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def call(self, method):
+        """API 호출 1회를 기록하고, 설정에 따라 지연 및 오류를 발생시킨다."""
+        with self._lock:
+            self.calls[method] += 1
+            now = time.monotonic()
+            quota_exceeded = False
+            if self.quota_per_minute is not None:
+                while self._window and now - self._window[0] > 60:
+                    self._window.popleft()
+                if len(self._window) >= self.quota_per_minute:
+                    quota_exceeded = True
+                else:
+                    self._window.append(now)
+            random_error = self._random.random() < self.error_rate
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+
+        if delay:
+            time.sleep(delay / 1000)
+
+        if quota_exceeded or random_error:
+            with self._lock:
+                self.errors[method] += 1
+            raise APIError(_FakeResponse(
+                429,
+                "Quota exceeded for quota metric 'Read requests' (fake)",
+                "RESOURCE_EXHAUSTED",
+            ))
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+
+class FakeWorksheet:
+    def __init__(self, backend, title, rows=None, sheet_id=0):
+        self._backend = backend
+        self._lock = threading.Lock()
+        self.id = sheet_id
+        self.title = title
+        self._rows = [list(r) for r in (rows or [])]
+
+    @property
+    def row_count(self):
+        return len(self._rows)
+
+    def get_all_records(self, **kwargs):
+        self._backend.call("get_all_records")
+        with self._lock:
+            if not self._rows:
+                return []
+            headers = self._rows[0]
+            records = []
+            for row in self._rows[1:]:
+                values = numericise_all(list(row) + [""] * (len(headers) - len(row)))
+                records.append(dict(zip(headers, values)))
+            return records
+
+    def get_all_values(self, **kwargs):
+        self._backend.call("get_all_values")
+        with self._lock:
+            return [list(r) for r in self._rows]
+
+    def append_row(self, values, **kwargs):
+        self._backend.call("append_row")
+        with self._lock:
+            self._rows.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self._backend.call("append_rows")
+        with self._lock:
+            self._rows.extend([str(v) for v in row] for row in values)
+
+    # A1 범위 값 읽기 (실제 API 처럼 뒤쪽 빈 칸/빈 행은 잘라서 돌려줌)
+    def get(self, range_name=None, **kwargs):
+        self._backend.call("get")
+        with self._lock:
+            return self._get_range(range_name)
+
+    def batch_get(self, ranges, **kwargs):
+        self._backend.call("batch_get")
+        with self._lock:
+            return [self._get_range(range_name) for range_name in ranges]
+
+    def update(self, range_name, values=None, **kwargs):
+        self._backend.call("update")
+        with self._lock:
+            self._set_range(range_name, values)
+
+    def batch_update(self, data, **kwargs):
+        self._backend.call("batch_update")
+        with self._lock:
+            for item in data:
+                self._set_range(item["range"], item["values"])
+
+    def _get_range(self, range_name):
+        grid = a1_range_to_grid_range(range_name) if range_name else {}
+        row_start = grid.get("startRowIndex", 0)
+        row_end = grid.get("endRowIndex", len(self._rows))
+        col_start = grid.get("startColumnIndex", 0)
+        col_end = grid.get("endColumnIndex")
+        result = []
+        for row in self._rows[row_start:row_end]:
+            values = list(row[col_start:col_end])
+            while values and values[-1] == "":
+                values.pop()
+            result.append(values)
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    def _set_range(self, range_name, values):
+        grid = a1_range_to_grid_range(range_name)
+        row_start = grid.get("startRowIndex", 0)
+        col_start = grid.get("startColumnIndex", 0)
+        for r, row_values in enumerate(values or []):
+            for c, value in enumerate(row_values):
+                self._set_cell(row_start + r + 1, col_start + c + 1, value)
+
+    def _set_cell(self, row, col, value):
+        while len(self._rows) < row:
+            self._rows.append([])
+        target = self._rows[row - 1]
+        while len(target) < col:
+            target.append("")
+        target[col - 1] = str(value)
+
+    def update_cell(self, row, col, value):
+        self._backend.call("update_cell")
+        with self._lock:
+            self._set_cell(row, col, value)
+
+    def find(self, query, **kwargs):
+        self._backend.call("find")
+        with self._lock:
+            for r, row in enumerate(self._rows, start=1):
+                for c, value in enumerate(row, start=1):
+                    if value == str(query):
+                        return _FakeCell(r, c, value)
+        return None
+
+    def findall(self, query, **kwargs):
+        self._backend.call("findall")
+        with self._lock:
+            return [
+                _FakeCell(r, c, value)
+                for r, row in enumerate(self._rows, start=1)
+                for c, value in enumerate(row, start=1)
+                if value == str(query)
+            ]
+
+    def clear(self):
+        self._backend.call("clear")
+        with self._lock:
+            self._rows = []
+
+    # 스프레드시트 batch_update 의 요청 처리 (호출 수는 스프레드시트 쪽에서 셈)
+    def _resize(self, rows=None, cols=None):
+        if rows is not None:
+            self._rows = self._rows[:rows]
+        if cols is not None:
+            self._rows = [row[:cols] for row in self._rows]
+
+    def _update_cells(self, start_row, start_col, rows):
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row.get("values", [])):
+                value = cell.get("userEnteredValue", {})
+                self._set_cell(start_row + r + 1, start_col + c + 1, next(iter(value.values()), ""))
+        while self._rows and not any(self._rows[-1]):
+            self._rows.pop()
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, key):
+        self._backend = backend
+        self._lock = threading.Lock()
+        self.id = key
+        self._worksheets = []
+
+    def worksheets(self):
+        self._backend.call("worksheets")
+        with self._lock:
+            return list(self._worksheets)
+
+    def worksheet(self, title):
+        self._backend.call("worksheet")
+        with self._lock:
+            for ws in self._worksheets:
+                if ws.title == title:
+                    return ws
+        raise APIError(_FakeResponse(404, f"Worksheet {title} not found (fake)", "NOT_FOUND"))
+
+    def add_worksheet(self, title, rows=1, cols=1, **kwargs):
+        self._backend.call("add_worksheet")
+        with self._lock:
+            ws = FakeWorksheet(self._backend, title, sheet_id=self._next_sheet_id())
+            self._worksheets.append(ws)
+        return ws
+
+    def _next_sheet_id(self):
+        return max((ws.id for ws in self._worksheets), default=-1) + 1
+
+    # updateSheetProperties(행/열 수)와 updateCells 요청만 지원
+    def batch_update(self, body):
+        self._backend.call("batch_update")
+        with self._lock:
+            worksheets = {ws.id: ws for ws in self._worksheets}
+        for request in body.get("requests", []):
+            if "updateSheetProperties" in request:
+                properties = request["updateSheetProperties"]["properties"]
+                ws = worksheets[properties["sheetId"]]
+                grid = properties.get("gridProperties", {})
+                with ws._lock:
+                    ws._resize(grid.get("rowCount"), grid.get("columnCount"))
+            elif "updateCells" in request:
+                update = request["updateCells"]
+                ws = worksheets[update["start"]["sheetId"]]
+                with ws._lock:
+                    ws._update_cells(update["start"].get("rowIndex", 0), update["start"].get("columnIndex", 0), update["rows"])
+            else:
+                raise APIError(_FakeResponse(400, f"Unsupported request: {list(request)} (fake)", "INVALID_ARGUMENT"))
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+    # "'제목'!A2:C" 또는 "'제목'" 형식 범위 여러 개를 한 번에 읽기
+    def values_batch_get(self, ranges, **kwargs):
+        self._backend.call("values_batch_get")
+        with self._lock:
+            worksheets = {ws.title: ws for ws in self._worksheets}
+        value_ranges = []
+        for range_name in ranges:
+            title, _, cells = range_name.partition("!")
+            ws = worksheets.get(title.strip("'"))
+            if ws is None:
+                raise APIError(_FakeResponse(400, f"Unable to parse range: {range_name} (fake)", "INVALID_ARGUMENT"))
+            with ws._lock:
+                values = ws._get_range(cells or None)
+            value_ranges.append({"range": range_name, "values": values} if values else {"range": range_name})
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    # 부하 테스트 준비용 (API 호출로 집계하지 않음)
+    def seed_worksheet(self, title, rows):
+        with self._lock:
+            ws = FakeWorksheet(self._backend, title, rows, sheet_id=self._next_sheet_id())
+            self._worksheets = [w for w in self._worksheets if w.title != title]
+            self._worksheets.append(ws)
+        return ws
+
+
+class FakeClient:
+    """gspread.Client 대신 사용하는 인메모리 클라이언트"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or FakeBackend()
+        self._lock = threading.Lock()
+        self._spreadsheets = {}
+
+    def open_by_key(self, key):
+        self.backend.call("open_by_key")
+        return self.spreadsheet(key)
+
+    # 부하 테스트 준비용 (API 호출로 집계하지 않음)
+    def spreadsheet(self, key):
+        with self._lock:
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = FakeSpreadsheet(self.backend, key)
+            return self._spreadsheets[key]
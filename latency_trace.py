@@ -0,0 +1,94 @@
+"""응답 제출 지연 추적 (투표 앱, 참여 서버, 관리자 앱에서 사용)
+
+응답 행 끝에 요청시각 | 접수시각 | 전송시각 (유닉스 밀리초) 을 함께 기록하고,
+관리자 앱이 행을 처음 읽은 시각과 차트에 처음 그린 시각을 더해 단계별 지연을
+perf_metrics 히스토그램으로 모읍니다. "성능" 패널과 Prometheus 내보내기에서
+latency_* 항목으로 볼 수 있습니다.
+
+    latency_submit       요청 -> 접수       (누름부터 서버가 받기까지)
+    latency_queue        접수 -> 전송       (저널에서 시트로 보내기까지)
+    latency_write        전송 -> 기록 완료  (시트 추가 호출)
+    latency_propagation  전송 -> 확인       (관리자 앱이 새 행을 처음 읽기까지)
+    latency_render       확인 -> 표시       (그 질문의 차트를 처음 다시 그리기까지)
+    latency_end_to_end   요청 -> 표시
+
+요청시각은 참여 서버에서는 휴대폰 시계, 투표 앱에서는 버튼을 눌러 스크립트가 다시
+실행된 시각입니다. 앞 세 단계는 제출을 받는 프로세스에, 뒤 세 단계는 관리자 앱
+프로세스에 기록되며, 두 서버의 시계가 다르면 그만큼 전파 지연이 틀어집니다.
+"""
+import threading
+from collections import deque
+
+from perf_metrics import record
+
+TRACE_HEADERS = ["요청시각", "접수시각", "전송시각"]
+CLOCK_SKEW_LIMIT_SECONDS = 30  # 휴대폰 시계가 서버와 이보다 많이 다르면 요청시각을 버림
+MAX_PENDING = 5000             # 질문마다 표시를 기다리는 행 수 상한
+
+STAGE_SUBMIT = "latency_submit"
+STAGE_QUEUE = "latency_queue"
+STAGE_WRITE = "latency_write"
+STAGE_PROPAGATION = "latency_propagation"
+STAGE_RENDER = "latency_render"
+STAGE_END_TO_END = "latency_end_to_end"
+
+
+def to_millis(seconds):
+    return "" if seconds is None else str(int(seconds * 1000))
+
+
+def from_millis(value):
+    try:
+        return int(str(value).strip()) / 1000
+    except ValueError:
+        return None
+
+
+def trace_columns(requested_at, received_at, sent_at):
+    return [to_millis(requested_at), to_millis(received_at), to_millis(sent_at)]
+
+
+# 휴대폰이 보낸 요청시각 (밀리초) 확인, 서버 시계와 너무 다르면 None
+def client_time(value, received_at):
+    try:
+        seconds = float(value) / 1000
+    except (TypeError, ValueError):
+        return None
+    return seconds if abs(received_at - seconds) <= CLOCK_SKEW_LIMIT_SECONDS else None
+
+
+def record_stage(name, started, finished):
+    if started is not None and finished is not None:
+        record(name, max(0.0, finished - started))
+
+
+class SubmissionTracer:
+    """관리자 앱에서 행을 처음 읽은 시각과 차트에 처음 그린 시각을 기록한다"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}  # 질문ID -> deque[(확인 시각, 요청시각)]
+
+    # rows 는 응답 시트에 새로 추가된 행 (시간 ~ 전송시각), 처음 읽은 뒤 한 번만 전달
+    def seen(self, rows, now, first_column):
+        with self.lock:
+            for row in rows:
+                if len(row) < first_column + len(TRACE_HEADERS):
+                    continue  # 추적 열이 없는 예전 행
+                requested_at, received_at, sent_at = (
+                    from_millis(v) for v in row[first_column:first_column + len(TRACE_HEADERS)]
+                )
+                record_stage(STAGE_PROPAGATION, sent_at, now)
+                question_id = str(row[3]).strip()
+                queue = self.pending.get(question_id)
+                if queue is None:
+                    queue = self.pending[question_id] = deque(maxlen=MAX_PENDING)
+                queue.append((now, requested_at if requested_at is not None else received_at))
+
+    # question_id 차트를 그린 뒤 호출
+    def drawn(self, question_id, now):
+        with self.lock:
+            queue = self.pending.pop(str(question_id), None)
+        for seen_at, requested_at in queue or ():
+            record_stage(STAGE_RENDER, seen_at, now)
+            record_stage(STAGE_END_TO_END, requested_at, now)
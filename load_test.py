@@ -0,0 +1,293 @@
+"""투표 앱 동시 접속 부하 테스트
+
+vote_app.py 를 실제 Streamlit 서버로 띄우고(load_test_app.py 경유), 브라우저처럼
+웹소켓으로 접속하는 N개의 투표자 세션을 동시에 실행합니다. 구글 시트 대신
+fake_gspread 의 인메모리 클라이언트를 사용하므로 실제 할당량을 소모하지 않으며,
+지연 시간과 할당량 오류를 설정할 수 있습니다.
+
+각 세션은 실제 사용 흐름을 따라갑니다:
+닉네임 배정 -> 질문 로드 -> 선택지 선택 -> 제출 -> 대기 화면 폴링
+
+사용 예:
+    python load_test.py --sessions 50 --latency-ms 150 --quota-per-minute 300
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import websocket_connect
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_test_app.py")
+
+SAMPLE_ANSWERS = ["파이썬이 재밌어요", "그래프 그리기", "반복문", "데이터 분석이 흥미로웠어요", "Streamlit 앱 만들기"]
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def find_free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# 웹소켓으로 Streamlit 서버에 접속한 브라우저 1개를 흉내 냄
+class VoterSession:
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.conn = None
+        self.buttons = {}      # 라벨 -> 위젯 ID (마지막 실행 기준)
+        self.option_ids = []   # 객관식 선택지 버튼 ID
+        self.text_area_id = None
+        self.values = {}       # 위젯 ID -> 현재 값 (브라우저가 매번 함께 보내는 값)
+        self.alerts = []       # 한 번의 상호작용 동안 표시된 (형식, 내용)
+
+    async def connect(self):
+        origin = self.url.replace("ws://", "http://").split("/_stcore")[0]
+        request = HTTPRequest(self.url, headers={"Origin": origin}, connect_timeout=self.timeout)
+        self.conn = await websocket_connect(request)
+
+    async def rerun(self, trigger_id=None):
+        """스크립트를 다시 실행하고, st.rerun() 까지 포함해 끝날 때까지 기다린다."""
+        msg = BackMsg()
+        msg.rerun_script.widget_states.SetInParent()
+        states = msg.rerun_script.widget_states.widgets
+        for widget_id, value in self.values.items():
+            state = states.add()
+            state.id = widget_id
+            state.string_value = value
+        if trigger_id:
+            state = states.add()
+            state.CopyFrom(WidgetState(id=trigger_id, trigger_value=True))
+        self.alerts = []
+        await self.conn.write_message(msg.SerializeToString(), binary=True)
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+
+    async def _read_until_finished(self):
+        while True:
+            raw = await self.conn.read_message()
+            if raw is None:
+                raise ConnectionError("서버가 연결을 종료했습니다")
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(raw)
+            kind = fmsg.WhichOneof("type")
+            if kind == "new_session":
+                self.buttons, self.option_ids, self.text_area_id = {}, [], None
+            elif kind == "delta" and fmsg.delta.WhichOneof("type") == "new_element":
+                self._record_element(fmsg.delta.new_element)
+            elif kind == "script_finished":
+                if fmsg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    def _record_element(self, element):
+        kind = element.WhichOneof("type")
+        if kind == "button":
+            self.buttons[element.button.label] = element.button.id
+            if "option_" in element.button.id:
+                self.option_ids.append(element.button.id)
+        elif kind == "text_area":
+            self.text_area_id = element.text_area.id
+        elif kind == "alert":
+            self.alerts.append((element.alert.format, element.alert.body))
+        elif kind == "exception":
+            self.alerts.append((1, element.exception.message))
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+# 투표자 1명의 실제 흐름 실행
+async def run_voter(index, args, url, start_delay):
+    rng = random.Random(args.seed + index if args.seed is not None else None)
+    record = {"submit_latency": None, "ok": False, "error": None, "polls": 0}
+    session = VoterSession(url, args.timeout)
+    await asyncio.sleep(start_delay)
+    try:
+        # 1. 접속 (닉네임 배정 + 질문 로드)
+        await session.connect()
+        await session.rerun()
+
+        # 2. 선택지 선택 또는 답변 입력
+        if args.question_type == "객관식":
+            if not session.option_ids:
+                raise RuntimeError("선택지 버튼을 찾을 수 없습니다")
+            await session.rerun(trigger_id=rng.choice(session.option_ids))
+        else:
+            if session.text_area_id is None:
+                raise RuntimeError("답변 입력창을 찾을 수 없습니다")
+            session.values[session.text_area_id] = rng.choice(SAMPLE_ANSWERS)
+            await session.rerun()
+
+        # 3. 제출
+        submit_id = session.buttons.get("제출하기")
+        if submit_id is None:
+            raise RuntimeError("제출 버튼을 찾을 수 없습니다")
+        started = time.perf_counter()
+        await session.rerun(trigger_id=submit_id)
+        record["submit_latency"] = time.perf_counter() - started
+        record["ok"] = any("응답이 제출되었습니다" in body for _, body in session.alerts)
+        if not record["ok"]:
+            errors = [body for fmt, body in session.alerts if fmt == 1]
+            record["error"] = errors[0] if errors else "제출 결과를 확인할 수 없습니다"
+
+        # 4. 대기 화면 폴링
+        deadline = time.monotonic() + args.poll_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(args.poll_interval)
+            await session.rerun()
+            record["polls"] += 1
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        session.close()
+    return record
+
+
+# 서버 프로세스 최대 메모리 사용량 (리눅스 전용, 그 외에는 None)
+def peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_server(args, port, stats_path):
+    env = dict(os.environ)
+    env.update({
+        "LOAD_TEST_LATENCY_MS": str(args.latency_ms),
+        "LOAD_TEST_JITTER_MS": str(args.jitter_ms),
+        "LOAD_TEST_ERROR_RATE": str(args.error_rate),
+        "LOAD_TEST_QUOTA_PER_MINUTE": str(args.quota_per_minute or ""),
+        "LOAD_TEST_QUESTION_TYPE": args.question_type,
+        "LOAD_TEST_STATS": stats_path,
+    })
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.port", str(port),
+            "--server.headless", "true",
+            "--browser.gatherUsageStats", "false",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.3)
+    server.terminate()
+    raise RuntimeError("Streamlit 서버가 시작되지 않았습니다")
+
+
+def print_report(args, results, stats, elapsed, rss_mb):
+    latencies = [r["submit_latency"] for r in results if r["submit_latency"] is not None]
+    ok = sum(1 for r in results if r["ok"])
+    errors = Counter(r["error"] for r in results if r["error"])
+    calls = Counter(stats.get("calls", {}))
+    api_errors = stats.get("errors", {})
+    total_calls = sum(calls.values())
+
+    print(f"\n=== 부하 테스트 결과 ({args.sessions}개 세션, 유형: {args.question_type}) ===")
+    print(f"전체 소요 시간: {elapsed:.2f}s")
+    print(f"제출 성공: {ok}/{len(results)}")
+    print(f"처리량: {ok / elapsed:.2f} 제출/초")
+    if latencies:
+        print(
+            "제출 지연 시간: "
+            f"p50={percentile(latencies, 50) * 1000:.0f}ms "
+            f"p95={percentile(latencies, 95) * 1000:.0f}ms "
+            f"p99={percentile(latencies, 99) * 1000:.0f}ms "
+            f"평균={statistics.mean(latencies) * 1000:.0f}ms"
+        )
+    print(f"대기 화면 폴링: {sum(r['polls'] for r in results)}회")
+    if rss_mb is not None:
+        print(f"서버 최대 메모리: {rss_mb:.0f}MB")
+
+    print(f"\nAPI 호출 수 (총 {total_calls}회, 분당 {total_calls / elapsed * 60:.0f}회):")
+    for method, count in calls.most_common():
+        failed = api_errors.get(method, 0)
+        print(f"  {method:<16} {count:>7}" + (f"  (오류 {failed})" if failed else ""))
+
+    if errors:
+        print("\n오류:")
+        for message, count in errors.most_common(10):
+            print(f"  {count:>5} x {message}")
+
+
+async def run_all(args, url):
+    step = args.ramp_up / (args.sessions - 1) if args.ramp_up and args.sessions > 1 else 0.0
+    return await asyncio.gather(*(run_voter(i, args, url, i * step) for i in range(args.sessions)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="투표 앱 동시 접속 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=20, help="동시 투표자 세션 수")
+    parser.add_argument("--question-type", choices=["객관식", "단답형"], default="객관식")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="시트 API 호출당 평균 지연 시간")
+    parser.add_argument("--jitter-ms", type=float, default=30.0, help="지연 시간 편차 (균등 분포)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="API 호출별 무작위 오류 확률 (0~1)")
+    parser.add_argument("--quota-per-minute", type=int, default=None, help="분당 API 호출 한도 (초과 시 429 오류)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="모든 세션이 접속하기까지 걸리는 시간(초)")
+    parser.add_argument("--poll-seconds", type=float, default=10.0, help="제출 후 대기 화면을 유지하는 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="대기 화면 새로고침 간격(초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="스크립트 1회 실행 제한 시간(초)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Streamlit 서버 로그 표시")
+    args = parser.parse_args()
+
+    port = find_free_port()
+    stats_path = os.path.join(tempfile.mkdtemp(prefix="vote-load-test-"), "stats.json")
+    server = start_server(args, port, stats_path)
+    try:
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        started = time.perf_counter()
+        results = asyncio.run(run_all(args, url))
+        elapsed = time.perf_counter() - started
+
+        time.sleep(1)  # 마지막 API 호출 집계가 파일에 기록될 때까지 대기
+        rss_mb = peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    stats = {}
+    if os.path.exists(stats_path):
+        with open(stats_path, encoding="utf-8") as f:
+            stats = json.load(f)
+    print_report(args, results, stats, elapsed, rss_mb)
+
+
+if __name__ == "__main__":
+    main()
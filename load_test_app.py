@@ -0,0 +1,88 @@
+"""부하 테스트용 투표 앱 실행 래퍼
+
+load_test.py 가 `streamlit run load_test_app.py` 로 띄우는 스크립트입니다.
+구글 시트 클라이언트를 fake_gspread 의 인메모리 클라이언트로 바꾼 뒤
+vote_app.py 를 그대로 실행합니다. 설정은 환경 변수로 전달받습니다.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+import sheet_store
+from fake_gspread import FakeBackend, FakeClient
+from question_model import QUESTION_HEADERS
+from sheet_store import RESPONSE_HEADERS
+
+VOTE_APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vote_app.py")
+SHEET_ID = "load-test-sheet"
+
+
+SAMPLE_QUESTIONS = {
+    "객관식": ["Q1", "가장 좋아하는 프로그래밍 언어는?", "객관식", "Python", "JavaScript", "Java", "C++", "기타", "", "Y"],
+    "단답형": ["Q2", "이 수업에서 가장 흥미로웠던 부분은?", "단답형", "", "", "", "", "", "", "Y"],
+}
+
+
+def _env_float(name, default=None):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# API 호출 집계를 주기적으로 파일에 기록 (load_test.py 가 읽음)
+def _dump_stats_forever(backend, path):
+    while True:
+        stats = {"calls": dict(backend.calls), "errors": dict(backend.errors)}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        time.sleep(0.5)
+
+
+# 프로세스 전체에서 공유하는 인메모리 시트 (실제 배포의 공유 클라이언트와 동일한 범위)
+@st.cache_resource(show_spinner=False)
+def get_fake_client():
+    quota = _env_float("LOAD_TEST_QUOTA_PER_MINUTE")
+    backend = FakeBackend(
+        latency_ms=_env_float("LOAD_TEST_LATENCY_MS", 0.0),
+        jitter_ms=_env_float("LOAD_TEST_JITTER_MS", 0.0),
+        error_rate=_env_float("LOAD_TEST_ERROR_RATE", 0.0),
+        quota_per_minute=int(quota) if quota else None,
+    )
+    client = FakeClient(backend)
+    sheet = client.spreadsheet(SHEET_ID)
+    question_type = os.environ.get("LOAD_TEST_QUESTION_TYPE", "객관식")
+    sheet.seed_worksheet("질문", [QUESTION_HEADERS, SAMPLE_QUESTIONS[question_type]])
+    sheet.seed_worksheet("응답", [RESPONSE_HEADERS])
+
+    stats_path = os.environ.get("LOAD_TEST_STATS")
+    if stats_path:
+        threading.Thread(target=_dump_stats_forever, args=(backend, stats_path), daemon=True).start()
+    return client
+
+
+# 응답 제출 저널은 실행마다 새 위치에 기록 (이전 실행의 응답이 새 인메모리 시트로 재전송되지 않도록)
+@st.cache_resource(show_spinner=False)
+def get_journal_path():
+    return os.path.join(tempfile.mkdtemp(prefix="load-test-"), "submissions.journal")
+
+
+@st.cache_resource(show_spinner=False)
+def get_vote_app_code():
+    with open(VOTE_APP_PATH, encoding="utf-8") as f:
+        return compile(f.read(), VOTE_APP_PATH, "exec")
+
+
+fake_client = get_fake_client()
+sheet_store.create_gsheet_client = lambda service_account_info: fake_client
+st.secrets._secrets = {
+    # 재시작용 스냅숏은 쓰지 않음 (인메모리 시트는 실행마다 새로 만들어짐)
+    "general": {"sheet_id": SHEET_ID, "journal_path": get_journal_path(), "snapshot_dir": ""},
+    "gcp_service_account": {},
+}
+
+exec(get_vote_app_code(), {"__name__": "__main__", "__file__": VOTE_APP_PATH})
@@ -0,0 +1,18 @@
+"""랜덤 닉네임 (투표 앱과 참여 서버가 함께 사용)"""
+import random
+
+# 랜덤 닉네임 생성을 위한 단어 목록
+ANIMALS = ["판다", "호랑이", "사자", "코끼리", "기린", "코알라", "캥거루", "토끼", "거북이", "소라게", 
+           "여우", "늑대", "곰", "펭귄", "고래", "돌고래", "독수리", "참새", "까마귀", "앵무새", 
+           "뱀", "악어", "고양이", "강아지", "햄스터", "다람쥐", "원숭이", "고릴라", "치타", "표범"]
+
+ADJECTIVES = ["행복한", "즐거운", "신나는", "용감한", "지혜로운", "친절한", "재미있는", "귀여운", "멋진", 
+              "활발한", "조용한", "신비로운", "익살스러운", "날렵한", "느긋한", "부지런한", "창의적인", 
+              "엉뚱한", "호기심많은", "다정한", "열정적인", "사려깊은", "영리한", "우아한", "대담한"]
+
+
+# 랜덤 닉네임 생성 함수
+def generate_random_nickname():
+    adj = random.choice(ADJECTIVES)
+    animal = random.choice(ANIMALS)
+    return f"{adj} {animal}"
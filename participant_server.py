@@ -0,0 +1,337 @@
+"""가벼운 참여자 서버 (청중이 아주 많은 경우 vote_app.py 대신 사용)
+
+vote_app.py 는 휴대폰마다 Streamlit 웹소켓 세션을 유지하고 누를 때마다 스크립트
+전체를 다시 실행하므로, 참여자가 천 명 가까이 되면 메모리가 먼저 부족해집니다.
+이 서버는 정적 페이지 하나(participant.html)와 작은 JSON API 만 제공합니다.
+
+    GET  /?room=방이름                  참여 페이지
+    GET  /api/question?room=방이름      현재 질문 (질문이 없으면 question 이 null)
+    GET  /api/version?room=&since=버전  현재 질문이 since 와 달라질 때까지 기다렸다가 버전 반환
+                                        (최대 LONG_POLL_SECONDS 초, 롱 폴링)
+    POST /api/submit                    {"room", "qid", "answer", "session", "nickname", "client_time"}
+
+질문과 진행 상태는 방마다 백그라운드 작업 하나가 시트에서 주기적으로 읽어 메모리에
+두므로, 참여자 수와 무관하게 시트 API 호출 수가 일정합니다. 대기 중인 휴대폰은
+코루틴 하나만 차지하므로 프로세스 하나로 수천 명을 받을 수 있습니다.
+응답은 투표 앱과 같은 제출 저널(submission_journal.py)에 기록한 뒤 응답 시트와
+요약 시트에 모아서 반영합니다.
+
+투표 앱과 같은 .streamlit/secrets.toml 을 사용합니다. 투표 앱을 같은 방에 함께 띄우는
+경우 요약 시트를 두 프로세스가 갱신하게 되므로 둘 중 하나만 쓰는 것을 권장합니다.
+
+실행:
+    python participant_server.py --port 8600
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+import tornado.httpserver
+import tornado.netutil
+import tornado.web
+
+from latency_trace import client_time
+from nicknames import generate_random_nickname
+from perf_metrics import timer
+from question_model import parse_questions
+from run_of_show import RunOfShow, resolve_active_question
+from sheet_store import (
+    ResponseJournal, RoomHandles, SummaryWriter,
+    create_gsheet_client, read_questions, read_run_of_show, sheet_id_for_room,
+)
+
+DEFAULT_PORT = 8600
+PAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "participant.html")
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "participant.journal")
+
+QUESTION_REFRESH_SECONDS = 5   # 질문 시트를 다시 읽는 간격 (투표 앱 캐시와 같은 주기)
+SHOW_REFRESH_SECONDS = 1       # 진행 상태를 다시 읽는 간격
+ROOM_IDLE_SECONDS = 600        # 이 시간 동안 요청이 없으면 방의 새로고침 작업을 멈춤
+LONG_POLL_SECONDS = 25         # /api/version 이 변화를 기다리는 최대 시간
+MAX_ANSWER_LENGTH = 500        # 단답형 응답 최대 길이
+SUBMIT_WORKERS = 64            # 저널 기록을 기다리는 스레드 수 (그룹 커밋으로 함께 기록됨)
+LISTEN_BACKLOG = 4096          # QR 코드를 찍은 휴대폰이 한꺼번에 접속해도 연결이 거부되지 않도록
+
+logger = logging.getLogger("participant_server")
+
+
+# 질문 하나의 버전 (질문이 바뀌거나 내용이 수정되면 달라짐)
+def question_version(question):
+    if question is None:
+        return "none"
+    key = json.dumps([question.qid, question.text, question.qtype, question.options], ensure_ascii=False)
+    return f"{question.qid}-{zlib.crc32(key.encode('utf-8')):08x}"
+
+
+class RoomFeed:
+    """방 하나의 질문/진행 상태를 메모리에 두고 주기적으로 새로고침"""
+
+    def __init__(self, server, sheet_id):
+        self.server = server
+        self.sheet_id = sheet_id
+        self.room = server.get_room(sheet_id)
+        self.questions = parse_questions([])
+        self.show = RunOfShow()
+        self.ready = asyncio.Event()
+        self.changed = asyncio.Event()
+        self.answered = {}  # 질문ID -> 제출한 세션ID 집합, 같은 세션의 중복 제출 방지
+        self.last_seen = time.monotonic()
+        self.task = asyncio.get_running_loop().create_task(self.refresh_forever())
+
+    def current(self, now):
+        return resolve_active_question(self.questions, self.show, now)
+
+    # 질문의 제출한 세션 집합 (지금 질문만 받으므로 지난 질문의 집합은 버림)
+    def answered_sessions(self, qid):
+        sessions = self.answered.get(qid)
+        if sessions is None:
+            self.answered = {qid: set()}
+            sessions = self.answered[qid]
+        return sessions
+
+    async def refresh_forever(self):
+        get_client = lambda: self.server.client
+        questions_due = 0.0
+        while time.monotonic() - self.last_seen < ROOM_IDLE_SECONDS:
+            before = question_version(self.current(time.time()))
+            try:
+                if time.monotonic() >= questions_due:
+                    with timer("server_load_questions"):
+                        self.questions = await asyncio.to_thread(read_questions, self.room, get_client)
+                    questions_due = time.monotonic() + QUESTION_REFRESH_SECONDS
+                with timer("server_load_show"):
+                    self.show = await asyncio.to_thread(read_run_of_show, self.room, get_client)
+            except Exception:
+                logger.exception("시트 새로고침 오류 (%s)", self.sheet_id)
+            self.ready.set()
+            if question_version(self.current(time.time())) != before:
+                self.notify()
+            await asyncio.sleep(SHOW_REFRESH_SECONDS)
+        self.server.feeds.pop(self.sheet_id, None)
+
+    # 기다리는 /api/version 요청을 모두 깨움
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def wait_for_change(self, since, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.time()
+            version = question_version(self.current(now))
+            remaining = deadline - time.monotonic()
+            if version != since or remaining <= 0:
+                return version
+            # 제한 시간으로 넘어가는 질문은 시트를 읽지 않아도 시각만으로 바뀜
+            switch_at = self.show.next_switch_at(now)
+            if switch_at is not None:
+                remaining = min(remaining, max(0.05, switch_at - now))
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+
+class ParticipantServer:
+    def __init__(self, client, journal_path):
+        self.client = client
+        self.lock = threading.Lock()
+        self.rooms = {}    # 시트 ID -> RoomHandles (새로고침 작업과 저널 재전송이 공유)
+        self.writers = {}  # 시트 ID -> SummaryWriter
+        self.feeds = {}    # 시트 ID -> RoomFeed
+        self.journal = ResponseJournal(journal_path, client, self.get_room, self.get_writer)
+        self.submit_executor = ThreadPoolExecutor(max_workers=SUBMIT_WORKERS, thread_name_prefix="submit")
+        with open(PAGE_PATH, "rb") as f:
+            self.page = f.read()
+
+    def get_room(self, sheet_id):
+        with self.lock:
+            room = self.rooms.get(sheet_id)
+            if room is None:
+                room = self.rooms[sheet_id] = RoomHandles(sheet_id)
+            return room
+
+    def get_writer(self, sheet_id):
+        room = self.get_room(sheet_id)
+        with self.lock:
+            writer = self.writers.get(sheet_id)
+            if writer is None:
+                writer = self.writers[sheet_id] = SummaryWriter(room, self.client)
+                writer.start()
+            return writer
+
+    async def get_feed(self, room_name):
+        sheet_id = sheet_id_for_room(room_name)
+        if not sheet_id:
+            return None
+        feed = self.feeds.get(sheet_id)
+        if feed is None:
+            feed = self.feeds[sheet_id] = RoomFeed(self, sheet_id)
+        feed.last_seen = time.monotonic()
+        await feed.ready.wait()
+        return feed
+
+    def submit(self, sheet_id, row, question_type, requested_at=None):
+        with timer("server_submit"):
+            self.journal.submit(sheet_id, row, question_type, requested_at)
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, server):
+        self.server = server
+
+    def send_json(self, data, status=200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.set_header("Cache-Control", "no-store")
+        self.finish(json.dumps(data, ensure_ascii=False))
+
+    async def get_feed_or_error(self, room_name):
+        feed = await self.server.get_feed(room_name)
+        if feed is None:
+            self.send_json({"error": f"등록되지 않은 방입니다: {room_name}"}, 404)
+        return feed
+
+
+class PageHandler(BaseHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/html; charset=utf-8")
+        self.finish(self.server.page)
+
+
+class QuestionHandler(BaseHandler):
+    async def get(self):
+        feed = await self.get_feed_or_error(self.get_query_argument("room", ""))
+        if feed is None:
+            return
+        now = time.time()
+        question = feed.current(now)
+        data = {
+            "version": question_version(question),
+            "question": None,
+            "switch_at": feed.show.next_switch_at(now),
+        }
+        if question is not None:
+            data["question"] = {
+                "id": question.qid,
+                "text": question.text,
+                "type": question.qtype,
+                "options": list(question.options),
+            }
+        if self.get_query_argument("nickname", ""):
+            data["nickname"] = generate_random_nickname()
+        self.send_json(data)
+
+
+class VersionHandler(BaseHandler):
+    async def get(self):
+        feed = await self.get_feed_or_error(self.get_query_argument("room", ""))
+        if feed is None:
+            return
+        since = self.get_query_argument("since", "")
+        version = await feed.wait_for_change(since, LONG_POLL_SECONDS)
+        self.send_json({"version": version})
+
+
+class SubmitHandler(BaseHandler):
+    async def post(self):
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            self.send_json({"error": "잘못된 요청입니다."}, 400)
+            return
+        feed = await self.get_feed_or_error(str(body.get("room", "")))
+        if feed is None:
+            return
+
+        question = feed.current(time.time())
+        qid = str(body.get("qid", ""))
+        session_id = str(body.get("session", ""))[:64]
+        nickname = str(body.get("nickname", "")).strip()[:40]
+        answer = str(body.get("answer", "")).strip()
+        if question is None or question.qid != qid:
+            self.send_json({"error": "이미 종료된 질문입니다."}, 409)
+            return
+        if not session_id or not answer:
+            self.send_json({"error": "응답을 입력해주세요."}, 400)
+            return
+        if question.qtype == "객관식" and answer not in question.options:
+            self.send_json({"error": "선택지에 없는 응답입니다."}, 400)
+            return
+        if len(answer) > MAX_ANSWER_LENGTH:
+            self.send_json({"error": f"응답은 {MAX_ANSWER_LENGTH}자 이내로 입력해주세요."}, 400)
+            return
+        answered = feed.answered_sessions(qid)
+        if session_id in answered:
+            self.send_json({"ok": True, "duplicate": True})
+            return
+
+        row = [
+            datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # 시간
+            "",  # 학번 대신 빈 값
+            nickname or generate_random_nickname(),  # 닉네임
+            qid,  # 질문 ID
+            answer,  # 응답
+            session_id,  # 세션 ID
+        ]
+        requested_at = client_time(body.get("client_time"), time.time())  # 휴대폰에서 제출을 누른 시각
+        answered.add(session_id)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self.server.submit_executor, self.server.submit, feed.sheet_id, row, question.qtype, requested_at
+            )
+        except OSError:
+            answered.discard(session_id)
+            logger.exception("응답 저널 기록 오류")
+            self.send_json({"error": "응답 제출 중 오류가 발생했습니다. 다시 시도해주세요."}, 503)
+            return
+        self.send_json({"ok": True})
+
+
+def make_app(server):
+    args = {"server": server}
+    return tornado.web.Application([
+        (r"/", PageHandler, args),
+        (r"/api/question", QuestionHandler, args),
+        (r"/api/version", VersionHandler, args),
+        (r"/api/submit", SubmitHandler, args),
+    ])
+
+
+def listen(app, port, address=""):
+    http_server = tornado.httpserver.HTTPServer(app, xheaders=True)
+    http_server.add_sockets(tornado.netutil.bind_sockets(port, address, backlog=LISTEN_BACKLOG))
+    return http_server
+
+
+async def serve(port, client, journal_path, address=""):
+    server = ParticipantServer(client, journal_path)
+    listen(make_app(server), port, address)
+    logger.info("참여 서버 시작: http://%s:%d/", address or "0.0.0.0", port)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가벼운 참여자 서버")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--address", default="")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL_PATH, help="응답 제출 저널 위치")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    client = create_gsheet_client(dict(st.secrets["gcp_service_account"]))
+    asyncio.run(serve(args.port, client, args.journal, args.address))
+
+
+if __name__ == "__main__":
+    main()
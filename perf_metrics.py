@@ -0,0 +1,216 @@
+"""성능 계측 모듈
+
+시트 API 호출, 차트 렌더링, 스크립트 재실행에 걸린 시간과 캐시 적중률을
+프로세스 단위로 모읍니다. 모든 세션이 같은 값을 공유하며, 관리자 화면의
+"성능" 패널과 Prometheus 텍스트 형식 내보내기에 사용됩니다.
+"""
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+METRIC_PREFIX = "menti"
+
+# Prometheus 히스토그램 구간 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_local = threading.local()
+_timings = {}
+_cache_counts = {}
+_started_at = time.time()
+
+
+class _Timing:
+    __slots__ = ("count", "total", "max", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent = deque(maxlen=512)  # 패널의 p50/p95 계산용 최근 값
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.recent.append(seconds)
+
+
+def record(name, seconds):
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = _Timing()
+        timing.add(seconds)
+
+
+@contextmanager
+def timer(name):
+    """with 블록의 실행 시간을 name 으로 기록한다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+# 함수 실행 시간 기록 데코레이터 (캐시 데코레이터 안쪽에 두면 캐시 미스일 때만 실행됨)
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            executed = getattr(_local, "executed", None)
+            if executed is not None:
+                executed.add(name)
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# 캐시 적중률 기록 데코레이터
+# st.cache_data / st.cache_resource 바깥에 두고, 같은 이름의 @timed 를 안쪽에 둔다.
+# 안쪽 함수가 실제로 실행되었으면 미스, 아니면 적중으로 센다.
+def cache_counted(name):
+    def decorator(cached_func):
+        @functools.wraps(cached_func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "executed", None) is None:
+                _local.executed = set()
+            _local.executed.discard(name)
+            result = cached_func(*args, **kwargs)
+            hit = name not in _local.executed
+            with _lock:
+                counts = _cache_counts.setdefault(name, [0, 0])
+                counts[0 if hit else 1] += 1
+            return result
+        # st.cache_data 의 clear() 등은 그대로 사용할 수 있도록 유지
+        for attr in ("clear",):
+            if hasattr(cached_func, attr):
+                setattr(wrapper, attr, getattr(cached_func, attr))
+        return wrapper
+    return decorator
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def snapshot():
+    """현재까지의 계측 결과를 (시간 통계, 캐시 통계) 형태로 돌려준다."""
+    with _lock:
+        timings = {
+            name: {
+                "count": t.count,
+                "total": t.total,
+                "max": t.max,
+                "p50": _percentile(t.recent, 50),
+                "p95": _percentile(t.recent, 95),
+                "buckets": list(t.buckets),
+            }
+            for name, t in _timings.items()
+        }
+        caches = {name: {"hits": c[0], "misses": c[1]} for name, c in _cache_counts.items()}
+    return timings, caches
+
+
+def reset():
+    global _started_at
+    with _lock:
+        _timings.clear()
+        _cache_counts.clear()
+        _started_at = time.time()
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Prometheus 텍스트 형식으로 내보내기
+def export_prometheus():
+    timings, caches = snapshot()
+    name = f"{METRIC_PREFIX}_operation_duration_seconds"
+    lines = [
+        f"# HELP {name} Duration of Sheets calls, chart rendering and script reruns.",
+        f"# TYPE {name} histogram",
+    ]
+    for op, t in sorted(timings.items()):
+        label = f'operation="{_escape_label(op)}"'
+        for bound, count in zip(BUCKETS, t["buckets"]):
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {t["count"]}')
+        lines.append(f"{name}_sum{{{label}}} {t['total']:.6f}")
+        lines.append(f"{name}_count{{{label}}} {t['count']}")
+
+    name = f"{METRIC_PREFIX}_cache_requests_total"
+    lines.append(f"# HELP {name} Cached function calls by result.")
+    lines.append(f"# TYPE {name} counter")
+    for func, c in sorted(caches.items()):
+        label = f'function="{_escape_label(func)}"'
+        lines.append(f'{name}{{{label},result="hit"}} {c["hits"]}')
+        lines.append(f'{name}{{{label},result="miss"}} {c["misses"]}')
+
+    name = f"{METRIC_PREFIX}_metrics_start_time_seconds"
+    lines.append(f"# HELP {name} Unix time when metric collection started.")
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"{name} {_started_at:.0f}")
+    return "\n".join(lines) + "\n"
+
+
+# 관리자 화면의 "성능" 패널
+# controls 가 False 면 표만 보여줌 (내보내기와 초기화는 관리자 앱에서만)
+def render_perf_panel(controls=True):
+    with st.expander("성능", expanded=False):
+        timings, caches = snapshot()
+        if not timings and not caches:
+            st.caption("아직 수집된 계측 데이터가 없습니다.")
+            return
+
+        st.caption("이 서버 프로세스에서 수집한 값입니다 (모든 세션 공유).")
+        if timings:
+            st.table([
+                {
+                    "항목": op,
+                    "횟수": t["count"],
+                    "평균(ms)": f"{t['total'] / t['count'] * 1000:.1f}",
+                    "p50(ms)": f"{t['p50'] * 1000:.1f}",
+                    "p95(ms)": f"{t['p95'] * 1000:.1f}",
+                    "최대(ms)": f"{t['max'] * 1000:.1f}",
+                }
+                for op, t in sorted(timings.items())
+            ])
+        if caches:
+            st.table([
+                {
+                    "캐시": func,
+                    "적중": c["hits"],
+                    "미스": c["misses"],
+                    "적중률": f"{c['hits'] / max(1, c['hits'] + c['misses']) * 100:.0f}%",
+                }
+                for func, c in sorted(caches.items())
+            ])
+
+        if not controls:
+            return
+        st.download_button(
+            "Prometheus 형식으로 내보내기",
+            data=export_prometheus(),
+            file_name="menti_metrics.prom",
+            mime="text/plain",
+            use_container_width=True,
+        )
+        if st.button("계측 초기화", use_container_width=True):
+            reset()
+            st.rerun()
@@ -0,0 +1,111 @@
+"""질문 일괄 가져오기 (관리자 앱에서 사용)
+
+CSV 파일이나 스프레드시트에서 복사해 붙여 넣은 표(탭 구분)를 질문 시트 행으로
+바꾸고, 시트에 쓰기 전에 로컬에서 모두 검사합니다. 검사를 통과한 행은
+import_questions 가 한 번의 요청으로 질문 시트 전체에 씁니다.
+
+- 첫 행은 머리글 (질문 시트와 같은 열 이름, 순서는 달라도 됨, 질문과 유형은 필수)
+- 질문ID 가 비어 있으면 Q1, Q2 ... 로 채움
+- 객관식은 선택지가 두 개 이상 필요하고, 정답이 있으면 선택지 중 하나여야 함
+- 활성화는 Y/N (비어 있으면 N), 활성화된 질문은 하나까지
+"""
+import csv
+import io
+
+from question_model import ACTIVE_VALUES, MAX_OPTIONS, QUESTION_HEADERS
+from quiz_scoring import ANSWER_SEPARATOR
+
+REQUIRED_HEADERS = ("질문", "유형")
+QUESTION_TYPES = ("객관식", "단답형")
+INACTIVE_VALUES = ("", "n", "no")
+
+
+# 업로드한 파일 내용 -> 문자열 (엑셀에서 저장한 CSV 는 CP949 인 경우가 많음)
+def decode_table(data):
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("파일 인코딩을 알 수 없습니다. UTF-8 CSV 로 저장해주세요.")
+
+
+def _read_table(text):
+    text = text.lstrip("\ufeff")
+    delimiter = "\t" if "\t" in text.split("\n", 1)[0] else ","
+    return [[cell.strip() for cell in row] for row in csv.reader(io.StringIO(text), delimiter=delimiter)]
+
+
+def parse_question_table(text):
+    """표 문자열 -> (질문 시트 행 목록, 오류 목록), 오류가 있으면 행은 쓰지 않아야 함"""
+    table = [row for row in _read_table(text) if any(row)]
+    if not table:
+        return [], ["가져올 내용이 없습니다."]
+
+    headers = table[0]
+    unknown = [h for h in headers if h and h not in QUESTION_HEADERS]
+    missing = [h for h in REQUIRED_HEADERS if h not in headers]
+    duplicated = sorted({h for h in headers if h and headers.count(h) > 1})
+    errors = []
+    if unknown:
+        errors.append(f"알 수 없는 열: {', '.join(unknown)} (사용할 수 있는 열: {', '.join(QUESTION_HEADERS)})")
+    if missing:
+        errors.append(f"필수 열이 없습니다: {', '.join(missing)}")
+    if duplicated:
+        errors.append(f"같은 열이 여러 번 있습니다: {', '.join(duplicated)}")
+    if errors:
+        return [], errors
+    if len(table) < 2:
+        return [], ["머리글 아래에 질문이 없습니다."]
+
+    rows = []
+    active_lines = []
+    used_ids = set()
+    for line, values in enumerate(table[1:], start=2):
+        record = dict(zip(headers, values + [""] * (len(headers) - len(values))))
+        if len(values) > len(headers) and any(values[len(headers):]):
+            errors.append(f"{line}행: 머리글보다 값이 많습니다.")
+        qtype = record.get("유형", "")
+        options = [record.get(f"선택지{i}", "") for i in range(1, MAX_OPTIONS + 1)]
+        answer = record.get("정답", "")
+        active = record.get("활성화", "").lower()
+
+        if not record.get("질문"):
+            errors.append(f"{line}행: 질문이 비어 있습니다.")
+        if qtype not in QUESTION_TYPES:
+            errors.append(f"{line}행: 유형은 {' 또는 '.join(QUESTION_TYPES)} 이어야 합니다. (입력: {qtype or '빈 값'})")
+        if qtype == "객관식":
+            filled = [o for o in options if o]
+            if len(filled) < 2:
+                errors.append(f"{line}행: 객관식 질문은 선택지가 두 개 이상 필요합니다.")
+            wrong = [a for a in answer.split(ANSWER_SEPARATOR) if a.strip() and a.strip() not in filled]
+            if wrong:
+                errors.append(f"{line}행: 정답이 선택지에 없습니다: {', '.join(wrong)}")
+        if active not in ACTIVE_VALUES + INACTIVE_VALUES:
+            errors.append(f"{line}행: 활성화는 Y 또는 N 이어야 합니다. (입력: {record.get('활성화')})")
+        elif active in ACTIVE_VALUES:
+            active_lines.append(line)
+
+        qid = record.get("질문ID", "")
+        if qid in used_ids:
+            errors.append(f"{line}행: 질문ID 가 중복됩니다: {qid}")
+        if qid:
+            used_ids.add(qid)
+        rows.append([
+            qid, record.get("질문", ""), qtype, *options, answer,
+            "Y" if active in ACTIVE_VALUES else "N",
+        ])
+
+    if len(active_lines) > 1:
+        errors.append(f"활성화된 질문은 하나만 둘 수 있습니다. ({', '.join(map(str, active_lines))}행)")
+
+    # 비어 있는 질문ID 채우기 (이미 쓰인 ID 는 건너뜀)
+    number = 0
+    for row in rows:
+        if not row[0]:
+            number += 1
+            while f"Q{number}" in used_ids:
+                number += 1
+            row[0] = f"Q{number}"
+            used_ids.add(row[0])
+    return rows, errors
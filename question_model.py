@@ -0,0 +1,103 @@
+"""질문 데이터 모델 (관리자 앱과 투표 앱이 함께 사용)
+
+질문 시트의 행(dict)을 가져올 때마다 한 번만 파싱해서, 선택지와 유형이
+미리 계산된 Question 객체와 질문ID 조회용 맵, 활성 질문 포인터를 만듭니다.
+재실행마다 원시 행을 다시 훑지 않아도 됩니다.
+"""
+
+MAX_OPTIONS = 5  # 선택지1 ~ 선택지5
+ACTIVE_VALUES = ("y", "yes")
+
+# 질문 시트 열 순서
+QUESTION_HEADERS = (
+    ["질문ID", "질문", "유형"] + [f"선택지{i}" for i in range(1, MAX_OPTIONS + 1)] + ["정답", "활성화"]
+)
+
+
+class Question:
+    __slots__ = ("qid", "text", "qtype", "options", "answer", "active", "row")
+
+    def __init__(self, qid, text, qtype, options, answer, active, row):
+        self.qid = qid            # 질문ID (문자열)
+        self.text = text          # 질문
+        self.qtype = qtype        # 유형 (소문자, 예: "객관식", "단답형")
+        self.options = options    # 비어 있지 않은 선택지 튜플
+        self.answer = answer      # 정답 (없으면 "")
+        self.active = active      # 활성화 여부
+        self.row = row            # 시트에서의 행 번호 (헤더가 1행)
+
+    def __repr__(self):
+        return f"Question({self.qid!r}, {self.text!r}, active={self.active})"
+
+
+class QuestionSet:
+    __slots__ = ("questions", "by_id", "active")
+
+    def __init__(self, questions):
+        self.questions = tuple(questions)
+        self.by_id = {}
+        self.active = None
+        for q in self.questions:
+            self.by_id.setdefault(q.qid, q)
+            # 기존 동작과 같이 활성화된 질문이 여러 개면 첫 번째를 사용
+            if q.active and self.active is None:
+                self.active = q
+
+    def get(self, qid):
+        return self.by_id.get(str(qid))
+
+    def with_active(self, qid, active):
+        """qid 질문의 활성화 상태를 바꾼 새 QuestionSet (하나를 활성화하면 나머지는 비활성화)"""
+        qid = str(qid)
+        questions = []
+        for q in self.questions:
+            if q.qid == qid:
+                flag = active
+            else:
+                flag = q.active and not active
+            if flag != q.active:
+                q = Question(q.qid, q.text, q.qtype, q.options, q.answer, flag, q.row)
+            questions.append(q)
+        return QuestionSet(questions)
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __bool__(self):
+        return bool(self.questions)
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+# 질문 시트 행 하나를 Question 으로 변환
+def parse_question(record, index):
+    options = []
+    for i in range(1, MAX_OPTIONS + 1):
+        option = _text(record.get(f"선택지{i}"))
+        if option:
+            options.append(option)
+
+    return Question(
+        qid=_text(record.get("질문ID")) or f"질문_{index}",
+        text=_text(record.get("질문")) or f"질문_{index}",
+        qtype=_text(record.get("유형")).lower(),
+        options=tuple(options),
+        answer=_text(record.get("정답")),
+        active=_text(record.get("활성화")).lower() in ACTIVE_VALUES,
+        row=index + 2,
+    )
+
+
+# get_all_records() 결과 전체를 QuestionSet 으로 변환
+def parse_questions(records):
+    return QuestionSet(parse_question(record, i) for i, record in enumerate(records))
+
+
+# 현재 활성화된 질문 가져오기
+def get_active_question(questions):
+    return questions.active
@@ -0,0 +1,106 @@
+"""퀴즈 채점과 실시간 순위 (관리자 앱에서 사용)
+
+질문 시트의 정답 열이 채워진 질문을 퀴즈로 보고, 응답 시트의 새 행이 들어올 때마다
+해당 응답만 채점해 세션별 점수에 더합니다. 순위는 (점수 내림차순, 그 점수에 먼저
+도달한 순) 키의 정렬 목록으로 유지하므로, 새로고침 비용은 새 응답 수와 표시할
+순위 수에만 비례하고 지난 응답을 다시 채점하지 않습니다.
+
+- 정답이 여러 개면 "|" 로 구분 (예: "서울|Seoul")
+- 대소문자와 공백 차이는 무시
+- 같은 세션이 같은 질문에 여러 번 응답하면 첫 응답만 채점
+- 세션ID 가 없는 예전 행은 이름으로 참여자를 구분
+"""
+import bisect
+import threading
+
+ANSWER_SEPARATOR = "|"
+LEADERBOARD_SIZE = 10
+
+
+def normalize_answer(value):
+    return " ".join(str(value).split()).casefold()
+
+
+# 질문 목록 -> 질문ID -> 정답 집합 (정답이 없는 질문은 채점하지 않음)
+def answer_key(questions):
+    key = {}
+    for q in questions:
+        answers = {normalize_answer(a) for a in q.answer.split(ANSWER_SEPARATOR)} - {""}
+        if answers:
+            key[q.qid] = frozenset(answers)
+    return key
+
+
+class PlayerScore:
+    __slots__ = ("player", "nickname", "score", "answered", "reached_at")
+
+    def __init__(self, player, nickname):
+        self.player = player        # 세션ID (없으면 이름)
+        self.nickname = nickname    # 가장 최근 응답의 이름
+        self.score = 0              # 맞힌 문제 수
+        self.answered = 0           # 채점한 응답 수
+        self.reached_at = 0         # 지금 점수에 도달한 순서 (같은 점수면 먼저 도달한 쪽이 위)
+
+    def rank_key(self):
+        return (-self.score, self.reached_at, self.player)
+
+
+class ScoreBoard:
+    """응답 시트의 행을 순서대로 받아 세션별 점수와 순위를 갱신한다"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, epoch=None, key=None):
+        self.epoch = epoch
+        self.key = key or {}       # 질문ID -> 정답 집합
+        self.next_row = 2          # 다음에 읽을 시트 행 번호 (헤더가 1행)
+        self.refreshed_at = 0.0
+        self.players = {}          # 참여자 -> PlayerScore
+        self.ranking = []          # 정렬된 rank_key 목록
+        self.scored = set()        # 채점한 (참여자, 질문ID)
+
+    # rows 는 응답 시트 next_row 행부터의 이름~세션ID 열 (이름, 질문ID, 응답, 세션ID)
+    def add_rows(self, rows):
+        for row in rows:
+            sequence = self.next_row
+            self.next_row += 1
+            row = list(row) + [""] * (4 - len(row))
+            nickname, question_id = str(row[0]).strip(), str(row[1]).strip()
+            answers = self.key.get(question_id)
+            player = str(row[3]).strip() or nickname
+            if answers is None or not player or (player, question_id) in self.scored:
+                continue
+            self.scored.add((player, question_id))
+            self._add(player, nickname, normalize_answer(row[2]) in answers, sequence)
+
+    def _add(self, player, nickname, correct, sequence):
+        entry = self.players.get(player)
+        if entry is None:
+            entry = self.players[player] = PlayerScore(player, nickname)
+        else:
+            del self.ranking[bisect.bisect_left(self.ranking, entry.rank_key())]
+        if nickname:
+            entry.nickname = nickname
+        entry.answered += 1
+        if correct:
+            entry.score += 1
+            entry.reached_at = sequence
+        bisect.insort(self.ranking, entry.rank_key())
+
+    def top(self, n=LEADERBOARD_SIZE):
+        """상위 n 명 [(순위, 이름, 점수, 채점한 응답 수)] (같은 점수는 같은 순위)"""
+        with self.lock:
+            result = []
+            rank = 0
+            previous = None
+            for i, (score, _, player) in enumerate(self.ranking[:n]):
+                if score != previous:
+                    rank, previous = i + 1, score
+                entry = self.players[player]
+                result.append((rank, entry.nickname, entry.score, entry.answered))
+            return result
+
+    def __len__(self):
+        return len(self.players)
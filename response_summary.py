@@ -0,0 +1,183 @@
+"""응답 요약 (관리자 앱과 투표 앱이 함께 사용)
+
+"요약" 워크시트에 질문ID | 항목 | 개수 | 오차 형식으로 질문별 응답 수와 항목별 개수를
+유지합니다. 대시보드는 응답 행 전체 대신 지금 보여줄 질문의 작은 범위만 읽습니다.
+
+- 객관식: 항목 = 선택한 선택지
+- 단답형: 항목 = 응답에서 분리한 단어 (대시보드 단어 빈도 차트와 같은 규칙)
+- 질문마다 SUMMARY_BLOCK_ROWS 행짜리 고정 블록을 A:D 열에 둠
+  첫 행은 응답 수 (항목이 TOTAL_ITEM), 이어서 항목을 개수 순으로, 남는 행은 빈 칸
+- F 열에는 블록 순서대로 질문ID (처음 응답이 들어온 순서, 한 번 정한 블록 위치는 바뀌지 않음)
+- 항목은 질문마다 SUMMARY_ITEM_CAPACITY 개까지만 Space-Saving 으로 유지
+  (넘치면 개수는 추정값이고, 오차 열은 추정 개수가 실제보다 클 수 있는 최대값)
+"""
+from collections import Counter
+
+from text_analysis import SpaceSaving, extract_words
+
+SUMMARY_HEADERS = ["질문ID", "항목", "개수", "오차"]
+INDEX_HEADERS = ["질문 순서"]
+TOTAL_ITEM = "#응답수"
+SUMMARY_ITEM_CAPACITY = 100   # 질문마다 유지하는 항목 수 (대시보드는 상위 10개를 표시)
+SUMMARY_BLOCK_ROWS = SUMMARY_ITEM_CAPACITY + 1
+SUMMARY_WIDTH = len(SUMMARY_HEADERS)
+INDEX_COLUMN = "F"
+SHEET_HEADERS = SUMMARY_HEADERS + [""] + INDEX_HEADERS  # A1:F1
+
+
+class QuestionSummary:
+    __slots__ = ("total", "counts", "errors")
+
+    def __init__(self, total=0, counts=None, errors=None):
+        self.total = total                  # 응답 수
+        self.counts = counts or Counter()   # 항목 -> 개수 (넘친 경우 추정값)
+        self.errors = errors or {}          # 항목 -> 추정 개수의 최대 오차 (정확하면 없음)
+
+    @property
+    def error(self):
+        return max(self.errors.values(), default=0)
+
+    def __repr__(self):
+        return f"QuestionSummary(total={self.total}, items={len(self.counts)})"
+
+
+class SummarySheet:
+    """요약 시트에서 읽은 질문 순서(블록 위치)와 읽은 블록의 질문별 요약"""
+    __slots__ = ("order", "summaries")
+
+    def __init__(self, order=(), summaries=None):
+        self.order = tuple(order)            # 블록 순서대로 질문ID
+        self.summaries = summaries or {}     # 질문ID -> QuestionSummary (읽은 블록만)
+
+    def position(self, question_id):
+        try:
+            return self.order.index(question_id)
+        except ValueError:
+            return None
+
+    def get(self, question_id):
+        return self.summaries.get(question_id)
+
+
+def response_items(question_type, answer):
+    if question_type == "단답형":
+        return extract_words(answer)
+    return [str(answer)]
+
+
+# 응답 하나를 요약(질문ID -> QuestionSummary)에 더하기
+def add_response(summaries, question_id, question_type, answer):
+    summary = summaries.setdefault(str(question_id), QuestionSummary())
+    summary.total += 1
+    summary.counts.update(response_items(question_type, answer))
+
+
+# deltas 를 summaries 에 더하기
+# capacity 가 있으면 질문마다 항목을 그 수까지만 남김 (넘치면 Space-Saving 으로 이어서 셈)
+def merge_summaries(summaries, deltas, capacity=None):
+    for question_id, delta in deltas.items():
+        summary = summaries.setdefault(question_id, QuestionSummary())
+        summary.total += delta.total
+        if capacity is None or len(summary.counts.keys() | delta.counts.keys()) <= capacity:
+            summary.counts.update(delta.counts)
+            continue
+        sketch = SpaceSaving.restore(capacity, summary.counts, summary.errors)
+        for item, count in delta.counts.most_common():
+            sketch.add(item, count)
+        _keep(summary, sketch)
+
+
+# 질문마다 항목을 capacity 개까지만 남기기 (응답 전체로 요약을 새로 만든 뒤 사용)
+def cap_summaries(summaries, capacity=SUMMARY_ITEM_CAPACITY):
+    for summary in summaries.values():
+        if len(summary.counts) > capacity:
+            _keep(summary, SpaceSaving.restore(capacity, summary.counts, summary.errors))
+    return summaries
+
+
+def _keep(summary, sketch):
+    top = sketch.top(sketch.capacity)
+    summary.counts = Counter({item: count for item, count, _ in top})
+    summary.errors = {item: error for item, _, error in top if error}
+
+
+# 응답 시트 전체(get_all_records 결과)로 요약 만들기 (요약 시트를 새로 만들 때 사용)
+def build_summary(records, questions):
+    summaries = {}
+    for record in records:
+        question_id = str(record.get("질문ID", "")).strip()
+        if not question_id:
+            continue
+        question = questions.get(question_id)
+        add_response(summaries, question_id, question.qtype if question else "", record.get("응답", ""))
+    return cap_summaries(summaries)
+
+
+def _count(value):
+    try:
+        return int(float(str(value).strip()))
+    except (TypeError, ValueError):
+        return 0
+
+
+# 요약 블록의 A:D 값 -> 질문ID -> QuestionSummary
+def parse_summary(rows):
+    summaries = {}
+    for row in rows:
+        row = list(row) + [""] * (SUMMARY_WIDTH - len(row))
+        question_id, item, count = str(row[0]).strip(), str(row[1]), _count(row[2])
+        if not question_id:
+            continue
+        summary = summaries.setdefault(question_id, QuestionSummary())
+        if item == TOTAL_ITEM:
+            summary.total = count
+        elif count:
+            summary.counts[item] += count
+            if _count(row[3]):
+                summary.errors[item] = _count(row[3])
+    return summaries
+
+
+# F 열 값 -> 블록 순서대로 질문ID
+def parse_index(rows):
+    return tuple(str(row[0]).strip() for row in rows if row and str(row[0]).strip())
+
+
+def block_start(position):
+    return 2 + position * SUMMARY_BLOCK_ROWS
+
+
+# 블록 위치(0부터) -> A1 범위
+def block_range(position):
+    start = block_start(position)
+    return f"A{start}:D{start + SUMMARY_BLOCK_ROWS - 1}"
+
+
+# 질문 하나의 블록 (항상 SUMMARY_BLOCK_ROWS 행이므로 줄어든 항목은 빈 칸으로 덮어씀)
+def block_rows(question_id, summary):
+    rows = [[question_id, TOTAL_ITEM, summary.total, ""]]
+    rows.extend(
+        [question_id, item, count, summary.errors.get(item, "")]
+        for item, count in summary.counts.most_common(SUMMARY_ITEM_CAPACITY)
+    )
+    return rows + [[""] * SUMMARY_WIDTH] * (SUMMARY_BLOCK_ROWS - len(rows))
+
+
+# 이미 있는 질문 순서 뒤에 새 질문을 붙인 순서
+def extend_order(order, question_ids):
+    order = list(order)
+    order.extend(sorted(set(question_ids) - set(order)))
+    return tuple(order)
+
+
+# 요약 전체 -> (질문 순서, 시트 A1:F 값)
+# previous_count 는 이전에 있던 블록 수 (남는 블록과 순서 칸은 빈 칸으로 덮어씀)
+def sheet_rows(summaries, previous_count=0):
+    order = extend_order((), summaries)
+    rows = []
+    for question_id in order:
+        rows.extend(block_rows(question_id, summaries[question_id]))
+    rows += [[""] * SUMMARY_WIDTH] * (SUMMARY_BLOCK_ROWS * max(0, previous_count - len(order)))
+    index = list(order) + [""] * max(0, previous_count - len(order))
+    rows = [row + ["", index[i] if i < len(index) else ""] for i, row in enumerate(rows)]
+    return order, [SHEET_HEADERS] + rows
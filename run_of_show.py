@@ -0,0 +1,133 @@
+"""진행 순서 (관리자 앱과 투표 앱이 함께 사용)
+
+질문을 미리 정한 순서대로 진행하고, 질문마다 제한 시간을 둘 수 있습니다.
+"진행" 워크시트는 두 부분으로 나뉩니다.
+
+    A~C열: 순서 | 질문ID | 시간(초)     진행할 질문 목록 (시간이 0이면 관리자가 직접 넘김)
+    E~G열: 현재순서 | 시작시각 | 상태    2행 한 줄에 현재 진행 상태
+
+투표 기기는 질문 전체(QuestionSet)를 이미 캐시로 갖고 있으므로 다음 질문의 내용은
+미리 받아 둔 상태입니다. 다음 질문으로 넘어갈 때 바뀌는 것은 상태 세 칸뿐이고,
+제한 시간이 있는 질문은 시작시각만으로 각 기기가 넘어갈 시점을 직접 계산하므로
+시트 쓰기 없이 넘어갑니다.
+"""
+
+QUEUE_HEADERS = ["순서", "질문ID", "시간(초)"]
+STATE_HEADERS = ["현재순서", "시작시각", "상태"]
+
+STATUS_IDLE = "대기"
+STATUS_RUNNING = "진행"
+STATUS_DONE = "종료"
+
+
+class ShowItem:
+    __slots__ = ("qid", "seconds")
+
+    def __init__(self, qid, seconds=0):
+        self.qid = qid            # 질문ID
+        self.seconds = seconds    # 제한 시간 (초, 0이면 수동)
+
+    def __repr__(self):
+        return f"ShowItem({self.qid!r}, {self.seconds})"
+
+
+class RunOfShow:
+    __slots__ = ("items", "index", "started_at", "status")
+
+    def __init__(self, items=(), index=0, started_at=0.0, status=STATUS_IDLE):
+        self.items = tuple(items)
+        self.index = index            # 시트에 기록된 현재 순서 (0부터)
+        self.started_at = started_at  # 현재 순서가 시작된 시각 (time.time())
+        self.status = status
+
+    @property
+    def running(self):
+        return self.status == STATUS_RUNNING and bool(self.items)
+
+    def position(self, now):
+        """제한 시간이 지난 질문을 건너뛴 실제 (순서, 시작시각)을 돌려준다.
+
+        순서가 len(items) 이면 마지막 질문까지 끝난 상태다.
+        """
+        index, started_at = self.index, self.started_at
+        while index < len(self.items):
+            seconds = self.items[index].seconds
+            if seconds <= 0 or now < started_at + seconds:
+                break
+            started_at += seconds
+            index += 1
+        return index, started_at
+
+    def current(self, now):
+        if not self.running:
+            return None
+        index, _ = self.position(now)
+        return self.items[index] if index < len(self.items) else None
+
+    def current_qid(self, now):
+        item = self.current(now)
+        return item.qid if item else None
+
+    def upcoming(self, now):
+        if not self.running:
+            return None
+        index, _ = self.position(now)
+        return self.items[index + 1] if index + 1 < len(self.items) else None
+
+    def next_switch_at(self, now):
+        """제한 시간으로 다음 질문에 넘어가는 시각 (수동 진행이면 None)"""
+        if not self.running:
+            return None
+        index, started_at = self.position(now)
+        if index >= len(self.items) or self.items[index].seconds <= 0:
+            return None
+        return started_at + self.items[index].seconds
+
+
+def _number(value, cast, default):
+    try:
+        return cast(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+# "진행" 시트 A2:C 값 -> ShowItem 튜플 (순서 열 기준 정렬, 순서가 없으면 행 순서)
+def parse_queue(rows):
+    keyed = []
+    for i, row in enumerate(rows):
+        row = list(row) + [""] * (3 - len(row))
+        qid = str(row[1]).strip()
+        if not qid:
+            continue
+        order = _number(row[0], float, float(i + 1))
+        seconds = max(0, _number(row[2], int, 0))
+        keyed.append((order, i, ShowItem(qid, seconds)))
+    keyed.sort(key=lambda k: (k[0], k[1]))
+    return tuple(item for _, _, item in keyed)
+
+
+# "진행" 시트 E2:G2 값 -> (순서, 시작시각, 상태)
+def parse_state(rows):
+    row = list(rows[0]) if rows else []
+    row += [""] * (3 - len(row))
+    index = max(0, _number(row[0], int, 1) - 1)  # 시트에는 1부터 기록
+    started_at = _number(row[1], float, 0.0)
+    status = str(row[2]).strip() or STATUS_IDLE
+    return index, started_at, status
+
+
+def queue_rows(items):
+    return [[str(i), item.qid, str(item.seconds)] for i, item in enumerate(items, start=1)]
+
+
+def state_row(index, started_at, status):
+    return [str(index + 1), f"{started_at:.3f}", status]
+
+
+# 질문 목록과 진행 순서로 지금 보여줄 질문 결정
+# 진행 중이면 진행 순서가 우선하고, 아니면 질문 시트의 활성화 열을 따름
+def resolve_active_question(questions, show, now):
+    if show.running:
+        qid = show.current_qid(now)
+        return questions.get(qid) if qid else None
+    return questions.active
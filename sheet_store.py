@@ -0,0 +1,1102 @@
+"""구글 시트 입출력 (관리자 앱과 투표 앱이 함께 사용)
+
+하나의 배포가 여러 방(교실)을 동시에 서비스할 수 있도록, 방은 URL 쿼리
+파라미터 `?room=` 으로 고르고 방마다 다른 구글 시트를 사용합니다.
+
+- 인증된 gspread 클라이언트는 프로세스 전체에서 하나만 만들어 모든 방이 공유
+- 스프레드시트/워크시트 핸들과 캐시는 방(시트 ID)별로 분리
+- 캐시는 데이터 종류(질문/응답/진행 순서/진행 상태)별로 무효화하고,
+  쓰기 직후에는 이미 알고 있는 최신 값을 캐시에 바로 넣어 다시 읽지 않음
+
+시크릿 예시:
+    [general]
+    sheet_id = "기본 방 시트 ID"
+    http_pool_size = 32   # 선택: 시트 API 동시 연결 수
+    journal_path = "data/submissions.journal"   # 선택: 응답 제출 저널 위치
+    snapshot_dir = "data/snapshots"   # 선택: 재시작용 스냅숏 위치 ("" 이면 사용 안 함)
+    perf_key = "임의의 문자열"   # 선택: 투표 앱에서 ?perf=<이 값> 으로 성능 패널(읽기 전용) 보기
+
+    [rooms]
+    class1 = "1반 시트 ID"
+    class2 = "2반 시트 ID"
+"""
+import datetime
+import os
+import threading
+import time
+
+import streamlit as st
+import gspread
+from gspread.utils import numericise_all
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+from perf_metrics import cache_counted, timed, timer
+from arrival_rate import ArrivalTracker
+from latency_trace import (
+    STAGE_QUEUE, STAGE_SUBMIT, STAGE_WRITE, TRACE_HEADERS, SubmissionTracer, record_stage, trace_columns,
+)
+from quiz_scoring import ScoreBoard, answer_key
+from question_model import QUESTION_HEADERS, parse_questions
+from response_summary import (
+    INDEX_COLUMN, SHEET_HEADERS, SUMMARY_BLOCK_ROWS, SUMMARY_ITEM_CAPACITY, SummarySheet,
+    add_response, block_range, block_rows, build_summary, extend_order, merge_summaries, parse_index,
+    parse_summary, sheet_rows,
+)
+from submission_journal import JournalEntry, JournalReplayer, SubmissionJournal
+from warm_start import WarmStart
+from run_of_show import (
+    QUEUE_HEADERS, STATE_HEADERS, STATUS_IDLE,
+    RunOfShow, parse_queue, parse_state, queue_rows, state_row,
+)
+
+DEFAULT_SHEET_ID = "1DeLOnDJ4KdtZfKwEMAnYWqINTKx7vv22c3SQCu6lxQY"
+DEFAULT_HTTP_POOL_SIZE = 32
+TOKEN_REFRESH_MARGIN = 300  # 만료 5분 전에 갱신
+TOKEN_RETRY_SECONDS = 30
+SHEETS_API_ROOT = "https://sheets.googleapis.com/"
+WORKSHEET_RELIST_SECONDS = 30  # 없는 워크시트를 다시 찾아보는 최소 간격
+
+QUESTION_SHEET = "질문"
+RESPONSE_SHEET = "응답"
+SHOW_SHEET = "진행"
+SHOW_QUEUE_RANGE = "A2:C"
+SHOW_STATE_RANGE = "E2:G2"
+SHOW_STATE_TTL = 1  # 진행 상태는 세 칸만 읽으므로 짧은 주기로 새로고침
+SUMMARY_SHEET = "요약"
+SUMMARY_INDEX_RANGE = f"{INDEX_COLUMN}2:{INDEX_COLUMN}"  # 블록 순서대로 질문ID
+SUMMARY_FLUSH_SECONDS = 2  # 저장한 응답을 요약 시트에 모아서 반영하는 간격
+ARRIVAL_REFRESH_SECONDS = 2  # 응답 도착 추이용으로 새 행을 확인하는 간격
+RESPONSE_HEADERS = ["시간", "학번", "이름", "질문ID", "응답", "세션ID", "제출ID"] + TRACE_HEADERS
+SUBMISSION_ID_RANGE = "G2:G"
+ARRIVAL_COLUMNS = ("A", "J")  # 시간 ~ 전송시각 (도착 추이와 제출 지연 추적에 함께 사용)
+TRACE_COLUMN = RESPONSE_HEADERS.index(TRACE_HEADERS[0])  # 행에서 요청시각의 위치 (H 열)
+LEADERBOARD_REFRESH_SECONDS = 2  # 퀴즈 순위용으로 새 행을 확인하는 간격
+LEADERBOARD_COLUMNS = ("C", "F")  # 이름 ~ 세션ID
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "submissions.journal")
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots")
+
+
+# 방 이름 -> 시트 ID 목록 (시크릿의 [rooms] 항목)
+def get_rooms():
+    return dict(st.secrets.get("rooms", {}))
+
+
+def get_default_sheet_id():
+    return st.secrets.get("general", {}).get("sheet_id", DEFAULT_SHEET_ID)
+
+
+# 현재 요청의 방 이름과 시트 ID 결정
+# 방 파라미터가 없으면 기본 방, 등록되지 않은 방이면 시트 ID 는 None
+def resolve_room():
+    room = st.query_params.get("room", "")
+    return room, sheet_id_for_room(room)
+
+
+def sheet_id_for_room(room):
+    if not room:
+        return get_default_sheet_id()
+    return get_rooms().get(room)
+
+
+# 인증 토큰 백그라운드 갱신
+# 토큰 만료 TOKEN_REFRESH_MARGIN 초 전에 미리 갱신하므로 사용자 요청이 갱신을 기다리지 않음
+class TokenRefresher(threading.Thread):
+    def __init__(self, credentials, auth_request, margin=TOKEN_REFRESH_MARGIN):
+        super().__init__(name="gsheet-token-refresher", daemon=True)
+        self.credentials = credentials
+        self.auth_request = auth_request
+        self.margin = margin
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            self.credentials.refresh(self.auth_request)
+
+    def seconds_until_refresh(self):
+        if not self.credentials.expiry:
+            return 0
+        remaining = (self.credentials.expiry - datetime.datetime.utcnow()).total_seconds()
+        return max(0, remaining - self.margin)
+
+    def run(self):
+        while True:
+            time.sleep(max(1, self.seconds_until_refresh()))
+            try:
+                self.refresh()
+            except Exception:
+                # 갱신 실패 시 잠시 후 재시도 (그 사이 요청은 AuthorizedSession 이 직접 갱신)
+                time.sleep(TOKEN_RETRY_SECONDS)
+
+
+# 연결 풀 크기: 동시에 시트 API 를 호출할 수 있는 세션 수에 맞춤
+def get_http_pool_size():
+    return int(st.secrets.get("general", {}).get("http_pool_size", DEFAULT_HTTP_POOL_SIZE))
+
+
+# keep-alive 연결 풀을 쓰는 gspread 클라이언트 생성
+def create_gsheet_client(service_account_info):
+    scope = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ]
+    credentials = Credentials.from_service_account_info(service_account_info, scopes=scope)
+    pool_size = get_http_pool_size()
+
+    # 토큰 발급용 세션 (oauth2.googleapis.com 연결 재사용)
+    token_session = requests.Session()
+    token_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    auth_request = Request(token_session)
+
+    # 시트 API 호출용 세션 (sheets.googleapis.com 연결 재사용)
+    session = AuthorizedSession(credentials, auth_request=auth_request)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+
+    # 첫 토큰은 바로 발급하고, 이후 갱신은 백그라운드에서 처리
+    # (실패해도 백그라운드 스레드가 다시 시도하고, 그 전 요청은 AuthorizedSession 이 직접 갱신)
+    refresher = TokenRefresher(credentials, auth_request)
+    try:
+        refresher.refresh()
+    except Exception:
+        pass
+    refresher.start()
+
+    # 첫 사용자 요청이 TCP/TLS 연결 수립 비용을 내지 않도록 미리 연결
+    def warm_up():
+        try:
+            session.head(SHEETS_API_ROOT, timeout=10)
+        except Exception:
+            pass
+    threading.Thread(target=warm_up, name="gsheet-warm-up", daemon=True).start()
+
+    return gspread.Client(auth=credentials, session=session)
+
+
+# 구글 시트 연결 설정 (모든 방이 공유)
+@cache_counted("get_gsheet_connection")
+@st.cache_resource
+@timed("get_gsheet_connection")
+def get_gsheet_connection():
+    try:
+        return create_gsheet_client(dict(st.secrets["gcp_service_account"]))
+    except Exception as e:
+        st.error(f"인증 오류: {str(e)}")
+        return None
+
+
+# 방마다 따로 캐시하고 무효화하는 데이터 종류
+QUESTIONS = "questions"
+RESPONSES = "responses"
+SHOW_QUEUE = "show_queue"
+SHOW_STATE = "show_state"
+SUMMARY = "summary"
+CACHE_DATASETS = (QUESTIONS, RESPONSES, SHOW_QUEUE, SHOW_STATE, SUMMARY)
+
+# 데이터 종류별 캐시 유지 시간 (초)
+CACHE_TTLS = {
+    QUESTIONS: 5,
+    RESPONSES: 3,
+    SHOW_QUEUE: 5,       # 질문과 같은 주기
+    SHOW_STATE: SHOW_STATE_TTL,
+    SUMMARY: 3,          # 응답과 같은 주기
+}
+
+
+# 방 하나의 스프레드시트/워크시트 핸들과 데이터 종류별 캐시 세대 번호
+# 캐시 세대 번호는 쓰기 직후 값을 넣을 때(prime)도 올라가므로, 데이터가 처음부터 바뀌었는지는
+# 무효화(invalidate)와 초기화 쓰기에서만 올라가는 초기화 번호로 판단
+class RoomHandles:
+    def __init__(self, sheet_id):
+        self.sheet_id = sheet_id
+        self.lock = threading.Lock()
+        self.spreadsheet = None
+        self.worksheets = {}
+        self.listed_at = 0.0
+        self.cache_epochs = dict.fromkeys(CACHE_DATASETS, 0)
+        self.reset_epochs = dict.fromkeys(CACHE_DATASETS, 0)
+        self.primed = {}  # 데이터 종류 -> (세대 번호, 쓰기 직후의 최신 값)
+        self.loaded_at = dict.fromkeys(CACHE_DATASETS, 0.0)  # 캐시에 마지막으로 값을 넣은 시각
+        self.summary_order = ()    # 마지막으로 읽은 요약 시트의 질문 순서 (블록 위치 짐작용)
+        self.summary_focus = None  # 대시보드가 마지막으로 요약을 읽은 질문
+
+
+@st.cache_resource(show_spinner=False)
+def get_room_handles(sheet_id):
+    return RoomHandles(sheet_id)
+
+
+# 방의 워크시트 핸들 가져오기 (없으면 한 번만 열어서 보관, 찾지 못하면 None)
+# 없는 워크시트(예: 진행 순서를 쓰지 않는 방의 "진행")는 WORKSHEET_RELIST_SECONDS 마다만 다시 확인
+def _open_worksheet(room, get_client, title):
+    with room.lock:
+        worksheet = room.worksheets.get(title)
+        if worksheet is not None:
+            return worksheet
+        if room.worksheets and time.monotonic() - room.listed_at < WORKSHEET_RELIST_SECONDS:
+            return None
+
+        client = get_client()
+        if not client:
+            return None
+        if room.spreadsheet is None:
+            room.spreadsheet = client.open_by_key(room.sheet_id)
+        room.worksheets = {ws.title: ws for ws in room.spreadsheet.worksheets()}
+        room.listed_at = time.monotonic()
+        return room.worksheets.get(title)
+
+
+# 보관한 핸들에 없으면 목록을 다시 받아 확인 (다른 곳에서 방금 추가했을 수 있음)
+def _find_worksheet(room, get_client, title):
+    worksheet = _open_worksheet(room, get_client, title)
+    if not worksheet:
+        with room.lock:
+            room.worksheets = {}
+        worksheet = _open_worksheet(room, get_client, title)
+    return worksheet
+
+
+# 워크시트가 없으면 추가
+def _get_or_add_worksheet(room, get_client, title, rows, cols):
+    worksheet = _find_worksheet(room, get_client, title)
+    if not worksheet:
+        worksheet = room.spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+        with room.lock:
+            room.worksheets = {}
+    return worksheet
+
+
+def get_worksheet(sheet_id, title):
+    return _open_worksheet(get_room_handles(sheet_id), get_gsheet_connection, title)
+
+
+# 워크시트가 추가/삭제된 경우 보관한 핸들 버리기
+def forget_worksheets(sheet_id):
+    room = get_room_handles(sheet_id)
+    with room.lock:
+        room.worksheets = {}
+
+
+def get_cache_epoch(sheet_id, dataset):
+    return get_room_handles(sheet_id).cache_epochs[dataset]
+
+
+# 프로세스가 시작된 뒤 데이터가 무효화되거나 초기화된 횟수
+# (새 행만 이어서 읽는 도착 추이와 퀴즈 순위는 이 번호가 바뀔 때만 처음부터 다시 읽음)
+def get_reset_epoch(sheet_id, dataset):
+    return get_room_handles(sheet_id).reset_epochs[dataset]
+
+
+# 한 방의 특정 데이터만 무효화 (같은 방의 다른 데이터와 다른 방의 캐시는 유지)
+def invalidate(sheet_id, *datasets):
+    room = get_room_handles(sheet_id)
+    with room.lock:
+        for dataset in datasets:
+            room.cache_epochs[dataset] += 1
+            room.reset_epochs[dataset] += 1
+            room.primed.pop(dataset, None)
+            room.loaded_at[dataset] = 0.0
+
+
+# 방 하나의 캐시 전체 무효화 ("데이터 새로고침" 버튼)
+def invalidate_room(sheet_id):
+    invalidate(sheet_id, *CACHE_DATASETS)
+
+
+# 쓰기 직후 이미 알고 있는 최신 값을 캐시에 넣기
+# 세대 번호를 올려 이전 값을 버리고, 다음 읽기는 시트를 다시 읽는 대신 이 값을 사용
+# (이 프로세스에만 적용되며, 다른 배포는 TTL 이 지나면 새로 읽음)
+# 시트를 비운 쓰기(초기화)라면 reset=True 로 초기화 번호도 올림
+def prime(sheet_id, dataset, value, reset=False):
+    room = get_room_handles(sheet_id)
+    with room.lock:
+        room.cache_epochs[dataset] += 1
+        if reset:
+            room.reset_epochs[dataset] += 1
+        room.primed[dataset] = (room.cache_epochs[dataset], value)
+        room.loaded_at[dataset] = time.monotonic()
+
+
+# 캐시 함수가 새 값을 넣을 때 호출 (넣어 둔 값이 있으면 꺼내서 반환)
+def _take_primed(sheet_id, dataset, cache_epoch):
+    room = get_room_handles(sheet_id)
+    with room.lock:
+        room.loaded_at[dataset] = time.monotonic()
+        entry = room.primed.get(dataset)
+        if entry is None or entry[0] != cache_epoch:
+            return None
+        del room.primed[dataset]
+        return entry[1]
+
+
+def _read_records(sheet_id, title):
+    worksheet = get_worksheet(sheet_id, title)
+    if not worksheet:
+        return []
+    return worksheet.get_all_records()
+
+
+# 재시작용 스냅숏 (방마다 프로세스에서 한 번만 파일을 읽음)
+# 저장된 질문이 있으면 바로 캐시에 넣어, 재시작 직후 첫 화면은 시트를 읽지 않고 그림 (질문 캐시 주기 동안)
+@st.cache_resource(show_spinner=False)
+def get_warm_start(sheet_id):
+    directory = st.secrets.get("general", {}).get("snapshot_dir", DEFAULT_SNAPSHOT_DIR)
+    warm = WarmStart(directory, sheet_id)
+    if warm.questions is not None:
+        prime(sheet_id, QUESTIONS, parse_questions(warm.questions))
+    return warm
+
+
+def _trim_row(row):
+    row = [str(value) for value in row]
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+# 스냅숏의 응답 행 (시트 2행부터, 시간 ~ 전송시각)
+# 프로세스가 시작된 뒤 응답이 한 번도 무효화되거나 초기화되지 않았을 때만 사용
+# 처음 사용할 때 스냅숏의 마지막 행을 시트에서 한 번 읽어 비교하고, 다르면 버림 (시트 초기화 등)
+# (시작한 지 오래되어 메모리에서 비운 뒤에는 빈 목록, 시트에서 처음부터 읽음)
+def _warm_rows(sheet_id):
+    if get_reset_epoch(sheet_id, RESPONSES):
+        return []
+    warm = get_warm_start(sheet_id)
+    with warm.lock:
+        warm.expire_rows()
+        if warm.rows and not warm.verified:
+            last_row = len(warm.rows) + 1
+            try:
+                worksheet = get_worksheet(sheet_id, RESPONSE_SHEET)
+                current = worksheet.get(f"A{last_row}:{ARRIVAL_COLUMNS[1]}{last_row}") if worksheet else []
+            except Exception:
+                current = []
+            if not current or _trim_row(current[0]) != _trim_row(warm.rows[-1]):
+                warm.discard_rows()
+            warm.verified = True
+        return list(warm.rows)
+
+
+def _has_warm_rows(sheet_id):
+    return not get_reset_epoch(sheet_id, RESPONSES) and bool(get_warm_start(sheet_id).rows)
+
+
+@timed("load_questions")
+def _fetch_questions(sheet_id):
+    try:
+        records = _read_records(sheet_id, QUESTION_SHEET)
+        get_warm_start(sheet_id).update_questions(records)
+        return parse_questions(records)
+    except Exception as e:
+        st.error(f"질문 데이터 로드 오류: {str(e)}")
+        return parse_questions([])
+
+
+# 재시작 뒤 처음 읽을 때는 스냅숏의 행에 그 뒤에 추가된 행만 읽어 붙임
+@timed("load_responses")
+def _fetch_responses(sheet_id):
+    try:
+        warm = get_warm_start(sheet_id)
+        rows = [] if warm.responses_loaded else _warm_rows(sheet_id)
+        warm.responses_loaded = True
+        if rows:
+            start_row = len(rows) + 2
+            new_rows = _fetch_response_rows(sheet_id, start_row, ARRIVAL_COLUMNS)
+            warm.record_rows(start_row, new_rows)
+            return _to_records([RESPONSE_HEADERS] + rows + new_rows)
+        return _read_records(sheet_id, RESPONSE_SHEET)
+    except Exception as e:
+        st.error(f"응답 데이터 로드 오류: {str(e)}")
+        return []
+
+
+@timed("load_show_queue")
+def _fetch_show_queue(sheet_id):
+    try:
+        worksheet = get_worksheet(sheet_id, SHOW_SHEET)
+        if not worksheet:
+            return ()
+        return parse_queue(worksheet.get(SHOW_QUEUE_RANGE))
+    except Exception as e:
+        st.error(f"진행 순서 로드 오류: {str(e)}")
+        return ()
+
+
+@timed("load_show_state")
+def _fetch_show_state(sheet_id):
+    try:
+        worksheet = get_worksheet(sheet_id, SHOW_SHEET)
+        if not worksheet:
+            return parse_state([])
+        return parse_state(worksheet.get(SHOW_STATE_RANGE))
+    except Exception as e:
+        st.error(f"진행 상태 로드 오류: {str(e)}")
+        return parse_state([])
+
+
+# 요약 시트에서 질문 순서와 question_ids 의 블록만 읽어 SummarySheet 로 반환
+# 지난번 순서(order_hint)로 블록 위치를 짐작해 순서와 함께 한 번에 읽고, 짐작이 틀린 블록만 다시 읽음
+def _read_summary_blocks(worksheet, question_ids, order_hint=()):
+    hint = SummarySheet(order_hint)
+    guessed = {q: hint.position(q) for q in question_ids if hint.position(q) is not None}
+    values = worksheet.batch_get([SUMMARY_INDEX_RANGE] + [block_range(p) for p in guessed.values()])
+    sheet = SummarySheet(parse_index(values[0]))
+
+    def add_block(question_id, rows):
+        summary = parse_summary(rows).get(question_id)
+        if summary is not None:
+            sheet.summaries[question_id] = summary
+
+    for (question_id, position), rows in zip(guessed.items(), values[1:]):
+        if sheet.position(question_id) == position:
+            add_block(question_id, rows)
+    missing = [q for q in question_ids if q not in sheet.summaries and sheet.position(q) is not None]
+    if missing:
+        for question_id, rows in zip(missing, worksheet.batch_get([block_range(sheet.position(q)) for q in missing])):
+            add_block(question_id, rows)
+    return sheet
+
+
+# 요약 시트가 없으면 None (응답 전체에서 계산해야 함)
+# 질문 순서와 question_id 의 블록만 읽으므로 질문과 응답 수에 상관없이 읽는 범위가 일정
+@timed("load_summary")
+def _fetch_summary(sheet_id, question_id):
+    try:
+        worksheet = get_worksheet(sheet_id, SUMMARY_SHEET)
+        if not worksheet:
+            return None
+        question_ids = [question_id] if question_id else []
+        return _read_summary_blocks(worksheet, question_ids, get_room_handles(sheet_id).summary_order)
+    except Exception as e:
+        st.error(f"요약 데이터 로드 오류: {str(e)}")
+        return None
+
+
+# 구글 시트에서 질문 데이터 가져오기
+# 가져온 버전마다 한 번만 QuestionSet 으로 파싱하고, 모든 세션이 같은 객체를 공유
+# 캐시 함수들은 쓰기 직후 넣어 둔 값(prime)이 있으면 시트를 읽지 않고 그 값을 사용
+@cache_counted("load_questions")
+@st.cache_resource(ttl=CACHE_TTLS[QUESTIONS], show_spinner=False)
+def _load_questions(sheet_id, cache_epoch):
+    primed = _take_primed(sheet_id, QUESTIONS, cache_epoch)
+    return primed if primed is not None else _fetch_questions(sheet_id)
+
+
+# 구글 시트에서 응답 데이터 가져오기
+@cache_counted("load_responses")
+@st.cache_data(ttl=CACHE_TTLS[RESPONSES])
+def _load_responses(sheet_id, cache_epoch):
+    primed = _take_primed(sheet_id, RESPONSES, cache_epoch)
+    return primed if primed is not None else _fetch_responses(sheet_id)
+
+
+# 진행 순서(질문 목록) 가져오기 - 질문과 같은 주기로 새로고침
+@cache_counted("load_show_queue")
+@st.cache_resource(ttl=CACHE_TTLS[SHOW_QUEUE], show_spinner=False)
+def _load_show_queue(sheet_id, cache_epoch):
+    primed = _take_primed(sheet_id, SHOW_QUEUE, cache_epoch)
+    return primed if primed is not None else _fetch_show_queue(sheet_id)
+
+
+# 진행 상태 가져오기
+# 방마다 프로세스 전체에서 SHOW_STATE_TTL 초에 한 번만 읽으므로 참여자 수와 무관하게 호출 수가 일정
+@cache_counted("load_show_state")
+@st.cache_resource(ttl=CACHE_TTLS[SHOW_STATE], show_spinner=False)
+def _load_show_state(sheet_id, cache_epoch):
+    primed = _take_primed(sheet_id, SHOW_STATE, cache_epoch)
+    return primed if primed is not None else _fetch_show_state(sheet_id)
+
+
+# 응답 요약 가져오기 (질문 순서와 question_id 의 요약, 응답 수와 무관하게 작은 범위만 읽음)
+# 넣어 둔 값에 question_id 의 블록이 없으면 시트에서 읽음
+@cache_counted("load_summary")
+@st.cache_resource(ttl=CACHE_TTLS[SUMMARY], show_spinner=False)
+def _load_summary(sheet_id, question_id, cache_epoch):
+    sheet = _take_primed(sheet_id, SUMMARY, cache_epoch)
+    if sheet is None or (question_id and sheet.get(question_id) is None and sheet.position(question_id) is not None):
+        sheet = _fetch_summary(sheet_id, question_id)
+    if sheet is not None:
+        get_room_handles(sheet_id).summary_order = sheet.order
+    return sheet
+
+
+# 시트의 값 범위(헤더 포함) -> get_all_records 와 같은 형식의 레코드 목록
+def _to_records(values):
+    if not values:
+        return []
+    headers = values[0]
+    return [
+        dict(zip(headers, numericise_all(list(row) + [""] * (len(headers) - len(row)))))
+        for row in values[1:]
+    ]
+
+
+SUMMARY_FOCUS = "summary_focus"  # prefetch 에서 함께 읽는 요약 블록 (데이터 종류가 아닌 범위 이름)
+
+
+# 캐시가 만료되었을 데이터를 한 번의 values_batch_get 으로 읽어 캐시에 넣기
+# 각 load_* 가 따로 시트를 읽으면 왕복 시간이 더해지므로, 새로고침 첫머리에 호출해 왕복 한 번으로 줄임
+# 만료된 데이터가 하나뿐이면 해당 load_* 가 평소처럼 읽도록 둠
+@timed("prefetch")
+def prefetch(sheet_id, *datasets):
+    room = get_room_handles(sheet_id)
+    now = time.monotonic()
+    with room.lock:
+        due = [d for d in datasets if now - room.loaded_at[d] >= CACHE_TTLS[d]]
+    if len(due) < 2:
+        return
+    try:
+        get_client = get_gsheet_connection
+        ranges = {}
+        if QUESTIONS in due and _open_worksheet(room, get_client, QUESTION_SHEET):
+            ranges[QUESTIONS] = f"'{QUESTION_SHEET}'"
+        if RESPONSES in due and _open_worksheet(room, get_client, RESPONSE_SHEET):
+            ranges[RESPONSES] = f"'{RESPONSE_SHEET}'"
+        if _open_worksheet(room, get_client, SHOW_SHEET):
+            if SHOW_QUEUE in due:
+                ranges[SHOW_QUEUE] = f"'{SHOW_SHEET}'!{SHOW_QUEUE_RANGE}"
+            if SHOW_STATE in due:
+                ranges[SHOW_STATE] = f"'{SHOW_SHEET}'!{SHOW_STATE_RANGE}"
+        focus = room.summary_focus
+        focus_position = SummarySheet(room.summary_order).position(focus)
+        if SUMMARY in due and _open_worksheet(room, get_client, SUMMARY_SHEET):
+            ranges[SUMMARY] = f"'{SUMMARY_SHEET}'!{SUMMARY_INDEX_RANGE}"
+            if focus_position is not None:
+                # 대시보드가 보고 있던 질문의 블록도 함께 (위치가 바뀌었으면 load_summary 가 다시 읽음)
+                ranges[SUMMARY_FOCUS] = f"'{SUMMARY_SHEET}'!{block_range(focus_position)}"
+        if len(ranges.keys() - {SUMMARY_FOCUS}) < 2:
+            return
+
+        result = room.spreadsheet.values_batch_get(list(ranges.values()))
+        values = dict(zip(ranges, (r.get("values", []) for r in result.get("valueRanges", []))))
+    except Exception:
+        return  # 각 load_* 가 따로 읽으면서 오류를 표시
+
+    def parse_question_values(values):
+        records = _to_records(values)
+        get_warm_start(sheet_id).update_questions(records)
+        return parse_questions(records)
+
+    focus_rows = values.pop(SUMMARY_FOCUS, None)
+
+    def parse_summary_values(values):
+        sheet = SummarySheet(parse_index(values))
+        summary = parse_summary(focus_rows or []).get(focus)
+        if summary is not None and sheet.position(focus) == focus_position:
+            sheet.summaries[focus] = summary
+        return sheet
+
+    parsers = {
+        QUESTIONS: parse_question_values,
+        RESPONSES: _to_records,
+        SHOW_QUEUE: parse_queue,
+        SHOW_STATE: parse_state,
+        SUMMARY: parse_summary_values,
+    }
+    for dataset, value in values.items():
+        prime(sheet_id, dataset, parsers[dataset](value))
+
+
+# 관리자 대시보드 새로고침에 필요한 데이터 미리 읽기
+# (요약 시트가 없으면 응답 시트 전체에서 계산하므로 응답도 함께 읽음)
+# (재시작 직후 스냅숏의 응답 행이 있으면 응답은 load_responses 가 새 행만 읽도록 둠)
+def prefetch_dashboard(sheet_id):
+    get_warm_start(sheet_id)
+    datasets = [QUESTIONS, SHOW_QUEUE, SHOW_STATE, SUMMARY]
+    if not get_worksheet(sheet_id, SUMMARY_SHEET) and not _has_warm_rows(sheet_id):
+        datasets.append(RESPONSES)
+    prefetch(sheet_id, *datasets)
+
+
+def load_questions(sheet_id):
+    get_warm_start(sheet_id)
+    return _load_questions(sheet_id, get_cache_epoch(sheet_id, QUESTIONS))
+
+
+def load_responses(sheet_id):
+    return _load_responses(sheet_id, get_cache_epoch(sheet_id, RESPONSES))
+
+
+# 요약 시트의 질문 순서와 question_id 의 요약 (SummarySheet, 요약 시트가 없으면 None)
+def load_summary(sheet_id, question_id=None):
+    if question_id:
+        get_room_handles(sheet_id).summary_focus = question_id
+    return _load_summary(sheet_id, question_id, get_cache_epoch(sheet_id, SUMMARY))
+
+
+# Streamlit 밖(참여 서버)에서 방 핸들로 직접 읽기 (캐시 없음, 오류는 호출한 쪽에서 처리)
+def read_questions(room, get_client):
+    worksheet = _open_worksheet(room, get_client, QUESTION_SHEET)
+    return parse_questions(worksheet.get_all_records() if worksheet else [])
+
+
+# 진행 순서와 진행 상태를 한 번의 호출로 읽기
+def read_run_of_show(room, get_client):
+    worksheet = _open_worksheet(room, get_client, SHOW_SHEET)
+    if not worksheet:
+        return RunOfShow()
+    queue, state = worksheet.batch_get([SHOW_QUEUE_RANGE, SHOW_STATE_RANGE])
+    return RunOfShow(parse_queue(queue), *parse_state(state))
+
+
+# 응답 시트의 start_row 행부터 columns 열만 읽기 (기본은 시간~질문ID)
+@timed("load_response_rows")
+def _fetch_response_rows(sheet_id, start_row, columns=("A", "D")):
+    worksheet = get_worksheet(sheet_id, RESPONSE_SHEET)
+    if not worksheet:
+        return []
+    try:
+        return worksheet.get(f"{columns[0]}{start_row}:{columns[1]}")
+    except gspread.exceptions.APIError as e:
+        if "exceeds grid limits" in str(e):
+            return []  # 아직 새 행이 없음
+        raise
+
+
+@st.cache_resource(show_spinner=False)
+def get_arrival_tracker(sheet_id):
+    return ArrivalTracker()
+
+
+@st.cache_resource(show_spinner=False)
+def get_submission_tracer(sheet_id):
+    return SubmissionTracer()
+
+
+# 질문별 응답 도착 추이 (방마다 ARRIVAL_REFRESH_SECONDS 에 한 번, 새로 추가된 행만 읽음)
+# 응답이 무효화되거나(데이터 새로고침) 초기화되면(시트 초기화) 처음부터 다시 읽음
+# (캐시에 값을 넣는 것만으로는 다시 읽지 않음)
+# 새로 읽은 행은 제출 지연 추적에도 넘김 (처음부터 다시 읽을 때의 예전 행은 제외)
+# 재시작 직후에는 스냅숏의 행으로 채우고 그 뒤의 행만 읽으며, 읽은 행은 스냅숏에 덧붙임
+# (파일 쓰기는 스냅숏의 백그라운드 스레드가 하므로 이 잠금을 잡고 기다리지 않음)
+def load_arrivals(sheet_id):
+    tracker = get_arrival_tracker(sheet_id)
+    epoch = get_reset_epoch(sheet_id, RESPONSES)
+    with tracker.lock:
+        if tracker.epoch != epoch:
+            tracker.reset(epoch)
+            tracker.add_rows(_warm_rows(sheet_id))
+        if time.monotonic() - tracker.refreshed_at >= ARRIVAL_REFRESH_SECONDS:
+            try:
+                live = tracker.refreshed_at > 0 and tracker.next_row > 2
+                start_row = tracker.next_row
+                rows = _fetch_response_rows(sheet_id, start_row, ARRIVAL_COLUMNS)
+                tracker.add_rows(rows)
+                get_warm_start(sheet_id).record_rows(start_row, rows)
+                if live:
+                    get_submission_tracer(sheet_id).seen(rows, time.time(), TRACE_COLUMN)
+            except Exception as e:
+                st.error(f"응답 추이 로드 오류: {str(e)}")
+            tracker.refreshed_at = time.monotonic()
+    return tracker
+
+
+@st.cache_resource(show_spinner=False)
+def get_score_board(sheet_id):
+    return ScoreBoard()
+
+
+# 퀴즈 순위 (방마다 LEADERBOARD_REFRESH_SECONDS 에 한 번, 새로 추가된 행만 읽어 채점)
+# 응답이 무효화되거나 초기화되거나 정답이 바뀌면 처음부터 다시 채점
+def load_leaderboard(sheet_id, questions):
+    board = get_score_board(sheet_id)
+    epoch = get_reset_epoch(sheet_id, RESPONSES)
+    key = answer_key(questions)
+    with board.lock:
+        if board.epoch != epoch or board.key != key:
+            board.reset(epoch, key)
+            board.add_rows([row[2:6] for row in _warm_rows(sheet_id)])  # 재시작 직후에는 스냅숏의 행부터 채점
+        if key and time.monotonic() - board.refreshed_at >= LEADERBOARD_REFRESH_SECONDS:
+            try:
+                with timer("score_responses"):
+                    board.add_rows(_fetch_response_rows(sheet_id, board.next_row, LEADERBOARD_COLUMNS))
+            except Exception as e:
+                st.error(f"퀴즈 순위 로드 오류: {str(e)}")
+            board.refreshed_at = time.monotonic()
+    return board
+
+
+def load_run_of_show(sheet_id):
+    index, started_at, status = _load_show_state(sheet_id, get_cache_epoch(sheet_id, SHOW_STATE))
+    return RunOfShow(_load_show_queue(sheet_id, get_cache_epoch(sheet_id, SHOW_QUEUE)), index, started_at, status)
+
+
+# 응답 저장 함수
+@timed("save_response")
+def save_response(sheet_id, response_data):
+    try:
+        worksheet = get_worksheet(sheet_id, RESPONSE_SHEET)
+        if not worksheet:
+            st.error("응답 워크시트를 찾을 수 없습니다.")
+            return False
+
+        worksheet.append_row(response_data)
+        return True
+    except Exception as e:
+        st.error(f"응답 저장 오류: {str(e)}")
+        return False
+
+
+# 응답 제출 저널을 응답 시트와 요약에 연결 (투표 앱과 참여 서버가 함께 사용)
+# 재전송 스레드는 스크립트 밖에서 실행되므로 방 핸들과 요약 기록기는 제출을 받을 때 미리 등록해 둠
+class ResponseJournal:
+    def __init__(self, path, client, get_room, get_writer):
+        self.client = client
+        self.get_room = get_room        # 시트 ID -> RoomHandles
+        self.get_writer = get_writer    # 시트 ID -> SummaryWriter (없으면 None)
+        self.rooms = {}                 # 시트 ID -> (RoomHandles, SummaryWriter)
+        self.journal = SubmissionJournal(path)
+        self.replayer = JournalReplayer(self.journal, self._ship, self._existing_ids, self._on_shipped)
+        # 이전 실행에서 보내지 못한 응답의 방
+        for sheet_id in self.replayer.pending_sheet_ids():
+            self.register(sheet_id)
+        self.replayer.start()
+
+    def register(self, sheet_id):
+        if sheet_id not in self.rooms:
+            self.rooms[sheet_id] = (self.get_room(sheet_id), self.get_writer(sheet_id))
+
+    # 저널에 기록(fsync)되면 반환, 기록하지 못하면 OSError (이때 응답은 저널에 남지 않음)
+    def submit(self, sheet_id, response_data, question_type, requested_at=None):
+        self.register(sheet_id)
+        entry = JournalEntry(sheet_id, response_data, question_type, requested_at=requested_at)
+        record_stage(STAGE_SUBMIT, requested_at, entry.received_at)
+        self.journal.append(entry)
+        self.replayer.wake.set()
+
+    def _response_worksheet(self, sheet_id):
+        return _find_worksheet(self.rooms[sheet_id][0], lambda: self.client, RESPONSE_SHEET)
+
+    def _ship(self, sheet_id, entries):
+        worksheet = self._response_worksheet(sheet_id)
+        if not worksheet:
+            raise RuntimeError(f"응답 워크시트를 찾을 수 없습니다: {sheet_id}")
+        sent_at = time.time()
+        with timer("replay_responses"):
+            worksheet.append_rows([
+                entry.row + [entry.entry_id] + trace_columns(entry.requested_at, entry.received_at, sent_at)
+                for entry in entries
+            ])
+        written_at = time.time()
+        for entry in entries:
+            record_stage(STAGE_QUEUE, entry.received_at, sent_at)
+            record_stage(STAGE_WRITE, sent_at, written_at)
+
+    def _existing_ids(self, sheet_id):
+        worksheet = self._response_worksheet(sheet_id)
+        return {str(row[0]) for row in worksheet.get(SUBMISSION_ID_RANGE) if row} if worksheet else set()
+
+    def _on_shipped(self, sheet_id, entries):
+        writer = self.rooms[sheet_id][1]
+        if writer:
+            for entry in entries:
+                writer.add(entry.row[3], entry.question_type, entry.row[4])
+
+
+# 응답 제출 저널 (프로세스 하나에 하나, 모든 방이 공유)
+@st.cache_resource(show_spinner=False)
+def get_submission_journal():
+    client = get_gsheet_connection()
+    if not client:
+        return None
+    path = st.secrets.get("general", {}).get("journal_path", DEFAULT_JOURNAL_PATH)
+    return ResponseJournal(path, client, get_room_handles, get_summary_writer)
+
+
+# 응답 제출 (저널에 기록되면 True, 시트에는 잠시 뒤 추가됨)
+# 저널을 쓸 수 없으면 예전처럼 시트에 바로 저장
+# (저널이 OSError 를 내면 응답이 저널에 남지 않으므로 재전송과 겹쳐 두 번 저장되지 않음)
+# requested_at 은 제출을 누른 시각 (제출 지연 추적용, 모르면 None)
+@timed("submit_response")
+def submit_response(sheet_id, response_data, question_type, requested_at=None):
+    journal = get_submission_journal()
+    if journal:
+        try:
+            journal.submit(sheet_id, response_data, question_type, requested_at)
+            return True
+        except OSError:
+            pass
+    received_at = time.time()
+    record_stage(STAGE_SUBMIT, requested_at, received_at)
+    if save_response(sheet_id, response_data + ["", *trace_columns(requested_at, received_at, received_at)]):
+        record_response_summary(sheet_id, response_data[3], question_type, response_data[4])
+        return True
+    return False
+
+
+# 저장한 응답을 모아 SUMMARY_FLUSH_SECONDS 마다 요약 시트에 한 번에 반영
+# 반영할 때마다 질문 순서와 새 응답이 있는 질문의 블록만 읽어 더한 뒤 그 블록만 다시 쓰므로
+# (호출 2회) 응답 수와 무관하게 호출 수와 범위가 일정 (새 응답이 없으면 호출하지 않음)
+# 요약 시트는 투표 앱 프로세스 하나가 갱신한다고 가정 (여러 프로세스가 동시에 쓰면 일부 개수가 빠질 수 있음)
+class SummaryWriter(threading.Thread):
+    def __init__(self, room, client):
+        super().__init__(name=f"summary-writer-{room.sheet_id}", daemon=True)
+        self.room = room
+        self.client = client
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def add(self, question_id, question_type, answer):
+        with self.lock:
+            add_response(self.pending, question_id, question_type, answer)
+
+    def flush(self):
+        with self.lock:
+            deltas, self.pending = self.pending, {}
+        if not deltas:
+            return
+        try:
+            with timer("flush_summary"):
+                get_client = lambda: self.client
+                worksheet = _find_worksheet(self.room, get_client, SUMMARY_SHEET)
+                sheet = _read_summary_blocks(worksheet, list(deltas), self.room.summary_order) if worksheet else None
+                if sheet is not None and (sheet.order or not worksheet.get("A2:A2")):
+                    summaries = dict(sheet.summaries)
+                    merge_summaries(summaries, deltas, SUMMARY_ITEM_CAPACITY)
+                    order = extend_order(sheet.order, deltas)
+                    updates = [
+                        {"range": block_range(order.index(q)), "values": block_rows(q, summaries[q])}
+                        for q in deltas
+                    ]
+                    if len(order) > len(sheet.order):
+                        first, last = len(sheet.order) + 2, len(order) + 1
+                        updates.append({
+                            "range": f"{INDEX_COLUMN}{first}:{INDEX_COLUMN}{last}",
+                            "values": [[q] for q in order[len(sheet.order):]],
+                        })
+                    worksheet.batch_update(updates)
+                    self.room.summary_order = order
+                else:
+                    # 요약 시트를 처음 만들거나 질문 순서가 없는 예전 형식이면 기존 응답도 포함하도록
+                    # 응답 시트 전체로 계산 (방금 모은 응답은 이미 응답 시트에 저장되어 있으므로 따로 더하지 않음)
+                    records = _find_worksheet(self.room, get_client, RESPONSE_SHEET).get_all_records()
+                    # 읽는 동안 모인 응답도 시트에 저장된 뒤 모은 것이라 방금 읽은 행에 들어 있으므로 버림
+                    with self.lock:
+                        self.pending = {}
+                    questions = parse_questions(_find_worksheet(self.room, get_client, QUESTION_SHEET).get_all_records())
+                    worksheet = _get_or_add_worksheet(
+                        self.room, get_client, SUMMARY_SHEET, SUMMARY_BLOCK_ROWS + 1, len(SHEET_HEADERS)
+                    )
+                    self.room.summary_order = _write_summary(worksheet, build_summary(records, questions)).order
+        except Exception:
+            # 실패한 응답은 다음 주기에 다시 반영
+            with self.lock:
+                merge_summaries(self.pending, deltas)
+
+    def run(self):
+        while True:
+            time.sleep(SUMMARY_FLUSH_SECONDS)
+            self.flush()
+
+
+# 요약 시트 전체 쓰기 (previous_count 는 이전에 있던 블록 수, 남는 블록은 빈 칸으로 덮어씀)
+def _write_summary(worksheet, summaries, previous_count=0):
+    order, rows = sheet_rows(summaries, previous_count)
+    worksheet.update(f"A1:{INDEX_COLUMN}{len(rows)}", rows)
+    return SummarySheet(order, summaries)
+
+
+@st.cache_resource(show_spinner=False)
+def get_summary_writer(sheet_id):
+    client = get_gsheet_connection()
+    if not client:
+        return None
+    writer = SummaryWriter(get_room_handles(sheet_id), client)
+    writer.start()
+    return writer
+
+
+# 저장한 응답을 요약에 반영하도록 예약 (시트 쓰기는 백그라운드에서 모아서 처리)
+def record_response_summary(sheet_id, question_id, question_type, answer):
+    writer = get_summary_writer(sheet_id)
+    if writer:
+        writer.add(question_id, question_type, answer)
+
+
+# 응답 시트 전체로 요약 시트 다시 만들기 (기존 응답이 있거나 요약이 어긋난 경우)
+@timed("rebuild_summary")
+def rebuild_summary(sheet_id):
+    try:
+        if not get_gsheet_connection():
+            st.error("구글 시트 연결에 실패했습니다.")
+            return False
+
+        summaries = build_summary(_fetch_responses(sheet_id), load_questions(sheet_id))
+        worksheet = _get_or_add_worksheet(
+            get_room_handles(sheet_id), get_gsheet_connection, SUMMARY_SHEET, SUMMARY_BLOCK_ROWS + 1, len(SHEET_HEADERS)
+        )
+        previous_count = len(parse_index(worksheet.get(SUMMARY_INDEX_RANGE)))
+        prime(sheet_id, SUMMARY, _write_summary(worksheet, summaries, previous_count))
+        return True
+    except Exception as e:
+        st.error(f"요약 시트 생성 중 오류: {str(e)}")
+        return False
+
+
+# 질문 활성화/비활성화 함수
+@timed("update_question_status")
+def update_question_status(sheet_id, question_id, active_status):
+    try:
+        worksheet = get_worksheet(sheet_id, QUESTION_SHEET)
+        if not worksheet:
+            st.error("질문 워크시트를 찾을 수 없습니다.")
+            return False
+
+        # 모든 질문 비활성화
+        if active_status:
+            all_data = worksheet.get_all_records()
+            for idx, row in enumerate(all_data):
+                if row.get("활성화", "").lower() in ["y", "yes"]:
+                    worksheet.update_cell(idx + 2, worksheet.find("활성화").col, "N")
+
+        # 선택한 질문 활성화
+        try:
+            # 질문ID 열 찾기
+            id_col = worksheet.find("질문ID").col
+            # 활성화 열 찾기
+            active_col = worksheet.find("활성화").col
+
+            # 해당 질문ID를 가진 행 찾기
+            cell_list = worksheet.findall(question_id)
+            for cell in cell_list:
+                if cell.col == id_col:  # 질문ID 열에서 찾은 경우만
+                    worksheet.update_cell(cell.row, active_col, "Y" if active_status else "N")
+                    # 바뀐 활성화 상태를 바로 캐시에 반영 (질문 시트를 다시 읽지 않음)
+                    prime(sheet_id, QUESTIONS, load_questions(sheet_id).with_active(question_id, active_status))
+                    return True
+
+            st.warning(f"질문 ID '{question_id}'를 찾을 수 없습니다.")
+            return False
+        except Exception as e:
+            st.error(f"질문 상태 업데이트 중 오류: {str(e)}")
+            return False
+    except Exception as e:
+        st.error(f"질문 상태 업데이트 중 오류: {str(e)}")
+        return False
+
+
+# 진행 순서 저장 (진행 상태는 대기로 되돌림)
+# 이전 목록보다 짧아지면 남는 행을 빈 값으로 덮어써서 한 번의 호출로 처리
+@timed("save_show_queue")
+def save_show_queue(sheet_id, items, previous_length=0):
+    try:
+        if not get_gsheet_connection():
+            st.error("구글 시트 연결에 실패했습니다.")
+            return False
+
+        worksheet = _get_or_add_worksheet(get_room_handles(sheet_id), get_gsheet_connection, SHOW_SHEET, 100, 7)
+        rows = [QUEUE_HEADERS] + queue_rows(items)
+        rows += [["", "", ""]] * max(0, previous_length + 1 - len(rows))
+        worksheet.batch_update([
+            {"range": f"A1:C{len(rows)}", "values": rows},
+            {"range": "E1:G2", "values": [STATE_HEADERS, state_row(0, 0.0, STATUS_IDLE)]},
+        ])
+        prime(sheet_id, SHOW_QUEUE, tuple(items))
+        prime(sheet_id, SHOW_STATE, (0, 0.0, STATUS_IDLE))
+        return True
+    except Exception as e:
+        st.error(f"진행 순서 저장 중 오류: {str(e)}")
+        return False
+
+
+# 진행 상태 변경 (시작/다음 질문/종료) - 세 칸만 쓰는 한 번의 호출
+@timed("set_show_state")
+def set_show_state(sheet_id, index, started_at, status):
+    try:
+        worksheet = get_worksheet(sheet_id, SHOW_SHEET)
+        if not worksheet:
+            st.error("진행 워크시트를 찾을 수 없습니다. 진행 순서를 먼저 저장해주세요.")
+            return False
+
+        worksheet.update(SHOW_STATE_RANGE, [state_row(index, started_at, status)])
+        prime(sheet_id, SHOW_STATE, (index, started_at, status))
+        return True
+    except Exception as e:
+        st.error(f"진행 상태 변경 중 오류: {str(e)}")
+        return False
+
+
+# updateCells 요청용 행 (빈 값은 칸을 비움)
+def _cell_rows(values, width):
+    return [
+        {"values": [
+            {"userEnteredValue": {"stringValue": str(v)}} if str(v) != "" else {}
+            for v in list(row) + [""] * (width - len(row))
+        ]}
+        for row in values
+    ]
+
+
+# 워크시트 내용을 values 로 바꾸는 요청 (크기를 values 에 맞춰 줄여서 나머지 행/열은 지움)
+# 첫 행을 고정한 시트도 있으므로 최소 두 행은 남기고 빈 행으로 채움
+def _replace_sheet_requests(worksheet, values, width):
+    values = list(values) + [[]] * max(0, 2 - len(values))
+    return [
+        {"updateSheetProperties": {
+            "properties": {"sheetId": worksheet.id, "gridProperties": {"rowCount": len(values), "columnCount": width}},
+            "fields": "gridProperties.rowCount,gridProperties.columnCount",
+        }},
+        {"updateCells": {
+            "start": {"sheetId": worksheet.id, "rowIndex": 0, "columnIndex": 0},
+            "rows": _cell_rows(values, width),
+            "fields": "userEnteredValue",
+        }},
+    ]
+
+
+# 질문 시트 전체를 rows 로 바꾸기 (reset_responses 면 응답과 요약도 머리글만 남김)
+# 없는 워크시트를 추가하는 것 말고는 한 번의 batch_update 요청으로 씀
+def _write_question_sheets(sheet_id, rows, reset_responses):
+    room = get_room_handles(sheet_id)
+    question_ws = _get_or_add_worksheet(room, get_gsheet_connection, QUESTION_SHEET, len(rows) + 1, len(QUESTION_HEADERS))
+    requests = _replace_sheet_requests(question_ws, [QUESTION_HEADERS] + rows, len(QUESTION_HEADERS))
+    if reset_responses:
+        response_ws = _get_or_add_worksheet(room, get_gsheet_connection, RESPONSE_SHEET, 1, len(RESPONSE_HEADERS))
+        summary_ws = _get_or_add_worksheet(
+            room, get_gsheet_connection, SUMMARY_SHEET, SUMMARY_BLOCK_ROWS + 1, len(SHEET_HEADERS)
+        )
+        requests += _replace_sheet_requests(response_ws, [RESPONSE_HEADERS], len(RESPONSE_HEADERS))
+        requests += _replace_sheet_requests(summary_ws, [SHEET_HEADERS], len(SHEET_HEADERS))
+    room.spreadsheet.batch_update({"requests": requests})
+
+    records = [dict(zip(QUESTION_HEADERS, row)) for row in rows]
+    prime(sheet_id, QUESTIONS, parse_questions(records))
+    get_warm_start(sheet_id).update_questions(records)
+    if reset_responses:
+        prime(sheet_id, RESPONSES, [], reset=True)
+        prime(sheet_id, SUMMARY, SummarySheet(), reset=True)
+        get_warm_start(sheet_id).record_rows(2, [])
+
+
+# 질문 일괄 가져오기 (rows 는 question_import.parse_question_table 로 검사한 질문 시트 행)
+@timed("import_questions")
+def import_questions(sheet_id, rows, reset_responses=False):
+    try:
+        if not get_gsheet_connection():
+            st.error("구글 시트 연결에 실패했습니다.")
+            return False
+        _write_question_sheets(sheet_id, rows, reset_responses)
+        return True
+    except Exception as e:
+        st.error(f"질문 가져오기 중 오류 발생: {str(e)}")
+        return False
+
+
+# 시트 초기화 함수 (샘플 질문을 넣고 응답과 요약은 머리글만 남김)
+@timed("initialize_sheets")
+def initialize_sheets(sheet_id):
+    try:
+        if not get_gsheet_connection():
+            st.error("구글 시트 연결에 실패했습니다.")
+            return False
+
+        sample_questions = [
+            ["Q1", "가장 좋아하는 프로그래밍 언어는?", "객관식", "Python", "JavaScript", "Java", "C++", "기타", "", "N"],
+            ["Q2", "이 수업에서 가장 흥미로웠던 부분은?", "단답형", "", "", "", "", "", "", "N"]
+        ]
+        _write_question_sheets(sheet_id, sample_questions, reset_responses=True)
+        return True
+    except Exception as e:
+        st.error(f"시트 초기화 중 오류 발생: {str(e)}")
+        return False
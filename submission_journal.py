@@ -0,0 +1,261 @@
+"""응답 제출 저널 (투표 앱에서 사용)
+
+제출된 응답은 구글 시트에 바로 쓰지 않고 먼저 로컬 디스크의 추가 전용 저널 파일에
+한 줄(JSON)씩 기록합니다. 디스크에 기록되면 제출이 완료된 것으로 보고, 백그라운드
+재전송 스레드가 저널을 순서대로 읽어 시트에 모아서 추가합니다. 시트 API 가 느리거나
+잠시 응답하지 않아도 제출은 디스크 속도로 끝나고 응답은 사라지지 않습니다.
+
+- 그룹 커밋: GROUP_COMMIT_SECONDS 동안 들어온 제출을 한 번의 write + fsync 로 기록
+- 재전송 위치는 "<저널>.shipped" 파일에 바이트 오프셋으로 저장
+- 각 응답에는 제출ID 가 붙어 있어, 프로세스가 다시 시작되면 시트에 이미 있는
+  제출ID 를 확인하고 빠진 것만 추가 (같은 응답이 두 번 들어가지 않음)
+- 저널 파일은 프로세스 하나가 사용한다고 가정
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+GROUP_COMMIT_SECONDS = 0.005   # 이 시간 동안 들어온 제출을 모아 한 번에 fsync
+COMMIT_TIMEOUT_SECONDS = 5     # 디스크 기록을 기다리는 최대 시간
+REPLAY_INTERVAL_SECONDS = 0.5  # 새 항목을 시트로 보내는 주기
+REPLAY_BATCH_SIZE = 500        # 한 번에 시트에 추가하는 최대 행 수
+REPLAY_RETRY_MAX_SECONDS = 30  # 시트 쓰기가 실패하면 간격을 늘려 재시도 (최대)
+COMPACT_BYTES = 1 << 20        # 모두 보낸 저널이 이보다 크면 비움
+
+
+class JournalEntry:
+    __slots__ = ("entry_id", "sheet_id", "row", "question_type", "requested_at", "received_at")
+
+    def __init__(self, sheet_id, row, question_type, entry_id=None, requested_at=None, received_at=None):
+        self.entry_id = entry_id or uuid.uuid4().hex    # 제출ID
+        self.sheet_id = sheet_id
+        self.row = list(row)                            # 응답 시트에 추가할 행 (제출ID 제외)
+        self.question_type = question_type              # 요약 반영용
+        self.requested_at = requested_at                # 제출을 누른 시각 (모르면 None)
+        self.received_at = received_at or time.time()   # 제출을 받은 시각
+
+    def encode(self):
+        data = {
+            "id": self.entry_id, "sheet": self.sheet_id, "row": self.row, "type": self.question_type,
+            "at": [self.requested_at, self.received_at],
+        }
+        return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @classmethod
+    def decode(cls, line):
+        data = json.loads(line)
+        requested_at, received_at = data.get("at") or (None, None)
+        return cls(data["sheet"], data["row"], data.get("type", ""), data["id"], requested_at, received_at)
+
+
+class _Pending:
+    __slots__ = ("data", "taken", "done", "error")
+
+    def __init__(self, data):
+        self.data = data
+        self.taken = False  # 기록 스레드가 가져가 쓰기 시작했는지
+        self.done = False
+        self.error = None
+
+
+class SubmissionJournal:
+    """추가 전용 저널 파일 (여러 세션이 함께 써도 안전)"""
+
+    def __init__(self, path, commit_window=GROUP_COMMIT_SECONDS):
+        self.path = path
+        self.commit_window = commit_window
+        self.cond = threading.Condition()
+        self.file_lock = threading.Lock()  # 파일 쓰기와 비우기를 막는 잠금
+        self._pending = []
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._truncate_partial_line()
+        self._file = open(path, "ab")
+        self._writer = threading.Thread(target=self._write_forever, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    # 기록 도중 프로세스가 끝나 줄이 잘린 경우 마지막 완전한 줄까지만 남김
+    def _truncate_partial_line(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                f.truncate(end)
+
+    def append(self, entry, timeout=COMMIT_TIMEOUT_SECONDS):
+        """entry 가 디스크에 기록(fsync)될 때까지 기다림, 실패하면 OSError
+
+        OSError 이면 entry 는 저널에 남지 않으므로 다른 방법으로 저장해도 중복되지 않음
+        (시간이 초과되면 아직 기록 대기 중인 entry 를 빼고, 이미 쓰기 시작했으면 그 결과를 기다림)
+        """
+        pending = _Pending(entry.encode())
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            self._pending.append(pending)
+            self.cond.notify_all()
+            while not pending.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 and not pending.taken:
+                    self._pending.remove(pending)
+                    raise OSError("저널 기록 시간 초과")
+                self.cond.wait(remaining if remaining > 0 else None)
+        if pending.error:
+            raise pending.error
+
+    def _write_forever(self):
+        while True:
+            with self.cond:
+                while not self._pending:
+                    self.cond.wait()
+            # 잠시 기다려 그동안 들어온 제출을 함께 기록
+            time.sleep(self.commit_window)
+            with self.cond:
+                batch, self._pending = self._pending, []
+                for p in batch:
+                    p.taken = True
+            if not batch:
+                continue  # 기다리는 동안 모두 시간 초과로 빠짐
+            error = None
+            try:
+                with self.file_lock:
+                    self._file.write(b"".join(p.data for p in batch))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                error = e
+            with self.cond:
+                for p in batch:
+                    p.done = True
+                    p.error = error
+                self.cond.notify_all()
+
+    def size(self):
+        with self.file_lock:
+            return os.path.getsize(self.path)
+
+    # 모두 보낸 저널 비우기 (file_lock 을 잡은 상태에서 호출)
+    def truncate(self):
+        self._file.truncate(0)
+
+
+class JournalReplayer(threading.Thread):
+    """저널 항목을 순서대로 시트에 추가하는 백그라운드 스레드
+
+    ship(sheet_id, entries)      시트에 행 추가 (실패하면 예외)
+    existing_ids(sheet_id)       시트에 이미 있는 제출ID 집합 (다시 시작한 뒤 처음 한 번만 사용)
+    on_shipped(sheet_id, entries) 추가한 뒤 호출 (요약 반영 등, 선택)
+    """
+
+    def __init__(self, journal, ship, existing_ids, on_shipped=None):
+        super().__init__(name="journal-replayer", daemon=True)
+        self.journal = journal
+        self.ship = ship
+        self.existing_ids = existing_ids
+        self.on_shipped = on_shipped
+        self.offset_path = journal.path + ".shipped"
+        self.offset = self._read_offset()
+        # 이 위치까지는 이전 프로세스가 보냈는지 알 수 없으므로 시트의 제출ID 로 확인
+        self.recover_until = journal.size()
+        if self.offset > self.recover_until:
+            self.offset = 0
+        self.wake = threading.Event()
+        self.last_error = None
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset):
+        tmp_path = self.offset_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.offset_path)
+        self.offset = offset
+
+    # offset 이후의 완전한 줄을 최대 limit 개 읽기 -> ([(끝 오프셋, 항목)], 마지막으로 읽은 위치)
+    def _read_entries(self, limit):
+        entries = []
+        end = self.offset
+        with open(self.journal.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n") or len(entries) >= limit:
+                    break
+                end += len(line)
+                try:
+                    entries.append((end, JournalEntry.decode(line)))
+                except (ValueError, KeyError):
+                    continue  # 손상된 줄은 건너뜀
+        return entries, end
+
+    def pending_sheet_ids(self):
+        """아직 보내지 않은 항목의 시트 ID 집합"""
+        sheet_ids = set()
+        with open(self.journal.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                try:
+                    sheet_ids.add(JournalEntry.decode(line).sheet_id)
+                except (ValueError, KeyError):
+                    continue
+        return sheet_ids
+
+    def replay_once(self):
+        """보낼 항목이 남아 있으면 True"""
+        entries, end = self._read_entries(REPLAY_BATCH_SIZE)
+        if end == self.offset:
+            return False
+
+        by_sheet = {}
+        for entry_end, entry in entries:
+            by_sheet.setdefault(entry.sheet_id, []).append((entry_end, entry))
+        for sheet_id, items in by_sheet.items():
+            batch = [entry for _, entry in items]
+            if items[0][0] <= self.recover_until:
+                shipped = self.existing_ids(sheet_id)
+                batch = [entry for entry in batch if entry.entry_id not in shipped]
+            if batch:
+                self.ship(sheet_id, batch)
+                if self.on_shipped:
+                    self.on_shipped(sheet_id, batch)
+
+        # 시트별로 보낸 뒤 한 번에 위치 저장 (중간에 실패하면 다음에 제출ID 로 다시 확인)
+        self._write_offset(end)
+        if end >= self.recover_until:
+            self.recover_until = 0
+        self._compact()
+        return True
+
+    # 모두 보냈고 저널이 크면 비움
+    # 위치를 먼저 0 으로 저장하므로, 그 사이에 끝나도 다시 시작할 때 제출ID 로 걸러서 다시 보냄
+    def _compact(self):
+        if self.offset < COMPACT_BYTES:
+            return
+        with self.journal.file_lock:
+            if os.path.getsize(self.journal.path) != self.offset:
+                return
+            self._write_offset(0)
+            self.journal.truncate()
+
+    def run(self):
+        delay = REPLAY_INTERVAL_SECONDS
+        while True:
+            self.wake.wait(delay)
+            self.wake.clear()
+            try:
+                while self.replay_once():
+                    pass
+                self.last_error = None
+                delay = REPLAY_INTERVAL_SECONDS
+            except Exception as e:
+                # 실패하면 같은 위치부터 다시 시도 (이미 추가된 행은 제출ID 로 걸러냄)
+                self.last_error = e
+                self.recover_until = max(self.recover_until, self.journal.size())
+                delay = min(delay * 2, REPLAY_RETRY_MAX_SECONDS)
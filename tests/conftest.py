@@ -0,0 +1,9 @@
+import logging
+import os
+import sys
+
+# 앱 모듈은 저장소 최상위에 있음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Streamlit 서버 없이 sheet_store 를 import 할 때 나오는 bare mode 경고를 숨김
+logging.getLogger("streamlit").setLevel(logging.ERROR)
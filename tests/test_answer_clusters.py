@@ -0,0 +1,37 @@
+from answer_clusters import AnswerClusterer, cluster_answers, normalize
+
+
+def summary(clusterer):
+    return [(cluster.representative, cluster.count) for cluster in clusterer.top()]
+
+
+def test_similar_answers_share_a_cluster():
+    clusterer = cluster_answers(["재밌어요", "재미있어요", "재밌어요!", "어려웠어요", "어려웠어요", "파이썬 좋아요"])
+    assert summary(clusterer) == [("재밌어요", 3), ("어려웠어요", 2), ("파이썬 좋아요", 1)]
+
+
+def test_blank_answers_are_counted_but_not_clustered():
+    clusterer = cluster_answers(["", "  ", "!!", "좋아요"])
+    assert clusterer.count == 4
+    assert summary(clusterer) == [("좋아요", 1)]
+    assert normalize("!!") == ""
+
+
+def test_update_processes_only_new_answers():
+    answers = ["재밌어요", "어려웠어요"]
+    clusterer = AnswerClusterer()
+    clusterer.update(answers)
+    clusterer.update(answers + ["재미있어요"])
+    assert clusterer.count == 3
+    assert summary(clusterer) == [("재밌어요", 2), ("어려웠어요", 1)]
+
+
+def test_update_starts_over_when_sheet_is_reset():
+    clusterer = AnswerClusterer()
+    clusterer.update(["재밌어요", "재밌어요"], epoch=0)
+    # 초기화 뒤 응답이 다시 같은 수만큼 쌓여도 초기화 세대가 바뀌면 처음부터 묶음
+    clusterer.update(["어려웠어요", "어려웠어요", "어려웠어요"], epoch=1)
+    assert summary(clusterer) == [("어려웠어요", 3)]
+    # 응답 목록이 줄어든 경우도 처음부터
+    clusterer.update(["좋아요"], epoch=1)
+    assert summary(clusterer) == [("좋아요", 1)]
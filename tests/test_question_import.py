@@ -0,0 +1,66 @@
+import pytest
+
+from question_import import decode_table, parse_question_table
+
+HEADER = "질문,유형,선택지1,선택지2,정답,활성화"
+
+
+def test_parses_csv_and_fills_missing_ids():
+    rows, errors = parse_question_table(
+        "질문ID,질문,유형,선택지1,선택지2,정답,활성화\n"
+        ",좋아하는 언어는?,객관식,Python,Java,Python,Y\n"
+        "Q1,소감은?,단답형,,,,\n"
+        ",마지막?,단답형,,,,n\n"
+    )
+    assert errors == []
+    assert rows == [
+        ["Q2", "좋아하는 언어는?", "객관식", "Python", "Java", "", "", "", "Python", "Y"],
+        ["Q1", "소감은?", "단답형", "", "", "", "", "", "", "N"],
+        ["Q3", "마지막?", "단답형", "", "", "", "", "", "", "N"],
+    ]
+
+
+def test_parses_tab_separated_paste():
+    rows, errors = parse_question_table("유형\t질문\n단답형\t소감은?\n")
+    assert errors == []
+    assert rows[0][:3] == ["Q1", "소감은?", "단답형"]
+
+
+def test_decodes_cp949_csv():
+    assert decode_table("질문,유형".encode("cp949")) == "질문,유형"
+    assert decode_table(b"\xef\xbb\xbf" + "질문".encode("utf-8")) == "질문"  # BOM 제거
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "가져올 내용이 없습니다."),
+    ("질문,유형,메모\n소감?,단답형,x\n", "알 수 없는 열: 메모"),
+    ("질문,선택지1\n소감?,x\n", "필수 열이 없습니다: 유형"),
+    ("질문,유형,유형\n소감?,단답형,단답형\n", "같은 열이 여러 번 있습니다: 유형"),
+    ("질문,유형\n", "머리글 아래에 질문이 없습니다."),
+])
+def test_header_errors(text, message):
+    rows, errors = parse_question_table(text)
+    assert rows == []
+    assert errors[0].startswith(message)
+
+
+@pytest.mark.parametrize("line, message", [
+    (",단답형,,,,", "2행: 질문이 비어 있습니다."),
+    ("소감?,서술형,,,,", "2행: 유형은 객관식 또는 단답형 이어야 합니다. (입력: 서술형)"),
+    ("언어?,객관식,Python,,,", "2행: 객관식 질문은 선택지가 두 개 이상 필요합니다."),
+    ("언어?,객관식,Python,Java,C,", "2행: 정답이 선택지에 없습니다: C"),
+    ("소감?,단답형,,,,예", "2행: 활성화는 Y 또는 N 이어야 합니다. (입력: 예)"),
+    ("소감?,단답형,,,,,남는 값", "2행: 머리글보다 값이 많습니다."),
+])
+def test_row_errors(line, message):
+    _, errors = parse_question_table(f"{HEADER}\n{line}\n")
+    assert errors == [message]
+
+
+def test_table_errors_across_rows():
+    _, errors = parse_question_table(
+        "질문ID,질문,유형,활성화\n"
+        "Q1,하나?,단답형,Y\n"
+        "Q1,둘?,단답형,Y\n"
+    )
+    assert errors == ["3행: 질문ID 가 중복됩니다: Q1", "활성화된 질문은 하나만 둘 수 있습니다. (2, 3행)"]
@@ -0,0 +1,60 @@
+from question_model import parse_questions
+from quiz_scoring import ScoreBoard, answer_key
+
+
+def make_board():
+    questions = parse_questions([
+        {"질문ID": "Q1", "질문": "수도?", "유형": "단답형", "정답": "서울|Seoul", "활성화": "Y"},
+        {"질문ID": "Q2", "질문": "언어?", "유형": "객관식", "선택지1": "Python", "선택지2": "Java", "정답": "Python"},
+        {"질문ID": "Q3", "질문": "소감?", "유형": "단답형"},
+    ])
+    board = ScoreBoard()
+    board.reset(key=answer_key(questions))
+    return board
+
+
+def test_answer_key_skips_questions_without_answer():
+    board = make_board()
+    assert board.key == {"Q1": frozenset({"서울", "seoul"}), "Q2": frozenset({"python"})}
+
+
+def test_ranking_orders_by_score():
+    board = make_board()
+    board.add_rows([
+        ["가", "Q1", "서울", "s1"],
+        ["나", "Q1", "부산", "s2"],
+        ["다", "Q1", "  SEOUL ", "s3"],   # 대소문자와 공백은 무시
+        ["가", "Q2", "Python", "s1"],
+        ["나", "Q3", "재밌어요", "s2"],   # 정답이 없는 질문은 채점하지 않음
+    ])
+    assert board.top() == [(1, "가", 2, 2), (2, "다", 1, 1), (3, "나", 0, 1)]
+    assert board.next_row == 7
+
+
+def test_ties_share_rank_and_earlier_score_comes_first():
+    board = make_board()
+    board.add_rows([
+        ["나", "Q1", "서울", "s2"],
+        ["가", "Q1", "서울", "s1"],
+        ["다", "Q2", "Python", "s3"],
+        ["라", "Q2", "Java", "s4"],
+    ])
+    assert board.top() == [(1, "나", 1, 1), (1, "가", 1, 1), (1, "다", 1, 1), (4, "라", 0, 1)]
+    assert board.top(2) == [(1, "나", 1, 1), (1, "가", 1, 1)]
+
+
+def test_only_first_answer_per_question_is_scored():
+    board = make_board()
+    board.add_rows([
+        ["가", "Q1", "부산", "s1"],
+        ["가", "Q1", "서울", "s1"],
+        ["새이름", "Q2", "Python", "s1"],
+    ])
+    assert board.top() == [(1, "새이름", 1, 2)]
+
+
+def test_rows_without_session_use_nickname():
+    board = make_board()
+    board.add_rows([["가", "Q1", "서울"], ["가", "Q1", "서울", ""]])
+    assert board.top() == [(1, "가", 1, 1)]
+    assert len(board) == 1
@@ -0,0 +1,133 @@
+from collections import Counter
+
+from fake_gspread import FakeBackend, FakeClient
+from question_model import QUESTION_HEADERS, parse_questions
+from response_summary import (
+    INDEX_COLUMN, SHEET_HEADERS, SUMMARY_BLOCK_ROWS, SUMMARY_ITEM_CAPACITY, SUMMARY_WIDTH, QuestionSummary,
+    add_response, block_range, block_rows, build_summary, merge_summaries, parse_index, parse_summary, sheet_rows,
+)
+from sheet_store import (
+    QUESTION_SHEET, RESPONSE_HEADERS, RESPONSE_SHEET, SUMMARY_SHEET, RoomHandles, SummaryWriter,
+)
+
+
+def make_summaries():
+    summaries = {}
+    for answer in ["Python", "Java", "Python"]:
+        add_response(summaries, "Q1", "객관식", answer)
+    for answer in ["파이썬 재밌어요", "파이썬 어려워요"]:
+        add_response(summaries, "Q2", "단답형", answer)
+    summaries["Q2"].errors = {"파이썬": 1}
+    return summaries
+
+
+# 시트 A1:F 값 -> (F 열 질문 순서, 블록별 A:D 값)
+def split_sheet(rows):
+    body = rows[1:]
+    index = parse_index([[row[5]] for row in body])
+    blocks = [
+        [row[:SUMMARY_WIDTH] for row in body[i:i + SUMMARY_BLOCK_ROWS]]
+        for i in range(0, len(body), SUMMARY_BLOCK_ROWS)
+    ]
+    return index, blocks
+
+
+def assert_same_summary(actual, expected):
+    assert actual.total == expected.total
+    assert actual.counts == expected.counts
+    assert actual.errors == expected.errors
+
+
+def test_add_response_counts_choices_and_words():
+    summaries = make_summaries()
+    assert summaries["Q1"].total == 3
+    assert summaries["Q1"].counts == Counter({"Python": 2, "Java": 1})
+    assert summaries["Q2"].total == 2
+    assert summaries["Q2"].counts["파이썬"] == 2
+
+
+def test_summary_blocks_round_trip():
+    summaries = make_summaries()
+    order, rows = sheet_rows(summaries)
+
+    assert order == ("Q1", "Q2")
+    assert rows[0] == SHEET_HEADERS
+    assert len(rows) == 1 + 2 * SUMMARY_BLOCK_ROWS
+    index, blocks = split_sheet(rows)
+    assert index == order
+    for question_id, block in zip(index, blocks):
+        assert_same_summary(parse_summary(block)[question_id], summaries[question_id])
+
+
+def test_block_ranges_are_fixed_per_position():
+    assert block_range(0) == f"A2:D{1 + SUMMARY_BLOCK_ROWS}"
+    assert block_range(2) == f"A{2 + 2 * SUMMARY_BLOCK_ROWS}:D{1 + 3 * SUMMARY_BLOCK_ROWS}"
+    assert len(block_rows("Q1", QuestionSummary(1, Counter({"a": 1})))) == SUMMARY_BLOCK_ROWS
+
+
+def test_rewrite_blanks_blocks_that_are_gone():
+    _, rows = sheet_rows({"Q1": QuestionSummary(1, Counter({"a": 1}))}, previous_count=3)
+    index, blocks = split_sheet(rows)
+    assert index == ("Q1",)
+    assert len(blocks) == 3
+    assert parse_summary(blocks[1] + blocks[2]) == {}
+
+
+def test_parse_summary_reads_rows_without_error_column():
+    summaries = parse_summary([["Q1", "#응답수", "3"], ["Q1", "Python", "2"], ["Q1", "Java", 1], ["", "", ""]])
+    assert_same_summary(summaries["Q1"], QuestionSummary(3, Counter({"Python": 2, "Java": 1})))
+
+
+def test_merge_summaries_caps_items_without_under_counting():
+    exact = Counter({f"단어{i}": 200 - i for i in range(150)})
+    summaries = {"Q1": QuestionSummary(10, Counter(dict(list(exact.items())[:80])))}
+    delta = QuestionSummary(5, Counter(dict(list(exact.items())[80:])))
+
+    merge_summaries(summaries, {"Q1": delta}, SUMMARY_ITEM_CAPACITY)
+
+    summary = summaries["Q1"]
+    assert summary.total == 15
+    assert len(summary.counts) == SUMMARY_ITEM_CAPACITY
+    for item, count in summary.counts.items():
+        assert count >= exact[item]
+        assert count - summary.errors.get(item, 0) <= exact[item]
+
+
+def test_build_summary_uses_question_types():
+    questions = parse_questions([
+        {"질문ID": "Q1", "질문": "언어?", "유형": "객관식", "선택지1": "Python", "선택지2": "Java"},
+        {"질문ID": "Q2", "질문": "소감?", "유형": "단답형"},
+    ])
+    records = [
+        {"질문ID": "Q1", "응답": "Python"},
+        {"질문ID": "Q2", "응답": "파이썬 재밌어요"},
+        {"질문ID": "", "응답": "무시"},
+    ]
+    summaries = build_summary(records, questions)
+    assert summaries["Q1"].counts == Counter({"Python": 1})
+    assert summaries["Q2"].counts == Counter({"파이썬": 1, "재밌어요": 1})
+
+
+def test_summary_writer_updates_only_changed_blocks():
+    client = FakeClient(FakeBackend())
+    spreadsheet = client.spreadsheet("S")
+    spreadsheet.seed_worksheet(QUESTION_SHEET, [list(QUESTION_HEADERS), ["Q1", "언어?", "객관식", "Python", "Java"]])
+    spreadsheet.seed_worksheet(RESPONSE_SHEET, [RESPONSE_HEADERS, ["t", "", "가", "Q1", "Python", "s1"]])
+    writer = SummaryWriter(RoomHandles("S"), client)
+
+    # 요약 시트가 없으면 응답 시트 전체로 만듦 (이미 저장된 응답은 두 번 세지 않음)
+    writer.add("Q1", "객관식", "Python")
+    writer.flush()
+    writer.add("Q1", "객관식", "Java")
+    writer.add("Q2", "단답형", "재밌어요")
+    client.backend.calls.clear()
+    writer.flush()
+
+    calls = client.backend.calls
+    assert (calls["batch_get"], calls["batch_update"], calls["get_all_records"]) == (1, 1, 0)
+    rows = spreadsheet.worksheet(SUMMARY_SHEET).get(f"A1:{INDEX_COLUMN}{1 + 2 * SUMMARY_BLOCK_ROWS}")
+    rows = [row + [""] * (len(SHEET_HEADERS) - len(row)) for row in rows]
+    index, blocks = split_sheet(rows)
+    assert index == ("Q1", "Q2")
+    assert_same_summary(parse_summary(blocks[0])["Q1"], QuestionSummary(2, Counter({"Python": 1, "Java": 1})))
+    assert_same_summary(parse_summary(blocks[1])["Q2"], QuestionSummary(1, Counter({"재밌어요": 1})))
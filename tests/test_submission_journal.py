@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+
+import pytest
+
+import submission_journal
+from fake_gspread import FakeBackend, FakeClient
+from sheet_store import RESPONSE_HEADERS, RESPONSE_SHEET, ResponseJournal, RoomHandles
+from submission_journal import JournalEntry, JournalReplayer, SubmissionJournal
+
+
+def make_entry(sheet_id, answer):
+    return JournalEntry(sheet_id, ["2024-01-01 10:00:00", "", "닉네임", "Q1", answer, "s1"], "객관식")
+
+
+def journal_lines(path):
+    with open(path, "rb") as f:
+        return f.read().splitlines()
+
+
+# 시트 대신 메모리 목록으로 보내는 재전송기
+class MemorySheets:
+    def __init__(self):
+        self.rows = {}
+
+    def ship(self, sheet_id, entries):
+        self.rows.setdefault(sheet_id, []).extend(entry.entry_id for entry in entries)
+
+    def existing_ids(self, sheet_id):
+        return set(self.rows.get(sheet_id, []))
+
+
+def test_group_commit_writes_concurrent_submissions_with_few_fsyncs(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(submission_journal.os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    path = str(tmp_path / "journal")
+    journal = SubmissionJournal(path, commit_window=0.05)
+
+    threads = [threading.Thread(target=journal.append, args=(make_entry("S", f"a{i}"),)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(journal_lines(path)) == 50
+    assert 1 <= len(fsyncs) < 50
+
+
+def test_partial_last_line_is_truncated_on_open(tmp_path):
+    path = str(tmp_path / "journal")
+    complete = make_entry("S", "Python").encode()
+    with open(path, "wb") as f:
+        f.write(complete + '{"id": "끊긴'.encode("utf-8"))
+
+    SubmissionJournal(path)
+
+    with open(path, "rb") as f:
+        assert f.read() == complete
+
+
+def test_shipped_offset_is_saved_and_used_after_restart(tmp_path):
+    path = str(tmp_path / "journal")
+    sheets = MemorySheets()
+    journal = SubmissionJournal(path)
+    for answer in ("Python", "Java"):
+        journal.append(make_entry("S", answer))
+
+    replayer = JournalReplayer(journal, sheets.ship, sheets.existing_ids)
+    assert replayer.replay_once()
+    assert not replayer.replay_once()
+    with open(path + ".shipped", encoding="utf-8") as f:
+        assert int(f.read()) == os.path.getsize(path)
+
+    restarted = JournalReplayer(SubmissionJournal(path), sheets.ship, sheets.existing_ids)
+    assert restarted.offset == os.path.getsize(path)
+    assert not restarted.replay_once()
+    assert len(sheets.rows["S"]) == 2
+
+
+def test_restart_without_offset_skips_ids_already_in_sheet(tmp_path):
+    path = str(tmp_path / "journal")
+    sheets = MemorySheets()
+    journal = SubmissionJournal(path)
+    entries = [make_entry("S", f"a{i}") for i in range(3)]
+    for entry in entries:
+        journal.append(entry)
+    # 첫 항목은 시트에 들어갔지만 위치를 저장하기 전에 프로세스가 끝난 경우
+    sheets.ship("S", entries[:1])
+
+    replayer = JournalReplayer(SubmissionJournal(path), sheets.ship, sheets.existing_ids)
+    while replayer.replay_once():
+        pass
+
+    assert sheets.rows["S"] == [entry.entry_id for entry in entries]
+
+
+def test_compacts_journal_after_everything_is_shipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(submission_journal, "COMPACT_BYTES", 1)
+    path = str(tmp_path / "journal")
+    sheets = MemorySheets()
+    journal = SubmissionJournal(path)
+    journal.append(make_entry("S", "Python"))
+
+    replayer = JournalReplayer(journal, sheets.ship, sheets.existing_ids)
+    replayer.replay_once()
+
+    assert os.path.getsize(path) == 0
+    assert replayer.offset == 0
+    journal.append(make_entry("S", "Java"))
+    assert replayer.replay_once()
+    assert len(sheets.rows["S"]) == 2
+
+
+def test_timed_out_submission_is_neither_written_nor_shipped(tmp_path, monkeypatch):
+    path = str(tmp_path / "journal")
+    journal = SubmissionJournal(path)
+    gate = threading.Event()
+    real_fsync = os.fsync
+    monkeypatch.setattr(submission_journal.os, "fsync", lambda fd: (gate.wait(), real_fsync(fd)))
+
+    # 첫 제출은 기록 스레드가 가져가 fsync 에서 멈춤, 두 번째 제출은 대기열에서 시간 초과
+    inflight = threading.Thread(target=journal.append, args=(make_entry("S", "inflight"), 0.2))
+    inflight.start()
+    time.sleep(0.1)
+    with pytest.raises(OSError):
+        journal.append(make_entry("S", "queued"), timeout=0.2)
+    gate.set()
+    inflight.join()
+    time.sleep(0.1)
+
+    sheets = MemorySheets()
+    replayer = JournalReplayer(journal, sheets.ship, sheets.existing_ids)
+    replayer.replay_once()
+    data = b"".join(journal_lines(path))
+    assert b"inflight" in data and b"queued" not in data
+    assert len(sheets.rows["S"]) == 1
+
+
+@pytest.fixture
+def client():
+    client = FakeClient(FakeBackend())
+    for sheet_id in ("S1", "S2"):
+        client.spreadsheet(sheet_id).seed_worksheet(RESPONSE_SHEET, [RESPONSE_HEADERS])
+    return client
+
+
+def open_response_journal(path, client, monkeypatch):
+    # 재전송 스레드가 스스로 깨어나지 않도록 하고 테스트에서 replay_once 로 직접 보냄
+    monkeypatch.setattr(submission_journal, "REPLAY_INTERVAL_SECONDS", 3600)
+    return ResponseJournal(path, client, RoomHandles, lambda sheet_id: None)
+
+
+def submission_ids(client, sheet_id):
+    return [row[6] for row in client.spreadsheet(sheet_id).worksheet(RESPONSE_SHEET).get_all_values()[1:]]
+
+
+def test_replay_after_partial_batch_failure_and_restart_ships_no_duplicates(tmp_path, client, monkeypatch):
+    path = str(tmp_path / "journal")
+    first = open_response_journal(path, client, monkeypatch)
+    entries = [make_entry(sheet_id, f"{sheet_id}-{i}") for i in range(3) for sheet_id in ("S1", "S2")]
+    for entry in entries:
+        first.register(entry.sheet_id)
+        first.journal.append(entry)
+
+    # S1 은 정상, S2 는 행이 추가된 뒤 응답이 오지 않아 오류로 보임
+    worksheet = client.spreadsheet("S2").worksheet(RESPONSE_SHEET)
+    append_rows = worksheet.append_rows
+
+    def append_then_fail(values, **kwargs):
+        append_rows(values, **kwargs)
+        raise TimeoutError("응답 없음")
+
+    monkeypatch.setattr(worksheet, "append_rows", append_then_fail)
+    with pytest.raises(TimeoutError):
+        first.replayer.replay_once()
+    monkeypatch.setattr(worksheet, "append_rows", append_rows)
+
+    # 위치를 저장하지 못한 채 다시 시작
+    restarted = open_response_journal(path, client, monkeypatch)
+    while restarted.replayer.replay_once():
+        pass
+
+    for sheet_id in ("S1", "S2"):
+        expected = [entry.entry_id for entry in entries if entry.sheet_id == sheet_id]
+        assert submission_ids(client, sheet_id) == expected
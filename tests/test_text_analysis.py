@@ -0,0 +1,64 @@
+import random
+from collections import Counter
+
+import pytest
+
+from text_analysis import SpaceSaving, heavy_hitters
+
+
+# 앞쪽 단어가 훨씬 자주 나오는 응답 단어 흐름
+def skewed_stream(size, vocabulary, seed):
+    rng = random.Random(seed)
+    words = [f"단어{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    return rng.choices(words, weights, k=size)
+
+
+def assert_space_saving_bounds(sketch, exact):
+    total = sum(exact.values())
+    for item, estimate, error in sketch.top(sketch.capacity):
+        assert estimate >= exact[item]            # 실제보다 작게 세지 않음
+        assert estimate - error <= exact[item]    # 오차 범위 안
+    kept = {item for item, _, _ in sketch.top(sketch.capacity)}
+    for item, count in exact.items():
+        if count > total / sketch.capacity:
+            assert item in kept                   # 자주 나온 항목은 반드시 남음
+    assert sketch.max_error() <= total / sketch.capacity
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_space_saving_never_under_counts(seed):
+    stream = skewed_stream(5000, 300, seed)
+    sketch = SpaceSaving(20)
+    for word in stream:
+        sketch.add(word)
+
+    assert sketch.total == len(stream)
+    assert_space_saving_bounds(sketch, Counter(stream))
+
+
+def test_space_saving_is_exact_below_capacity():
+    sketch = SpaceSaving(10)
+    for word in ["파이썬", "자바", "파이썬"]:
+        sketch.add(word)
+    assert sketch.top(10) == [("파이썬", 2, 0), ("자바", 1, 0)]
+    assert sketch.max_error() == 0
+
+
+def test_restored_sketch_keeps_bounds():
+    first, rest = skewed_stream(3000, 300, 7), skewed_stream(3000, 300, 8)
+    saved = SpaceSaving(20)
+    for word in first:
+        saved.add(word)
+    counts = {item: estimate for item, estimate, _ in saved.top(20)}
+    errors = {item: error for item, _, error in saved.top(20) if error}
+
+    sketch = SpaceSaving.restore(20, counts, errors)
+    for word in rest:
+        sketch.add(word)
+    assert_space_saving_bounds(sketch, Counter(first + rest))
+
+
+def test_heavy_hitters_counts_words_in_responses():
+    sketch = heavy_hitters(["파이썬 재밌어요", "파이썬 어려워요"], capacity=10)
+    assert sketch.top(1) == [("파이썬", 2, 0)]
@@ -0,0 +1,116 @@
+"""단답형 응답 단어 분석 (관리자 앱과 투표 앱이 함께 사용)
+
+관리자 대시보드의 단어 빈도 차트와, 응답을 저장할 때 갱신하는 요약 시트가
+같은 단어 분리 규칙을 쓰도록 한 곳에 모았습니다.
+
+응답이 아주 많으면 모든 단어의 개수를 세는 대신 Space-Saving 알고리즘으로
+정해진 개수의 카운터만 유지하며 상위 단어를 근사합니다.
+"""
+import heapq
+import re
+from collections import Counter
+
+WORD_PATTERN = re.compile(r'\b[\w가-힣]+\b')
+
+# 응답 수가 이보다 많으면 상위 단어를 근사 계산 (시크릿 general.text_stream_threshold 로 변경)
+STREAMING_THRESHOLD = 5000
+# 근사 계산에서 유지하는 카운터 수 (시크릿 general.text_stream_capacity 로 변경)
+STREAMING_CAPACITY = 500
+
+# 불용어 (필요시 확장)
+STOPWORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
+             '이', '그', '저', '이것', '그것', '저것', '이런', '그런', '저런'}
+
+
+# 응답 하나를 단어로 분리 (한글, 영문, 숫자 포함, 불용어와 한 글자 단어 제외)
+def extract_words(response):
+    return [
+        word for word in WORD_PATTERN.findall(str(response).lower())
+        if word not in STOPWORDS and len(word) > 1
+    ]
+
+
+# 응답 목록 전체의 단어 빈도
+def count_words(responses):
+    word_counts = Counter()
+    for response in responses:
+        word_counts.update(extract_words(response))
+    return word_counts
+
+
+class SpaceSaving:
+    """Space-Saving 상위 빈도 항목 근사 (Metwally et al., 2005)
+
+    capacity 개의 카운터만 유지한다. 카운터가 가득 차면 가장 작은 카운터를
+    새 항목에 넘겨주므로, 추정 개수는 실제보다 크거나 같고 그 차이는 항목별
+    error 이하다. 모든 항목의 오차는 total / capacity 를 넘지 않으며,
+    실제 개수가 그보다 큰 항목은 반드시 카운터에 남아 있다.
+    """
+    __slots__ = ("capacity", "total", "counters", "_heap")
+
+    def __init__(self, capacity=STREAMING_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.counters = {}  # 항목 -> [추정 개수, 오차]
+        self._heap = []     # (개수, 항목) 최소 힙, 개수가 바뀐 항목의 옛 값은 꺼낼 때 버림
+
+    @classmethod
+    def restore(cls, capacity, counts, errors=None):
+        """저장해 둔 추정 개수(항목 -> 개수)와 오차로 다시 만들기 (capacity 개보다 많으면 큰 것만 남김)
+
+        정확한 개수에서 큰 것만 남겨도, 빠진 항목의 개수는 남은 가장 작은 카운터 이하이므로
+        Space-Saving 의 보장이 그대로 유지된다.
+        """
+        sketch = cls(capacity)
+        errors = errors or {}
+        for item, count in Counter(counts).most_common(capacity):
+            sketch.counters[item] = [count, errors.get(item, 0)]
+        sketch.total = sum(counts.values())
+        sketch._compact()
+        return sketch
+
+    def add(self, item, count=1):
+        self.total += count
+        entry = self.counters.get(item)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counters) < self.capacity:
+            entry = self.counters[item] = [count, 0]
+        else:
+            min_count, min_item = self._pop_min()
+            del self.counters[min_item]
+            entry = self.counters[item] = [min_count + count, min_count]
+        heapq.heappush(self._heap, (entry[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._compact()
+
+    def _pop_min(self):
+        while True:
+            count, item = heapq.heappop(self._heap)
+            entry = self.counters.get(item)
+            if entry is not None and entry[0] == count:
+                return count, item
+
+    def _compact(self):
+        self._heap = [(entry[0], item) for item, entry in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def max_error(self):
+        """추정 개수의 최대 오차 (카운터가 가득 차기 전에는 0)"""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(entry[0] for entry in self.counters.values())
+
+    def top(self, k):
+        """추정 개수가 큰 순서로 (항목, 추정 개수, 오차) 최대 k 개"""
+        ranked = sorted(self.counters.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [(item, entry[0], entry[1]) for item, entry in ranked[:k]]
+
+
+# 응답 목록의 상위 단어를 고정된 메모리로 근사
+def heavy_hitters(responses, capacity=STREAMING_CAPACITY):
+    sketch = SpaceSaving(capacity)
+    for response in responses:
+        for word in extract_words(response):
+            sketch.add(word)
+    return sketch
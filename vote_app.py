@@ -1,10 +1,13 @@
 import streamlit as st
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import streamlit.components.v1 as components
+import os
 import time
 import uuid
 import datetime
-import random
+from nicknames import generate_random_nickname
+from perf_metrics import timer, render_perf_panel
+from run_of_show import resolve_active_question
+from sheet_store import resolve_room, load_questions, load_run_of_show, submit_response
 
 # 페이지 설정
 st.set_page_config(
@@ -13,20 +16,8 @@ st.set_page_config(
     layout="centered"
 )
 
-# 랜덤 닉네임 생성을 위한 단어 목록
-ANIMALS = ["판다", "호랑이", "사자", "코끼리", "기린", "코알라", "캥거루", "토끼", "거북이", "소라게", 
-           "여우", "늑대", "곰", "펭귄", "고래", "돌고래", "독수리", "참새", "까마귀", "앵무새", 
-           "뱀", "악어", "고양이", "강아지", "햄스터", "다람쥐", "원숭이", "고릴라", "치타", "표범"]
-
-ADJECTIVES = ["행복한", "즐거운", "신나는", "용감한", "지혜로운", "친절한", "재미있는", "귀여운", "멋진", 
-              "활발한", "조용한", "신비로운", "익살스러운", "날렵한", "느긋한", "부지런한", "창의적인", 
-              "엉뚱한", "호기심많은", "다정한", "열정적인", "사려깊은", "영리한", "우아한", "대담한"]
-
-# 랜덤 닉네임 생성 함수
-def generate_random_nickname():
-    adj = random.choice(ADJECTIVES)
-    animal = random.choice(ANIMALS)
-    return f"{adj} {animal}"
+# 진행 순서가 진행 중일 때 다음 질문을 확인하는 간격 (초)
+SHOW_POLL_SECONDS = 1
 
 # 커스텀 CSS (모바일 최적화)
 st.markdown(
@@ -211,78 +202,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# 구글 시트 연결 설정
-@st.cache_resource
-def get_gsheet_connection():
-    try:
-        scope = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-            st.secrets["gcp_service_account"], scope
-        )
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        st.error(f"인증 오류: {str(e)}")
-        return None
-
-# 구글 시트에서 질문 데이터 가져오기
-@st.cache_data(ttl=5)  # 5초마다 데이터 새로고침
-def load_questions(sheet_id):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            return []
-            
-        sheet = client.open_by_key(sheet_id)
-        worksheets = sheet.worksheets()
-        
-        for ws in worksheets:
-            if ws.title == "질문":
-                data = ws.get_all_records()
-                return data
-        
-        # 질문 워크시트가 없는 경우
-        return []
-    except Exception as e:
-        st.error(f"질문 데이터 로드 오류: {str(e)}")
-        return []
-
-# 응답 저장 함수
-def save_response(sheet_id, response_data):
-    try:
-        client = get_gsheet_connection()
-        if not client:
-            return False
-            
-        sheet = client.open_by_key(sheet_id)
-        worksheet = None
-        
-        for ws in sheet.worksheets():
-            if ws.title == "응답":
-                worksheet = ws
-                break
-        
-        if not worksheet:
-            st.error("응답 워크시트를 찾을 수 없습니다.")
-            return False
-            
-        worksheet.append_row(response_data)
-        return True
-    except Exception as e:
-        st.error(f"응답 저장 오류: {str(e)}")
-        return False
-
-# 현재 활성화된 질문 가져오기
-def get_active_question(questions):
-    active_questions = [q for q in questions if q.get("활성화", "").lower() in ["y", "yes"]]
-    if active_questions:
-        return active_questions[0]
-    return None
-
 # 세션 ID 생성 (사용자 추적용)
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
@@ -291,13 +210,33 @@ if "session_id" not in st.session_state:
 if "nickname" not in st.session_state:
     st.session_state.nickname = generate_random_nickname()
 
+# 브라우저에서 정한 시간이 지나면 스크립트를 다시 실행시키는 타이머 (show_timer/index.html)
+show_timer = components.declare_component("show_timer", path=os.path.join(os.path.dirname(__file__), "show_timer"))
+
+# 진행 순서가 진행 중이면 잠시 뒤 다시 실행해 보여줄 질문이 바뀌었는지 확인
+# 서버에서 기다리지 않으므로 세션마다 실행 중인 스크립트가 남지 않고,
+# 다시 실행되면 main 이 진행 상태(세 칸, 캐시)를 한 번 읽어 화면을 그림
+# 제한 시간이 있는 질문은 넘어갈 시각에 맞춰 다시 실행됨
+def schedule_show_check(show, now):
+    wait = SHOW_POLL_SECONDS
+    switch_at = show.next_switch_at(now)
+    if switch_at is not None:
+        wait = min(wait, max(0.05, switch_at - now))
+    show_timer(wait_ms=int(wait * 1000), key="show_timer", default=None)
+
 # 메인 앱
 def main():
+    # 제출 버튼을 누르면 스크립트가 다시 실행되므로, 실행 시작 시각을 제출을 누른 시각으로 기록
+    requested_at = time.time()
     st.markdown('<div class="title">실시간 투표 참여</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">의견을 자유롭게 표현해보세요!</div>', unsafe_allow_html=True)
     
-    # 구글 시트 ID (secrets에서 가져오기)
-    sheet_id = st.secrets.get("general", {}).get("sheet_id", "1DeLOnDJ4KdtZfKwEMAnYWqINTKx7vv22c3SQCu6lxQY")
+    # 방(교실) 선택: URL의 ?room= 값으로 사용할 구글 시트 결정
+    room, sheet_id = resolve_room()
+    if not sheet_id:
+        st.error(f"등록되지 않은 방입니다: {room}")
+        st.info("QR 코드를 다시 스캔하거나 선생님께 참여 주소를 확인해주세요.")
+        return
     
     # 닉네임 표시 및 변경 기능
     col1, col2 = st.columns([3, 1])
@@ -324,35 +263,36 @@ def main():
                     st.session_state.show_nickname_editor = False
                     st.rerun()
     
+    show = None
     try:
         questions = load_questions(sheet_id)
-        active_question = get_active_question(questions)
+        show = load_run_of_show(sheet_id)
+        now = time.time()
+        active_question = resolve_active_question(questions, show, now)
         
         if active_question:
-            question_id = active_question.get("질문ID", "")
+            question_id = active_question.qid
             
             # 이미 응답했는지 확인
             if f"answered_{question_id}" not in st.session_state:
                 st.markdown(
                     f"""
                     <div class="question-card">
-                        <div class="question-text">{active_question.get("질문", "")}</div>
+                        <div class="question-text">{active_question.text}</div>
                     </div>
                     """, 
                     unsafe_allow_html=True
                 )
                 
-                question_type = active_question.get("유형", "").lower()
+                question_type = active_question.qtype
                 
                 # 객관식 질문
                 if question_type == "객관식":
-                    options = []
-                    for i in range(1, 6):  # 최대 5개 옵션 지원
-                        option_key = f"선택지{i}"
-                        if option_key in active_question and active_question[option_key]:
-                            options.append(active_question[option_key])
+                    options = active_question.options  # 파싱할 때 미리 계산됨
                     
-                    if "selected_option" not in st.session_state:
+                    # 질문이 바뀌면 이전 질문에서 고른 선택지는 버림
+                    if st.session_state.get("selected_question") != question_id:
+                        st.session_state.selected_question = question_id
                         st.session_state.selected_option = None
                         
                     # 옵션 버튼 표시
@@ -385,7 +325,7 @@ def main():
                                 selected_option,  # 선택한 옵션
                                 st.session_state.session_id  # 세션 ID
                             ]
-                            if save_response(sheet_id, response):
+                            if submit_response(sheet_id, response, question_type, requested_at):
                                 st.session_state[f"answered_{question_id}"] = True
                                 st.balloons()  # 성공 시 풍선 효과
                                 st.success("응답이 제출되었습니다!")
@@ -414,7 +354,7 @@ def main():
                             answer.strip(),  # 입력한 답변
                             st.session_state.session_id  # 세션 ID
                         ]
-                        if save_response(sheet_id, response):
+                        if submit_response(sheet_id, response, question_type, requested_at):
                             st.session_state[f"answered_{question_id}"] = True
                             st.balloons()  # 성공 시 풍선 효과
                             st.success("응답이 제출되었습니다!")
@@ -430,7 +370,7 @@ def main():
                     <div class="waiting-container">
                         <div class="waiting-icon">✓</div>
                         <div class="waiting-text">이 질문에 이미 응답하셨습니다</div>
-                        <div class="question-text">{active_question.get("질문", "")}</div>
+                        <div class="question-text">{active_question.text}</div>
                         <p>다음 질문이 활성화되면 자동으로 표시됩니다</p>
                     </div>
                     """, 
@@ -472,7 +412,7 @@ def main():
         if st.button("새 닉네임으로 참여하기", use_container_width=True):
             # 1. 응답 기록 초기화 - 응답 관련 세션 변수만 삭제
             for key in list(st.session_state.keys()):
-                if key.startswith("answered_") or key == "selected_option":
+                if key.startswith("answered_") or key in ("selected_option", "selected_question"):
                     del st.session_state[key]
     
             # 2. 새 세션 ID 생성
@@ -489,6 +429,17 @@ def main():
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
         st.info("페이지를 새로고침하거나 나중에 다시 시도해주세요.")
+    
+    # 성능 계측 패널 (시크릿 general.perf_key 를 설정하고 URL에 ?perf=<그 값> 을 붙인 경우에만 표시)
+    # 참여자 화면이므로 읽기 전용 (계측 초기화와 내보내기는 관리자 앱에서)
+    perf_key = st.secrets.get("general", {}).get("perf_key", "")
+    if perf_key and st.query_params.get("perf") == perf_key:
+        render_perf_panel(controls=False)
+    
+    # 진행 순서가 진행 중이면 화면을 모두 그린 뒤에 다음 확인을 예약
+    if show is not None and show.running:
+        schedule_show_check(show, now)
 
 if __name__ == "__main__":
-    main()
+    with timer("rerun"):
+        main()
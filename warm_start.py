@@ -0,0 +1,202 @@
+"""재시작용 로컬 스냅숏 (관리자 앱과 투표 앱에서 사용)
+
+수업 중에 재배포나 컨테이너 재시작이 일어나면 모든 세션이 빈 캐시로 시작해 질문과
+응답 시트를 처음부터 다시 읽고, 다시 연결하는 휴대폰들이 한꺼번에 시트 API 를
+호출합니다. 그래서 방마다 질문 레코드와 응답 행을 작은 gzip 파일에 저장해 두고,
+프로세스가 시작되면 이 파일을 먼저 읽어 바로 화면을 그린 뒤 시트에서는 그 뒤에
+추가된 응답 행만 읽습니다.
+
+- 질문: "<시트 ID>.questions.json.gz" (질문을 읽는 모든 앱이 저장, 저장할 때마다 새로 씀)
+- 응답: "<시트 ID>.responses.jsonl.gz" (응답 행을 순서대로 읽는 관리자 앱이 저장)
+  첫 줄은 머리 정보, 이어서 한 줄에 한 행. 새 행은 gzip 조각으로 파일 끝에 덧붙이고,
+  2행부터 다시 읽은 경우(시트 초기화 등)에만 처음부터 다시 씀
+- 저장은 백그라운드 스레드가 SNAPSHOT_INTERVAL_SECONDS 마다 모아서 처리하므로
+  세션 스크립트는 파일 쓰기를 기다리지 않음
+- 새로 쓸 때는 저장할 때마다 새 임시 파일에 쓴 뒤 바꿔치기
+  (같은 폴더를 쓰는 여러 앱이 동시에 저장해도 서로의 파일을 덮어쓰지 않음)
+- 읽을 수 없는 스냅숏(잘린 파일 등)은 없는 것으로 보고 시트에서 읽음
+- SNAPSHOT_MAX_AGE_SECONDS 보다 오래된 스냅숏은 사용하지 않음
+- 시작할 때 읽은 응답 행은 WARM_ROWS_KEEP_SECONDS 동안만 메모리에 둠
+  (그 뒤에 처음 읽기 시작하는 곳은 시트에서 처음부터 읽음)
+"""
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+SNAPSHOT_INTERVAL_SECONDS = 30        # 바뀐 내용을 파일에 저장하는 간격
+SNAPSHOT_MAX_AGE_SECONDS = 3 * 3600   # 이보다 오래된 스냅숏은 무시 (수업 한 번 길이)
+WARM_ROWS_KEEP_SECONDS = 600          # 시작할 때 읽은 응답 행을 메모리에 두는 시간
+SNAPSHOT_VERSION = 1
+
+
+def _read(path, max_age):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None  # 없거나 잘리거나 손상된 파일
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION or time.time() - data.get("saved_at", 0) > max_age:
+        return None
+    return data
+
+
+# 같은 폴더의 새 임시 파일에 쓴 뒤 path 로 바꿔치기 (write_to 는 텍스트 파일 객체를 받음)
+def _replace(path, write_to):
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=5) as f:
+            write_to(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write(path, data):
+    data = dict(data, version=SNAPSHOT_VERSION, saved_at=time.time())
+    _replace(path, lambda f: json.dump(data, f, ensure_ascii=False, separators=(",", ":")))
+
+
+def _write_lines(f, rows):
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+# 응답 스냅숏 -> 행 목록 (없거나 오래되었거나 손상되었으면 None)
+def _read_rows(path, max_age):
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        rows = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if not isinstance(header, dict) or header.get("version") != SNAPSHOT_VERSION:
+                return None
+            for line in f:
+                if not line.endswith("\n"):
+                    return None  # 덧붙이다 끊긴 조각
+                rows.append(json.loads(line))
+        return rows
+    except Exception:
+        return None
+
+
+def _rewrite_rows(path, rows):
+    def write_to(f):
+        f.write(json.dumps({"version": SNAPSHOT_VERSION}) + "\n")
+        _write_lines(f, rows)
+    _replace(path, write_to)
+
+
+# 새 행을 gzip 조각 하나로 파일 끝에 덧붙이기 (gzip 은 이어 붙인 조각을 한 파일로 읽음)
+def _append_rows(path, rows):
+    with open(path, "ab") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=5) as f:
+        _write_lines(f, rows)
+
+
+class WarmStart:
+    """방 하나의 스냅숏 (시작할 때 읽은 값과 다음에 저장할 값, 여러 세션이 함께 써도 안전)"""
+
+    def __init__(self, directory, sheet_id, max_age=SNAPSHOT_MAX_AGE_SECONDS):
+        self.lock = threading.Lock()
+        self.questions_path = self.responses_path = None
+        self.questions = None      # 질문 시트 레코드 (get_all_records 형식)
+        self.rows = []             # 시작할 때 스냅숏에서 읽은 응답 시트 2행부터의 값 (시간 ~ 전송시각)
+        self.verified = False      # rows 가 지금 시트와 이어지는지 확인했는지
+        self.responses_loaded = False  # 응답 전체 읽기에 rows 를 이미 사용했는지 (한 번만 사용)
+        self.row_count = 0         # 응답 스냅숏 파일(저장 대기 포함)의 행 수, 이어 쓸 수 없으면 None
+        self._loaded_at = time.monotonic()
+        self._questions_dirty = False
+        self._rewrite = None       # 처음부터 다시 쓸 행 (2행부터 다시 읽은 경우)
+        self._new_rows = []        # 파일 끝에 덧붙일 행
+        self._saver = None
+        if not directory:
+            return  # 스냅숏 사용 안 함
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", sheet_id)
+        self.questions_path = os.path.join(directory, f"{name}.questions.json.gz")
+        self.responses_path = os.path.join(directory, f"{name}.responses.jsonl.gz")
+        data = _read(self.questions_path, max_age)
+        if data:
+            self.questions = data.get("records")
+        rows = _read_rows(self.responses_path, max_age)
+        if rows is not None:
+            self.rows = rows
+            self.row_count = len(rows)
+
+    # 시작할 때 읽은 응답 행을 오래 두지 않음 (lock 을 잡은 상태에서 호출)
+    def expire_rows(self):
+        if self.rows and time.monotonic() - self._loaded_at > WARM_ROWS_KEEP_SECONDS:
+            self.rows = []
+
+    # 시작할 때 읽은 응답 행이 지금 시트와 다름 (lock 을 잡은 상태에서 호출, 2행부터 다시 읽을 때까지 저장 안 함)
+    def discard_rows(self):
+        self.rows = []
+        self.row_count = None
+
+    def update_questions(self, records):
+        with self.lock:
+            self.questions = list(records)
+            self._questions_dirty = True
+        self._start_saver()
+
+    # 응답 시트 start_row 행부터 새로 읽은 행 반영 (2행부터 다시 읽으면 처음부터 대체)
+    # 이어지지 않는 위치면 무시 (다음에 2행부터 다시 읽을 때 맞춰짐)
+    def record_rows(self, start_row, rows):
+        with self.lock:
+            if start_row == 2:
+                self.rows = []
+                self._rewrite = list(rows)
+                self._new_rows = []
+                self.row_count = len(rows)
+            elif self.row_count is not None and start_row == self.row_count + 2:
+                self._new_rows.extend(rows)
+                self.row_count += len(rows)
+            else:
+                return
+            self.verified = True
+        self._start_saver()
+
+    def _start_saver(self):
+        if not self.questions_path:
+            return
+        with self.lock:
+            if self._saver is not None:
+                return
+            self._saver = threading.Thread(target=self._save_forever, name="warm-start-saver", daemon=True)
+        self._saver.start()
+
+    def _save_forever(self):
+        while True:
+            self.save()
+            time.sleep(SNAPSHOT_INTERVAL_SECONDS)
+
+    def save(self):
+        """모아 둔 변경을 파일에 저장 (백그라운드 스레드에서 호출)"""
+        with self.lock:
+            questions = self.questions if self._questions_dirty else None
+            rewrite, new_rows = self._rewrite, self._new_rows
+            self._questions_dirty = False
+            self._rewrite, self._new_rows = None, []
+        if questions is None and rewrite is None and not new_rows:
+            return
+        # 스냅숏은 시작을 빠르게 하는 용도일 뿐이므로 저장하지 못해도 계속 진행
+        try:
+            os.makedirs(os.path.dirname(self.questions_path), exist_ok=True)
+            if questions is not None:
+                _write(self.questions_path, {"records": questions})
+        except OSError:
+            pass
+        try:
+            if rewrite is not None:
+                _rewrite_rows(self.responses_path, rewrite)
+            if new_rows:
+                _append_rows(self.responses_path, new_rows)
+        except OSError:
+            # 응답 파일이 중간에 끊겼을 수 있으므로 2행부터 다시 읽을 때까지 덧붙이지 않음
+            with self.lock:
+                if self._rewrite is None:
+                    self.row_count = None